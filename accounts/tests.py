@@ -0,0 +1,57 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from categories.models import Category
+
+
+User = get_user_model()
+
+
+class RegisterWithCategoriesViewTest(TestCase):
+    """Case of testing RegisterWithCategoriesView"""
+
+    def signup(self, **extra):
+        return self.client.post(reverse('account_signup'), {
+            'email': 'testuser@example.com',
+            'password1': 'test_Password_1', 'password2': 'test_Password_1'
+        }, content_type='application/json', **extra)
+
+    def get_categories_titles(self) -> list[str]:
+        user = User.objects.get(email='testuser@example.com')
+        return list(
+            Category.objects.filter(owner=user).values_list('title', flat=True)
+        )
+
+    def test_signup(self):
+        response = self.signup()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            self.get_categories_titles(),
+            ['Еда', 'Здоровье', 'Одежда', 'Развлечения', 'Транспорт']
+        )
+
+    def test_signup_with_accept_language(self):
+        self.signup(HTTP_ACCEPT_LANGUAGE='en-US,en;q=0.9')
+
+        self.assertEqual(
+            self.get_categories_titles(),
+            ['Clothes', 'Entertainment', 'Food', 'Health', 'Transport']
+        )
+
+    def test_signup_with_unknown_accept_language(self):
+        self.signup(HTTP_ACCEPT_LANGUAGE='xx')
+
+        self.assertEqual(
+            self.get_categories_titles(),
+            ['Еда', 'Здоровье', 'Одежда', 'Развлечения', 'Транспорт']
+        )
+
+    def test_signup_with_unknown_first_accept_language(self):
+        self.signup(HTTP_ACCEPT_LANGUAGE='fr-FR,en;q=0.9')
+
+        self.assertEqual(
+            self.get_categories_titles(),
+            ['Clothes', 'Entertainment', 'Food', 'Health', 'Transport']
+        )
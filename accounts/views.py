@@ -1,22 +1,38 @@
+from typing import Optional
+
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from dj_rest_auth.registration.views import RegisterView
 
 from .serializers import UserSerializer
-from categories.services.base import SetUserDefaultCategoriesService
+from categories.services.base import (
+    SetUserDefaultCategoriesService, get_default_categories_language
+)
 
 
 class RegisterWithCategoriesView(RegisterView):
     """SignUp view with setting default categories for new user"""
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        """Add default categories for new user"""
+        """Add default categories for new user in the same transaction
+        with user creation
+        """
         user = super().perform_create(serializer)
         SetUserDefaultCategoriesService.execute({
-            'owner': user
+            'owner': user, 'language': self.get_categories_language()
         })
         return user
 
+    def get_categories_language(self) -> Optional[str]:
+        """Return language of default categories from Accept-Language
+        header or None if header doesn't have languages with categories
+        """
+        return get_default_categories_language(
+            self.request.META.get('HTTP_ACCEPT_LANGUAGE', '')
+        )
+
 
 class UserView(APIView):
     """View to display current user information"""
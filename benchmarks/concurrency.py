@@ -0,0 +1,118 @@
+import asyncio
+import datetime
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+
+DASHBOARD_URL_NAMES = {
+    'sync': (
+        'costs_statistic_month', 'costs_statistic_year', 'average_costs'
+    ),
+    'async': (
+        'costs_statistic_month_async', 'costs_statistic_year_async',
+        'average_costs_async'
+    ),
+}
+
+DUMMY_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+}
+
+
+def get_dashboard_paths(date: datetime.date, views: str) -> list[str]:
+    """Return paths of month and year statistic and average costs
+    requested by dashboard using `sync` or `async` views
+    """
+    month_name, year_name, average_name = DASHBOARD_URL_NAMES[views]
+    return [
+        reverse(month_name, args=(date.year, date.month)),
+        reverse(year_name, args=(date.year,)),
+        reverse(average_name),
+    ]
+
+
+def time_dashboards(user, dashboards: int = 100,
+                    concurrency: int = 10) -> list[dict]:
+    """Time loading dashboards by one worker handling sync views one by
+    one through WSGI handler (as gunicorn sync worker does) and by one
+    worker handling `concurrency` dashboards at once through ASGI
+    handler with sync and async views. Statistic cache is disabled, so
+    each request queries database
+    """
+    date = datetime.date.today()
+    # async test client always requests `testserver` host
+    with override_settings(
+            CACHES=DUMMY_CACHES,
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        client = Client()
+        client.force_login(user)
+        async_client = AsyncClient()
+        async_client.cookies = client.cookies
+        return [
+            _get_result('wsgi', 'sync', 1, dashboards, _time(
+                _load_sync_dashboards, client,
+                get_dashboard_paths(date, 'sync'), dashboards
+            )),
+            *(_get_result(
+                'asgi', views, concurrency, dashboards, _time(
+                    asyncio.run, _load_async_dashboards(
+                        async_client, get_dashboard_paths(date, views),
+                        dashboards, concurrency
+                    )
+                )
+            ) for views in ('sync', 'async')),
+        ]
+
+
+def _load_sync_dashboards(client: Client, paths: list[str],
+                          dashboards: int) -> None:
+    for _ in range(dashboards):
+        for path in paths:
+            _check_status(client.get(path), path)
+
+
+async def _load_async_dashboards(client: AsyncClient, paths: list[str],
+                                 dashboards: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load_dashboard():
+        async with semaphore:
+            responses = await asyncio.gather(
+                *(client.get(path) for path in paths)
+            )
+
+        for path, response in zip(paths, responses):
+            _check_status(response, path)
+
+    await asyncio.gather(*(load_dashboard() for _ in range(dashboards)))
+    # test client doesn't close connections after requests, so the
+    # connection of the thread running sync code is closed here
+    await sync_to_async(connections.close_all)()
+
+
+def _check_status(response, path: str) -> None:
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} responded with {response.status_code}")
+
+
+def _time(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def _get_result(handler: str, views: str, concurrency: int,
+                dashboards: int, duration: float) -> dict:
+    return {
+        'handler': handler,
+        'views': views,
+        'concurrency': concurrency,
+        'dashboards': dashboards,
+        'duration_s': round(duration, 3),
+        'dashboards_per_s': round(dashboards / duration, 1),
+    }
@@ -0,0 +1,94 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+
+from categories.services.base import SetUserDefaultCategoriesService
+from costs.services.rollup import rebuild_daily_costs
+from utils.db import execute_sql_statement
+
+
+User = get_user_model()
+
+
+BENCHMARK_USERNAME_PREFIX = 'benchmark_user_'
+
+SQL_SET_RANDOM_SEED = "SELECT setseed(%s);"
+
+SQL_GENERATE_COSTS = (
+    "INSERT INTO cost "
+    "(uuid, title, costs_sum, category_id, owner_id, date, pub_datetime) "
+    "SELECT gen_random_uuid(), 'Cost ' || n, costs_sum, "
+    "categories[1 + floor(random() * array_length(categories, 1))::int], "
+    "%s, date, date + random() * interval '1 day' "
+    "FROM (SELECT n, round((1 + random() * 2000)::numeric, 2) AS costs_sum, "
+    "%s::date + floor(random() * %s)::int AS date "
+    "FROM generate_series(1, %s) AS n) AS generated, "
+    "(SELECT array_agg(uuid ORDER BY title) AS categories "
+    "FROM category WHERE owner_id = %s) AS user_categories;"
+)
+
+SQL_GENERATE_INCOMES = (
+    "INSERT INTO income (uuid, incomes_sum, owner_id, date, pub_datetime) "
+    "SELECT gen_random_uuid(), incomes_sum, %s, date, "
+    "date + random() * interval '1 day' "
+    "FROM (SELECT round((100 + random() * 50000)::numeric, 2) "
+    "AS incomes_sum, %s::date + floor(random() * %s)::int AS date "
+    "FROM generate_series(1, %s)) AS generated;"
+)
+
+
+def get_benchmark_users():
+    """Return users created for benchmarks"""
+    return User.objects.filter(
+        username__startswith=BENCHMARK_USERNAME_PREFIX
+    ).order_by('username')
+
+
+def generate_benchmark_data(
+        users_count: int, costs_count: int, incomes_count: int,
+        years: int, seed: float = 0.5) -> list[User]:
+    """Create users with default categories and costs and incomes
+    spread over the last years. Costs and incomes are generated by
+    Postgres with random seed, so the same arguments give the same data
+
+    Parameters
+    ----------
+    users_count : int
+        Number of users to create
+    costs_count : int
+        Number of costs for each user
+    incomes_count : int
+        Number of incomes for each user
+    years : int
+        Number of years with costs and incomes ending with current year
+    seed : float
+        Random seed between -1 and 1
+
+    Returns
+    -------
+    list:
+        Created users
+
+    """
+    today = datetime.date.today()
+    start_date = datetime.date(today.year - years + 1, 1, 1)
+    days_count = (today - start_date).days + 1
+    execute_sql_statement(SQL_SET_RANDOM_SEED, [seed])
+
+    users = []
+    for number in range(users_count):
+        # benchmarks log in users without passwords
+        user = User.objects.create_user(
+            username=f"{BENCHMARK_USERNAME_PREFIX}{number}"
+        )
+        SetUserDefaultCategoriesService.execute({'owner': user})
+        execute_sql_statement(SQL_GENERATE_COSTS, [
+            user.pk, start_date, days_count, costs_count, user.pk
+        ])
+        execute_sql_statement(SQL_GENERATE_INCOMES, [
+            user.pk, start_date, days_count, incomes_count
+        ])
+        rebuild_daily_costs(user)
+        users.append(user)
+
+    return users
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from benchmarks.data import generate_benchmark_data, get_benchmark_users
+
+
+class Command(BaseCommand):
+    """Command to generate synthetic users, costs and incomes for
+    benchmarks
+    """
+
+    help = (
+        "Generate benchmark users with default categories and costs and "
+        "incomes spread over years"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument(
+            '--costs', type=int, default=50000,
+            help="Number of costs for each user"
+        )
+        parser.add_argument(
+            '--incomes', type=int, default=5000,
+            help="Number of incomes for each user"
+        )
+        parser.add_argument('--years', type=int, default=5)
+        parser.add_argument(
+            '--seed', type=float, default=0.5,
+            help="Random seed between -1 and 1"
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help="Delete existing benchmark users with their data"
+        )
+
+    def handle(self, *args, **options):
+        if not -1 <= options['seed'] <= 1:
+            raise CommandError("Seed must be between -1 and 1")
+
+        benchmark_users = get_benchmark_users()
+        if benchmark_users.exists() and not options['clear']:
+            raise CommandError(
+                "Benchmark users already exist. Use --clear to recreate them"
+            )
+
+        with transaction.atomic():
+            benchmark_users.delete()
+            users = generate_benchmark_data(
+                options['users'], options['costs'], options['incomes'],
+                options['years'], options['seed']
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(users)} benchmark users were created"
+        ))
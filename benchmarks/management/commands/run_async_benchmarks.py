@@ -0,0 +1,41 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.concurrency import time_dashboards
+from benchmarks.data import get_benchmark_users
+
+
+class Command(BaseCommand):
+    """Command to compare throughput of sync statistic views handled
+    one by one with async statistic views handled concurrently and
+    print results as JSON
+    """
+
+    help = (
+        "Time loading dashboards with month and year costs statistic and "
+        "average costs by sync and async views and print throughput as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dashboards', type=int, default=100,
+            help="Number of loaded dashboards"
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=10,
+            help="Number of dashboards loaded at once by async views"
+        )
+
+    def handle(self, *args, **options):
+        user = get_benchmark_users().first()
+        if not user:
+            raise CommandError(
+                "There are no benchmark users. Run generate_benchmark_data "
+                "command first"
+            )
+
+        results = time_dashboards(
+            user, options['dashboards'], options['concurrency']
+        )
+        self.stdout.write(json.dumps(results, indent=2))
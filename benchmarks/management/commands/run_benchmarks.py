@@ -0,0 +1,82 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from benchmarks.data import get_benchmark_users
+from benchmarks.runner import (
+    BenchmarkRunner, get_routes, get_not_benchmarked_url_names
+)
+
+
+class Command(BaseCommand):
+    """Command to time all costs, categories, incomes and dashboard
+    endpoints with benchmark user data and print results as JSON
+    """
+
+    help = (
+        "Time costs, categories, incomes and dashboard endpoints and print "
+        "p50, p95, p99 latency and query counts as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument(
+            '--cold-cache', action='store_true',
+            help="Clear cache before each request"
+        )
+        parser.add_argument(
+            '--route', action='append', default=[],
+            help="Time only routes with this url name. Can be repeated"
+        )
+        parser.add_argument('--output', help="File to write results")
+
+    def handle(self, *args, **options):
+        user = get_benchmark_users().first()
+        if not user:
+            raise CommandError(
+                "There are no benchmark users. Run generate_benchmark_data "
+                "command first"
+            )
+
+        routes = get_routes(user)
+        not_benchmarked = get_not_benchmarked_url_names(routes)
+        if not_benchmarked:
+            raise CommandError(
+                f"Routes without benchmarks: {', '.join(not_benchmarked)}"
+            )
+
+        if options['route']:
+            routes = [
+                route for route in routes
+                if route.url_name in options['route']
+            ]
+
+        runner = BenchmarkRunner(
+            user, options['iterations'], options['warmup'],
+            options['cold_cache']
+        )
+        results = {
+            'settings': {
+                'iterations': options['iterations'],
+                'warmup': options['warmup'],
+                'cold_cache': options['cold_cache'],
+                'users': get_benchmark_users().count(),
+                'costs': user.costs.count(),
+                'incomes': user.incomes.count(),
+                'database': connection.vendor,
+            },
+            'routes': runner.run(routes),
+        }
+        output = json.dumps(results, indent=2)
+        if not options['output']:
+            self.stdout.write(output)
+            return
+
+        with open(options['output'], 'w') as output_file:
+            output_file.write(output)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Results were written to {options['output']}"
+        ))
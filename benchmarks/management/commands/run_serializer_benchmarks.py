@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.data import get_benchmark_users
+from benchmarks.serializers import time_serializers
+
+
+class Command(BaseCommand):
+    """Command to compare model serializers of costs and incomes with
+    values serializers used by list commands and print results as JSON
+    """
+
+    help = (
+        "Time costs and incomes model serializers and values serializers "
+        "and print p50 latency as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument(
+            '--limit', type=int, default=10000,
+            help="Number of serialized entries"
+        )
+
+    def handle(self, *args, **options):
+        user = get_benchmark_users().first()
+        if not user:
+            raise CommandError(
+                "There are no benchmark users. Run generate_benchmark_data "
+                "command first"
+            )
+
+        results = time_serializers(
+            user, options['limit'], options['iterations']
+        )
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,235 @@
+import math
+import time
+from typing import NamedTuple, Any
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+from categories.models import Category
+from costs.models import Cost
+from incomes.models import Income
+from utils.middleware import QueryCounter, get_query_budget
+
+
+User = get_user_model()
+
+
+BENCHMARKED_URLCONFS = (
+    'costs.urls', 'categories.urls', 'incomes.urls', 'dashboard.urls'
+)
+
+BENCHMARK_SIGNUP_PASSWORD = 'benchmark_Signup_password'
+
+
+class Route(NamedTuple):
+    """Request to the endpoint which is timed by benchmarks"""
+
+    url_name: str
+    method: str
+    url_args: tuple = ()
+    data: Any = None
+    anonymous: bool = False
+    staff: bool = False
+    content_type: str = 'application/json'
+
+    @property
+    def name(self) -> str:
+        if self.method == 'GET' and self.data:
+            return f"{self.method} {self.url_name}?{urlencode(self.data)}"
+
+        return f"{self.method} {self.url_name}"
+
+
+def get_routes(user) -> list[Route]:
+    """Return requests to all benchmarked endpoints with the latest
+    user entries
+    """
+    cost = Cost.objects.filter(owner=user).first()
+    income = Income.objects.filter(owner=user).first()
+    category = Category.objects.filter(owner=user).first()
+    date = cost.date
+    month = date.strftime('%Y-%m')
+    cost_data = {
+        'title': 'benchmark_cost', 'costs_sum': '100.00',
+        'category': str(category.pk), 'date': date.isoformat()
+    }
+    income_data = {'incomes_sum': '100.00'}
+    import_data = 'date,title,category,costs_sum\r\n' + ''.join(
+        f"{date.isoformat()},benchmark_cost,{title},100.00\r\n"
+        for title in ['benchmark_category', category.title] * 500
+    )
+    return [
+        Route('all_costs', 'GET'),
+        Route('all_costs', 'GET', data={'stream': 'true'}),
+        Route('all_costs', 'POST', data=cost_data),
+        Route('bulk_costs', 'POST', data=[cost_data] * 100),
+        Route('costs_export', 'GET'),
+        Route(
+            'costs_import', 'POST', data=import_data, content_type='text/csv'
+        ),
+        Route('costs_export', 'GET', data={
+            'from': f"{date.year}-01-01", 'category': str(category.pk)
+        }),
+        Route('concrete_cost', 'GET', (cost.pk,)),
+        Route('concrete_cost', 'PUT', (cost.pk,), cost_data),
+        Route('concrete_cost', 'DELETE', (cost.pk,)),
+        Route('month_costs', 'GET', (date.year, date.month)),
+        Route('date_costs', 'GET', (date.year, date.month, date.day)),
+        Route('costs_statistic_month', 'GET', (date.year, date.month)),
+        Route('costs_statistic_year', 'GET', (date.year,)),
+        Route(
+            'costs_statistic_period', 'GET',
+            data={'from': f"{date.year - 1}-01", 'to': month}
+        ),
+        Route(
+            'balance_statistic', 'GET',
+            data={'from': f"{date.year - 1}-01", 'to': month}
+        ),
+        Route('average_costs', 'GET'),
+        Route(
+            'costs_statistic_month_async', 'GET', (date.year, date.month)
+        ),
+        Route('costs_statistic_year_async', 'GET', (date.year,)),
+        Route('average_costs_async', 'GET'),
+        Route('statistic_cache_stats', 'GET', staff=True),
+        Route('all_categories', 'GET'),
+        Route('all_categories', 'GET', data={'from': f"{date.year}-01-01"}),
+        Route('all_categories', 'POST', data={'title': 'benchmark'}),
+        Route('concrete_category', 'GET', (category.pk,)),
+        Route(
+            'concrete_category', 'PUT', (category.pk,),
+            {'title': 'benchmark'}
+        ),
+        Route('concrete_category', 'DELETE', (category.pk,)),
+        Route('category_costs', 'GET', (category.pk,)),
+        Route(
+            'category_costs', 'GET', (category.pk,),
+            {'from': f"{date.year}-01-01", 'to': date.isoformat()}
+        ),
+        Route('all_incomes', 'GET'),
+        Route('all_incomes', 'GET', data={'stream': 'true'}),
+        Route('all_incomes', 'POST', data=income_data),
+        Route('incomes_export', 'GET'),
+        Route('concrete_income', 'GET', (income.pk,)),
+        Route('concrete_income', 'PUT', (income.pk,), income_data),
+        Route('concrete_income', 'DELETE', (income.pk,)),
+        Route('month_incomes', 'GET', (date.year, date.month)),
+        Route('date_incomes', 'GET', (date.year, date.month, date.day)),
+        Route('dashboard', 'GET', (date.year, date.month)),
+        Route('account_signup', 'POST', data={
+            'email': 'benchmark_signup@example.com',
+            'password1': BENCHMARK_SIGNUP_PASSWORD,
+            'password2': BENCHMARK_SIGNUP_PASSWORD,
+        }, anonymous=True),
+    ]
+
+
+def get_not_benchmarked_url_names(routes: list[Route]) -> list[str]:
+    """Return url names from benchmarked urlconfs without routes"""
+    url_names = set()
+    for urlconf in BENCHMARKED_URLCONFS:
+        urlpatterns = import_string(f"{urlconf}.urlpatterns")
+        url_names.update(pattern.name for pattern in urlpatterns)
+
+    return sorted(url_names - {route.url_name for route in routes})
+
+
+def get_percentile(samples: list[float], percent: int) -> float:
+    """Return nearest-rank percentile of samples"""
+    ordered = sorted(samples)
+    index = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+class BenchmarkRunner:
+    """Runner timing requests to routes through the test client.
+    Every request is executed in the rolled back transaction, so
+    writing requests don't change benchmark data. Anonymous routes
+    are requested by a new client without session. Benchmark user
+    isn't staff, so it's made staff in the transaction of staff
+    routes requests
+
+    Parameters
+    ----------
+    user : User
+        User making requests
+    iterations : int
+        Number of timed requests to each route
+    warmup : int
+        Number of not timed requests to each route before timing
+    cold_cache : bool
+        Clear cache before each request
+
+    """
+
+    def __init__(self, user, iterations: int = 50, warmup: int = 5,
+                 cold_cache: bool = False):
+        self.user = user
+        self.iterations = iterations
+        self.warmup = warmup
+        self.cold_cache = cold_cache
+        self.client = Client(HTTP_HOST='localhost')
+        self.client.force_login(user)
+
+    def run(self, routes: list[Route]) -> list[dict]:
+        """Time routes and return latency percentiles and query
+        counts for each route
+        """
+        return [self.run_route(route) for route in routes]
+
+    def run_route(self, route: Route) -> dict:
+        """Time the route and return its results"""
+        for _ in range(self.warmup):
+            self._request(route)
+
+        durations, queries_counts = [], []
+        for _ in range(self.iterations):
+            status_code, duration, queries_count = self._request(route)
+            durations.append(duration * 1000)
+            queries_counts.append(queries_count)
+
+        return {
+            'route': route.name,
+            'status': status_code,
+            'queries_min': min(queries_counts),
+            'queries_max': max(queries_counts),
+            'query_budget': get_query_budget(route.url_name, route.method),
+            'p50_ms': round(get_percentile(durations, 50), 3),
+            'p95_ms': round(get_percentile(durations, 95), 3),
+            'p99_ms': round(get_percentile(durations, 99), 3),
+        }
+
+    def _request(self, route: Route) -> tuple[int, float, int]:
+        if self.cold_cache:
+            cache.clear()
+
+        # signup logs in the new user, so it's made by a new client to
+        # keep the benchmark user session
+        client = Client(HTTP_HOST='localhost') if route.anonymous \
+            else self.client
+        request = getattr(client, route.method.lower())
+        path = reverse(route.url_name, args=route.url_args)
+        counter = QueryCounter()
+        with transaction.atomic():
+            if route.staff:
+                User.objects.filter(pk=self.user.pk).update(is_staff=True)
+
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                response = request(
+                    path, route.data if route.data is not None else {},
+                    content_type=route.content_type
+                )
+                if response.streaming:
+                    b''.join(response.streaming_content)
+
+                duration = time.perf_counter() - start
+
+            transaction.set_rollback(True)
+
+        return response.status_code, duration, counter.count
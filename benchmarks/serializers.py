@@ -0,0 +1,64 @@
+import time
+
+from rest_framework.renderers import JSONRenderer
+
+from costs.serializers import CostSerializer
+from incomes.serializers import IncomeSerializer
+from services.serializers import get_values_serializer
+from .runner import get_percentile
+
+
+BENCHMARKED_SERIALIZERS = (CostSerializer, IncomeSerializer)
+
+
+def time_serializer(serializer_class, queryset,
+                    iterations: int = 10) -> dict:
+    """Time fetching and rendering queryset entries with model
+    serializer and with its values serializer. Returns p50 latency of
+    both ways and whether they render the same JSON
+    """
+    values_serializer = get_values_serializer(serializer_class)
+    renderer = JSONRenderer()
+
+    def render_model_serializer() -> bytes:
+        return renderer.render(
+            serializer_class(list(queryset.all()), many=True).data
+        )
+
+    def render_values_serializer() -> bytes:
+        rows = values_serializer.get_values(queryset)
+        return renderer.render(values_serializer.serialize(rows))
+
+    model_durations, values_durations = [], []
+    for _ in range(iterations):
+        model_durations.append(_time(render_model_serializer))
+        values_durations.append(_time(render_values_serializer))
+
+    model_p50 = get_percentile(model_durations, 50)
+    values_p50 = get_percentile(values_durations, 50)
+    return {
+        'serializer': serializer_class.__name__,
+        'entries': queryset.count(),
+        'model_serializer_p50_ms': round(model_p50, 3),
+        'values_serializer_p50_ms': round(values_p50, 3),
+        'speedup': round(model_p50 / values_p50, 2) if values_p50 else None,
+        'identical': render_model_serializer() == render_values_serializer(),
+    }
+
+
+def time_serializers(user, limit: int, iterations: int = 10) -> list[dict]:
+    """Time all benchmarked serializers with the latest user entries"""
+    return [
+        time_serializer(
+            serializer_class,
+            serializer_class.Meta.model.objects.filter(owner=user)[:limit],
+            iterations
+        )
+        for serializer_class in BENCHMARKED_SERIALIZERS
+    ]
+
+
+def _time(function) -> float:
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
@@ -0,0 +1,166 @@
+import json
+from io import StringIO
+
+from django.test import TestCase, TransactionTestCase
+from django.core.management import call_command, CommandError
+
+from .data import get_benchmark_users
+from .runner import get_routes, get_not_benchmarked_url_names
+from categories.models import Category
+from costs.models import Cost
+from costs.services.rollup import (
+    get_daily_costs_mismatches, get_costs_totals_mismatches
+)
+from incomes.models import Income
+
+
+class GenerateBenchmarkDataCommandTest(TestCase):
+    """Case of testing generate_benchmark_data management command"""
+
+    def generate(self, **options):
+        call_command(
+            'generate_benchmark_data', users=2, costs=30, incomes=10,
+            years=2, stdout=StringIO(), **options
+        )
+
+    def test_generate(self):
+        self.generate()
+
+        users = get_benchmark_users()
+        self.assertEqual(users.count(), 2)
+        for user in users:
+            self.assertEqual(Category.objects.filter(owner=user).count(), 5)
+            self.assertEqual(Cost.objects.filter(owner=user).count(), 30)
+            self.assertEqual(Income.objects.filter(owner=user).count(), 10)
+
+        self.assertEqual(get_daily_costs_mismatches(), [])
+        self.assertEqual(get_costs_totals_mismatches(), [])
+
+    def test_generated_users_can_not_log_in(self):
+        self.generate()
+
+        for user in get_benchmark_users():
+            self.assertFalse(user.is_staff)
+            self.assertFalse(user.has_usable_password())
+
+    def test_generate_with_the_same_seed(self):
+        self.generate()
+        costs = list(Cost.objects.values_list('costs_sum', 'date'))
+        self.generate(clear=True)
+
+        self.assertEqual(
+            list(Cost.objects.values_list('costs_sum', 'date')), costs
+        )
+
+    def test_generate_with_existing_users(self):
+        self.generate()
+
+        with self.assertRaises(CommandError):
+            self.generate()
+
+
+class RunBenchmarksCommandTest(TestCase):
+    """Case of testing run_benchmarks management command"""
+
+    def setUp(self):
+        call_command(
+            'generate_benchmark_data', users=1, costs=30, incomes=10,
+            years=1, stdout=StringIO()
+        )
+
+    def test_all_routes_are_benchmarked(self):
+        routes = get_routes(get_benchmark_users().first())
+
+        self.assertEqual(get_not_benchmarked_url_names(routes), [])
+
+    def test_run(self):
+        output = StringIO()
+        call_command(
+            'run_benchmarks', iterations=2, warmup=0, stdout=output
+        )
+
+        results = json.loads(output.getvalue())
+        self.assertEqual(results['settings']['costs'], 30)
+        self.assertEqual(
+            len(results['routes']),
+            len(get_routes(get_benchmark_users().first()))
+        )
+        for route in results['routes']:
+            self.assertLess(route['status'], 400, route['route'])
+            self.assertLessEqual(
+                route['p50_ms'], route['p95_ms'], route['route']
+            )
+            self.assertLessEqual(
+                route['queries_max'], route['query_budget'], route['route']
+            )
+
+    def test_run_staff_route(self):
+        output = StringIO()
+        call_command(
+            'run_benchmarks', iterations=1, warmup=0,
+            route=['statistic_cache_stats'], stdout=output
+        )
+
+        results = json.loads(output.getvalue())
+        self.assertEqual(results['routes'][0]['status'], 200)
+        self.assertFalse(get_benchmark_users().first().is_staff)
+
+    def test_run_without_changing_data(self):
+        call_command(
+            'run_benchmarks', iterations=1, warmup=0, route=['concrete_cost'],
+            stdout=StringIO()
+        )
+
+        self.assertEqual(Cost.objects.count(), 30)
+
+
+class RunSerializerBenchmarksCommandTest(TestCase):
+    """Case of testing run_serializer_benchmarks management command"""
+
+    def test_run(self):
+        call_command(
+            'generate_benchmark_data', users=1, costs=30, incomes=10,
+            years=1, stdout=StringIO()
+        )
+        output = StringIO()
+        call_command(
+            'run_serializer_benchmarks', iterations=2, limit=20,
+            stdout=output
+        )
+
+        results = json.loads(output.getvalue())
+        self.assertEqual(
+            [result['entries'] for result in results], [20, 10]
+        )
+        for result in results:
+            self.assertTrue(result['identical'], result['serializer'])
+
+    def test_run_without_benchmark_users(self):
+        with self.assertRaises(CommandError):
+            call_command('run_serializer_benchmarks', stdout=StringIO())
+
+
+class RunAsyncBenchmarksCommandTest(TransactionTestCase):
+    """Case of testing run_async_benchmarks management command. Async
+    views query database in the thread pool, so benchmark data must be
+    committed
+    """
+
+    def test_run(self):
+        call_command(
+            'generate_benchmark_data', users=1, costs=30, incomes=10,
+            years=1, stdout=StringIO()
+        )
+        output = StringIO()
+        call_command(
+            'run_async_benchmarks', dashboards=4, concurrency=2,
+            stdout=output
+        )
+
+        results = json.loads(output.getvalue())
+        self.assertEqual(
+            [(result['handler'], result['views']) for result in results],
+            [('wsgi', 'sync'), ('asgi', 'sync'), ('asgi', 'async')]
+        )
+        for result in results:
+            self.assertEqual(result['dashboards'], 4)
@@ -10,3 +10,17 @@ class CategorySerializer(serializers.ModelSerializer):
 		model = Category
 		fields = ('pk', 'title', 'owner')
 		read_only_fields = ('pk', 'owner')
+
+
+class CategoryWithCostsSerializer(CategorySerializer):
+	"""Serializer for Category model with costs sum and count for the
+	period annotated by categories service
+	"""
+
+	costs_sum = serializers.DecimalField(
+		max_digits=15, decimal_places=2, read_only=True
+	)
+	costs_count = serializers.IntegerField(read_only=True)
+
+	class Meta(CategorySerializer.Meta):
+		fields = CategorySerializer.Meta.fields + ('costs_sum', 'costs_count')
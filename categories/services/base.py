@@ -1,8 +1,20 @@
+import datetime
+from decimal import Decimal
+from typing import Optional
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django import forms
-from django.db.models import QuerySet
+from django.db.models import QuerySet, FilteredRelation, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.http import Http404
+from django.utils.translation.trans_real import parse_accept_lang_header
 from service_objects.services import Service
-from services.common import GetUserEntriesService
+from services.common import GetUserEntriesService, ModelInstanceField
+from services.cache import bump_user_data_version
+from costs.models import Cost
+from costs.services.rollup import rebuild_costs_totals
+from utils.db import execute_sql_command
 
 from ..models import Category
 
@@ -16,11 +28,42 @@ class GetCategoriesService(GetUserEntriesService):
     model = Category
 
 
+class GetCategoriesWithCostsService(Service):
+    """Service returning user categories annotated with costs sum and
+    count for the period from optional `from_date` to optional
+    `to_date` inclusive. Costs are summed from daily costs joined only
+    for the period, so all categories are got in one grouped query
+    """
+
+    owner = ModelInstanceField(queryset=User.objects.all())
+    from_date = forms.DateField(required=False)
+    to_date = forms.DateField(required=False)
+    _model = Category
+
+    def process(self) -> QuerySet:
+        """Return categories with `costs_sum` and `costs_count`"""
+        owner = self.cleaned_data['owner']
+        from_date = self.cleaned_data.get('from_date')
+        to_date = self.cleaned_data.get('to_date')
+
+        period_costs = FilteredRelation('daily_costs', condition=Q(
+            daily_costs__date__gte=from_date or datetime.date.min,
+            daily_costs__date__lte=to_date or datetime.date.max
+        ))
+        return self._model.objects.filter(owner=owner).annotate(
+            period_costs=period_costs,
+            costs_sum=Coalesce(
+                Sum('period_costs__costs_sum'), Value(Decimal('0'))
+            ),
+            costs_count=Coalesce(Sum('period_costs__costs_count'), Value(0))
+        ).order_by(*self._model._meta.ordering)
+
+
 class CreateCategoryService(Service):
     """Service to create new categories"""
 
     title = forms.CharField(max_length=255)
-    owner = forms.ModelChoiceField(queryset=User.objects.all())
+    owner = ModelInstanceField(queryset=User.objects.all())
     _model = Category
 
     def process(self) -> Category:
@@ -29,54 +72,180 @@ class CreateCategoryService(Service):
         owner = self.cleaned_data['owner']
 
         category = self._model.objects.create(title=title, owner=owner)
+        bump_user_data_version(owner.pk)
         return category
 
 
 class ChangeCategoryService(Service):
-    """Service to change a concrete category"""
+    """Service to change a concrete category of the owner using one
+    UPDATE statement
+    """
 
-    category = forms.ModelChoiceField(queryset=Category.objects.all())
+    category = forms.UUIDField()
     title = forms.CharField(max_length=255)
+    owner = ModelInstanceField(queryset=User.objects.all())
+    _model = Category
 
-    def process(self) -> Category:
-        """Change a concrete category from `category` attribute"""
-        category = self.cleaned_data['category']
+    def process(self) -> None:
+        """Change a concrete category with pk from `category` attribute
+
+        Raises
+        ------
+        Http404
+            If owner doesn't have category with this pk
+
+        """
+        category_pk = self.cleaned_data['category']
         title = self.cleaned_data['title']
+        owner = self.cleaned_data['owner']
 
-        category.title = title
-        category.save()
-        return category
+        changed_count = self._model.objects.filter(
+            pk=category_pk, owner=owner
+        ).update(title=title)
+        if not changed_count:
+            raise Http404
 
+        bump_user_data_version(owner.pk)
 
-class DeleteCategoryService(Service):
-    """Service to delete a concrete category"""
 
-    category = forms.ModelChoiceField(queryset=Category.objects.all())
+class DeleteCategoryService(Service):
+    """Service to delete a concrete category of the owner with its
+    costs and daily costs using one statement
+    """
+
+    SQL_DELETE_CATEGORY = (
+        "WITH deleted_category AS ("
+        "    DELETE FROM category WHERE uuid = %s AND owner_id = %s"
+        "    RETURNING uuid"
+        "), deleted_costs AS ("
+        "    DELETE FROM cost"
+        "    WHERE category_id IN (SELECT uuid FROM deleted_category)"
+        "), deleted_daily_costs AS ("
+        "    DELETE FROM cost_daily_rollup"
+        "    WHERE category_id IN (SELECT uuid FROM deleted_category)"
+        ") SELECT COUNT(*) FROM deleted_category;"
+    )
+
+    category = forms.UUIDField()
+    owner = ModelInstanceField(queryset=User.objects.all())
 
     def process(self) -> None:
-        """Delete a concrete category from `category` attribute"""
-        category = self.cleaned_data['category']
-        category.delete()
+        """Delete a concrete category with pk from `category` attribute
 
+        Raises
+        ------
+        Http404
+            If owner doesn't have category with this pk
 
-class SetUserDefaultCategoriesService(Service):
-    """Service to create default categories for user"""
+        """
+        category_pk = self.cleaned_data['category']
+        owner = self.cleaned_data['owner']
+
+        deleted_count = execute_sql_command(
+            self.SQL_DELETE_CATEGORY, [category_pk, owner.pk]
+        )[0][0]
+        if not deleted_count:
+            raise Http404
+
+        rebuild_costs_totals(owner)
+        bump_user_data_version(owner.pk)
 
-    DEFAULT_CATEGORIES = [
-        'Еда', 'Здоровье', 'Развлечения', 'Транспорт', 'Одежда'
-    ]
 
-    owner = forms.ModelChoiceField(queryset=User.objects.all())
+class SetUserDefaultCategoriesService(Service):
+    """Service to create default categories for user in the language
+    using one INSERT statement
+    """
+
+    owner = ModelInstanceField(queryset=User.objects.all())
+    language = forms.CharField(required=False)
     _model = Category
 
-    def process(self) -> None:
-        """Create categories from DEFAULT_CATEGORIES for user"""
+    def process(self) -> list[Category]:
+        """Create categories from `DEFAULT_CATEGORIES` setting for user"""
         owner = self.cleaned_data['owner']
+        language = self.cleaned_data.get('language')
+
+        return self._model.objects.bulk_create([
+            self._model(title=title, owner=owner)
+            for title in get_default_categories(language)
+        ])
+
+
+def get_default_categories(language: Optional[str] = None) -> list[str]:
+    """Return titles of default categories for the language (e.g. `ru`
+    or `en-us`) from `DEFAULT_CATEGORIES` setting. Categories of
+    `DEFAULT_CATEGORIES_LANGUAGE` are returned for unknown languages
+    """
+    code = language and _get_default_categories_code(language)
+    return settings.DEFAULT_CATEGORIES[
+        code or settings.DEFAULT_CATEGORIES_LANGUAGE
+    ]
 
-        for category in self.DEFAULT_CATEGORIES:
-            self._model.objects.create(title=category, owner=owner)
 
+def get_default_categories_language(accept_language: str) -> Optional[str]:
+    """Return the first language of Accept-Language header value (by
+    quality) having categories in `DEFAULT_CATEGORIES` setting or None
+    if there is no such language
+    """
+    for language, _ in parse_accept_lang_header(accept_language):
+        code = _get_default_categories_code(language)
+        if code:
+            return code
 
-def get_category_costs(category: Category) -> QuerySet:
-    """Return all costs in category"""
-    return category.costs.all()
+    return None
+
+
+def _get_default_categories_code(language: str) -> Optional[str]:
+    language = language.lower()
+    for code in (language, language.split('-')[0]):
+        if code in settings.DEFAULT_CATEGORIES:
+            return code
+
+    return None
+
+
+class GetCategoryCostsService(Service):
+    """Service returning costs of the category for the period from
+    optional `from_date` to optional `to_date` inclusive and their
+    total sum counted by daily costs
+    """
+
+    SQL_GET_CATEGORY_COSTS_SUM = (
+        "SELECT SUM(costs_sum) FROM cost_daily_rollup "
+        "WHERE owner_id = %s AND category_id = %s "
+        "AND date >= %s AND date <= %s;"
+    )
+
+    category = ModelInstanceField(queryset=Category.objects.all())
+    from_date = forms.DateField(required=False)
+    to_date = forms.DateField(required=False)
+
+    def process(self) -> tuple[QuerySet, Decimal]:
+        """Return queryset of category costs for the period and their
+        total sum
+        """
+        category = self.cleaned_data['category']
+        from_date = self.cleaned_data.get('from_date')
+        to_date = self.cleaned_data.get('to_date')
+
+        costs = get_category_costs(category, from_date, to_date)
+        total_sum = execute_sql_command(self.SQL_GET_CATEGORY_COSTS_SUM, [
+            category.owner_id, category.pk, from_date or datetime.date.min,
+            to_date or datetime.date.max
+        ])[0][0]
+        return costs, total_sum or Decimal('0')
+
+
+def get_category_costs(
+        category: Category, from_date: Optional[datetime.date] = None,
+        to_date: Optional[datetime.date] = None) -> QuerySet:
+    """Return costs in category for the period from optional
+    `from_date` to optional `to_date` inclusive
+    """
+    costs = Cost.objects.filter(category=category)
+    if from_date:
+        costs = costs.filter(date__gte=from_date)
+    if to_date:
+        costs = costs.filter(date__lte=to_date)
+
+    return costs
@@ -1,54 +1,97 @@
+from typing import Optional
+
 from django.contrib.auth import get_user_model
 
-from .base import GetCategoriesService, get_category_costs
-from ..serializers import CategorySerializer
-from costs.services.base import GetCostsTotalSumService
+from .base import (
+    GetCategoriesService, GetCategoryCostsService,
+    GetCategoriesWithCostsService
+)
+from ..serializers import CategorySerializer, CategoryWithCostsSerializer
 from costs.serializers import CostSerializer
+from services.common import CursorPaginationService
+from services.serializers import get_values_serializer
 
 
 User = get_user_model()
 
 
 class GetAllCategoriesCommand:
-    """Command to get all categories"""
+    """Command to get all categories. If period is requested, categories
+    are annotated with costs sum and count for the period
+    """
 
     get_service = GetCategoriesService
+    costs_service = GetCategoriesWithCostsService
     serializer_class = CategorySerializer
+    costs_serializer_class = CategoryWithCostsSerializer
 
-    def __init__(self, user: User):
+    def __init__(self, user: User, from_date: Optional[str] = None,
+                 to_date: Optional[str] = None):
         self._user = user
+        self._from_date = from_date
+        self._to_date = to_date
 
     def execute(self) -> list:
-        service = self.get_service(self._user)
-        categories = service.get_all()
-        serialized_categories = self.serializer_class(
-            categories, many=True
-        ).data
-        return serialized_categories
+        """Return serialized categories
+
+        Raises
+        ------
+        InvalidInputsError
+            If period dates are invalid
+
+        """
+        if self._from_date is None and self._to_date is None:
+            service = self.get_service(self._user)
+            categories = service.get_all()
+            return self.serializer_class(categories, many=True).data
+
+        categories = self.costs_service.execute({
+            'owner': self._user, 'from_date': self._from_date,
+            'to_date': self._to_date
+        })
+        return self.costs_serializer_class(categories, many=True).data
 
 
 class GetCategoryCostsCommand:
-    """Command to return category costs"""
+    """Command to return category costs for the period by pages"""
 
     get_service_class = GetCategoriesService
-    total_sum_service = GetCostsTotalSumService()
+    costs_service = GetCategoryCostsService
     cost_serializer = CostSerializer
-    category_serializer = CategorySerializer
+    paginate_by = 100
 
-    def __init__(self, category_pk, user):
+    def __init__(self, category_pk, user, from_date: str = '',
+                 to_date: str = '', cursor: Optional[str] = None):
         self._category_pk = category_pk
         self._user = user
+        self._from_date = from_date
+        self._to_date = to_date
+        self._cursor = cursor
         self.get_service = self.get_service_class(user)
 
     def execute(self) -> dict:
-        """Return category costs, costs total sum and category itself
+        """Return page of category costs for the period, costs total
+        sum for the period, cursor to the next page and category title
         in dict format
+
+        Raises
+        ------
+        InvalidInputsError
+            If period dates are invalid
+
         """
         category = self.get_service.get_concrete(self._category_pk)
-        costs = get_category_costs(category)
-        serialized_costs = self.cost_serializer(costs, many=True).data
-        total_sum = self.total_sum_service.execute(costs)
+        costs, total_sum = self.costs_service.execute({
+            'category': category, 'from_date': self._from_date,
+            'to_date': self._to_date
+        })
+        cost_serializer = get_values_serializer(self.cost_serializer)
+        pagination_service = CursorPaginationService(self.paginate_by)
+        page, next_cursor = pagination_service.execute(
+            cost_serializer.get_values(costs), self._cursor
+        )
         return {
-            'costs': serialized_costs, 'category': category.title,
-            'total_sum': total_sum
+            'costs': cost_serializer.serialize(page),
+            'category': category.title, 'total_sum': total_sum,
+            'next': next_cursor
         }
@@ -1,15 +1,24 @@
+import datetime
+from decimal import Decimal
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.http import Http404
 
 from generics.unittests import (
-    GetEntriesServiceTest
+    GetEntriesServiceTest, QueryPlanTestMixin
 )
 from categories.services.base import (
     GetCategoriesService, CreateCategoryService, ChangeCategoryService,
-    DeleteCategoryService, SetUserDefaultCategoriesService, get_category_costs
+    DeleteCategoryService, SetUserDefaultCategoriesService,
+    GetCategoryCostsService, GetCategoriesWithCostsService,
+    get_category_costs
 )
 from categories.models import Category
-from costs.models import Cost
+from costs.models import Cost, DailyCosts
+from costs.services.rollup import (
+    rebuild_daily_costs, get_costs_totals_mismatches
+)
 
 
 User = get_user_model()
@@ -55,15 +64,28 @@ class ChangeCategoryServiceTest(BaseServiceTest):
     def test_execute(self):
         """Test: does service execute method change the existing category"""
         category_data = {
-            'category': self.entry, 'title': 'new_category',
+            'category': self.entry.pk, 'title': 'new_category',
             'owner': self.user.pk
         }
-        category = ChangeCategoryService.execute(category_data)
+        ChangeCategoryService.execute(category_data)
         all_categories = Category.objects.all()
 
-        self.assertEqual(category.pk, self.entry.pk)
-        self.assertEqual(category.title, 'new_category')
         self.assertEqual(len(all_categories), 1)
+        self.assertEqual(all_categories[0].pk, self.entry.pk)
+        self.assertEqual(all_categories[0].title, 'new_category')
+
+    def test_execute_with_not_owner_category(self):
+        """Test: does service raise Http404 if category owner isn't
+        the user
+        """
+        another_user = User.objects.create_user(
+            username='another_user', password='testpass'
+        )
+        with self.assertRaises(Http404):
+            ChangeCategoryService.execute({
+                'category': self.entry.pk, 'title': 'new_category',
+                'owner': another_user
+            })
 
 
 class DeleteCategoryServiceTest(BaseServiceTest):
@@ -71,11 +93,55 @@ class DeleteCategoryServiceTest(BaseServiceTest):
 
     def test_execute(self):
         """Test: does service execute method delete the existing category"""
-        category_data = {'category': self.entry, 'owner': self.user.pk}
+        category_data = {'category': self.entry.pk, 'owner': self.user.pk}
         DeleteCategoryService.execute(category_data)
         all_categories = Category.objects.all()
         self.assertEqual(len(all_categories), 0)
 
+    def test_execute_deletes_category_costs(self):
+        """Test: does service execute method delete category costs and
+        daily costs
+        """
+        Cost.objects.create(
+            title='cost_title', costs_sum='100.00', owner=self.user,
+            category=self.entry
+        )
+        rebuild_daily_costs(self.user)
+        DeleteCategoryService.execute({
+            'category': self.entry.pk, 'owner': self.user
+        })
+
+        self.assertFalse(Cost.objects.exists())
+        self.assertFalse(DailyCosts.objects.exists())
+
+    def test_execute_with_not_owner_category(self):
+        """Test: does service raise Http404 if category owner isn't
+        the user and not delete the category
+        """
+        another_user = User.objects.create_user(
+            username='another_user', password='testpass'
+        )
+        with self.assertRaises(Http404):
+            DeleteCategoryService.execute({
+                'category': self.entry.pk, 'owner': another_user
+            })
+
+        self.assertEqual(Category.objects.count(), 1)
+
+    def test_execute_updates_costs_totals(self):
+        """Test: does service execute method remove category costs from
+        user costs totals
+        """
+        Cost.objects.create(
+            title='cost_title', costs_sum='100.00', owner=self.user,
+            category=self.entry
+        )
+        rebuild_daily_costs(self.user)
+        DeleteCategoryService.execute({
+            'category': self.entry.pk, 'owner': self.user
+        })
+        self.assertEqual(get_costs_totals_mismatches(self.user), [])
+
 
 class SetUserDefaultCategoriesServiceTest(BaseServiceTest):
     """Case of testing SetUserDefaultCategoriesService"""
@@ -87,6 +153,63 @@ class SetUserDefaultCategoriesServiceTest(BaseServiceTest):
 
         self.assertEqual(all_categories.count(), 6)
 
+    def test_execute_with_language(self):
+        SetUserDefaultCategoriesService.execute({
+            'owner': self.user, 'language': 'en-US'
+        })
+        categories = Category.objects.filter(owner=self.user)
+
+        self.assertIn('Food', [category.title for category in categories])
+
+    def test_execute_with_unknown_language(self):
+        SetUserDefaultCategoriesService.execute({
+            'owner': self.user, 'language': 'de'
+        })
+        categories = Category.objects.filter(owner=self.user)
+
+        self.assertIn('Еда', [category.title for category in categories])
+
+    def test_execute_makes_one_insert(self):
+        # savepoint, insert and savepoint release
+        with self.assertNumQueries(3):
+            SetUserDefaultCategoriesService.execute({'owner': self.user})
+
+
+class GetCategoriesWithCostsServiceTest(BaseServiceTest):
+    """Case of testing GetCategoriesWithCostsService"""
+
+    def setUp(self):
+        super().setUp()
+        self.empty_category = Category.objects.create(
+            title='empty_category', owner=self.user
+        )
+        for date in ('2021-01-01', '2021-01-15', '2021-02-01'):
+            Cost.objects.create(
+                title='cost_title', costs_sum='100.00', owner=self.user,
+                category=self.entry, date=date
+            )
+
+        rebuild_daily_costs(self.user)
+
+    def test_execute(self):
+        categories = GetCategoriesWithCostsService.execute({
+            'owner': self.user, 'from_date': '2021-01-10'
+        })
+
+        self.assertEqual([
+            (category.title, category.costs_sum, category.costs_count)
+            for category in categories
+        ], [
+            ('empty_category', Decimal('0'), 0),
+            ('test_category', Decimal('200.00'), 2),
+        ])
+
+    def test_execute_makes_one_query(self):
+        with self.assertNumQueries(3):
+            list(GetCategoriesWithCostsService.execute({
+                'owner': self.user, 'to_date': '2021-01-31'
+            }))
+
 
 class GetCategoryCostsServiceTest(BaseServiceTest):
     """Case of testing get_category_costs service"""
@@ -104,3 +227,70 @@ class GetCategoryCostsServiceTest(BaseServiceTest):
         )
         costs = get_category_costs(self.entry)
         self.assertEqual(costs.count(), 1)
+
+    def test_get_for_the_period(self):
+        """Test: does get_category_costs return costs for the period"""
+        for date in ('2021-01-01', '2021-01-15', '2021-02-01'):
+            Cost.objects.create(
+                title='cost_title', costs_sum='100.00', owner=self.user,
+                category=self.entry, date=date
+            )
+
+        costs = get_category_costs(
+            self.entry, datetime.date(2021, 1, 10), datetime.date(2021, 2, 1)
+        )
+        self.assertEqual(
+            [cost.date for cost in costs],
+            [datetime.date(2021, 2, 1), datetime.date(2021, 1, 15)]
+        )
+
+
+class GetCategoryCostsForThePeriodServiceTest(
+        BaseServiceTest, QueryPlanTestMixin):
+    """Case of testing GetCategoryCostsService"""
+
+    def setUp(self):
+        super().setUp()
+        for date in ('2021-01-01', '2021-01-15', '2021-02-01'):
+            Cost.objects.create(
+                title='cost_title', costs_sum='100.00', owner=self.user,
+                category=self.entry, date=date
+            )
+
+        rebuild_daily_costs(self.user)
+
+    def test_execute(self):
+        costs, total_sum = GetCategoryCostsService.execute({
+            'category': self.entry, 'from_date': '2021-01-10'
+        })
+
+        self.assertEqual(costs.count(), 2)
+        self.assertEqual(total_sum, Decimal('200.00'))
+
+    def test_execute_without_costs_for_the_period(self):
+        costs, total_sum = GetCategoryCostsService.execute({
+            'category': self.entry, 'to_date': '2020-12-31'
+        })
+
+        self.assertEqual(costs.count(), 0)
+        self.assertEqual(total_sum, Decimal('0'))
+
+    def test_costs_use_category_date_index(self):
+        # owner costs of another category for many days make owner
+        # indexes less selective than (category, date) index
+        another_category = Category.objects.create(
+            title='another_category', owner=self.user
+        )
+        Cost.objects.bulk_create([Cost(
+            title='cost_title', costs_sum='100.00', owner=self.user,
+            category=another_category,
+            date=datetime.date(2021, 2, 1) - datetime.timedelta(days=number)
+        ) for number in range(10000)])
+        self.analyze(Cost)
+
+        costs, _ = GetCategoryCostsService.execute({
+            'category': self.entry, 'from_date': '2021-01-10',
+            'to_date': '2021-02-01'
+        })
+
+        self.assertQuerySetUsesIndex(costs, 'cost_category_date_idx')
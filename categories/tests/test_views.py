@@ -4,8 +4,9 @@ from django.urls import reverse
 
 from ..models import Category
 from costs.models import Cost
+from costs.services.base import CreateCostService
 from generics.unittests import (
-    GetCreateEntriesViewTest, GetUpdateDeleteEntryViewTest
+    GetCreateEntriesViewTest, GetUpdateDeleteEntryViewTest, QueryBudgetTest
 )
 
 
@@ -34,6 +35,40 @@ class GetCreateCategoryViewTest(ViewTest, GetCreateEntriesViewTest):
         )
 
 
+class GetCategoriesWithCostsViewTest(ViewTest):
+    """Case of testing GetCreateCategoryView with period"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username='testuser', password='testpass')
+        self.category = Category.objects.create(
+            title='test_category', owner=self.user
+        )
+
+    def test_get_for_the_period(self):
+        CreateCostService.execute({
+            'title': 'test_cost', 'costs_sum': '100.00',
+            'category': self.category, 'owner': self.user
+        })
+        response = self.client.get(
+            reverse('all_categories'), {'from': '2021-01-01'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{
+            'pk': str(self.category.pk), 'title': 'test_category',
+            'owner': self.user.pk, 'costs_sum': '100.00', 'costs_count': 1
+        }])
+
+    def test_get_with_invalid_date(self):
+        response = self.client.get(
+            reverse('all_categories'), {'to': 'bad_date'}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('to_date', response.json())
+
+
 class GetUpdateDeleteCategoryViewTest(ViewTest, GetUpdateDeleteEntryViewTest):
     """Case of testing GetUpdateDeleteCategoryView"""
 
@@ -76,3 +111,76 @@ class GetCategoryCostsViewTest(ViewTest):
             reverse('category_costs', args=[self.category.pk])
         )
         self.assertEqual(response.status_code, 200)
+
+    def test_get_for_the_period(self):
+        Cost.objects.create(
+            title='old_cost', costs_sum='50.00', category=self.category,
+            owner=self.user, date='2021-01-01'
+        )
+        response = self.client.get(
+            reverse('category_costs', args=[self.category.pk]),
+            {'to': '2021-01-31'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [cost['title'] for cost in response.json()['costs']],
+            ['old_cost']
+        )
+
+    def test_get_by_pages(self):
+        for _ in range(100):
+            Cost.objects.create(
+                title='test_cost', costs_sum='100.00',
+                category=self.category, owner=self.user
+            )
+
+        url = reverse('category_costs', args=[self.category.pk])
+        first_page = self.client.get(url).json()
+        second_page = self.client.get(
+            url, {'cursor': first_page['next']}
+        ).json()
+
+        self.assertEqual(len(first_page['costs']), 100)
+        self.assertEqual(len(second_page['costs']), 1)
+        self.assertIsNone(second_page['next'])
+
+    def test_get_with_invalid_date(self):
+        response = self.client.get(
+            reverse('category_costs', args=[self.category.pk]),
+            {'from': 'bad_date'}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('from_date', response.json())
+
+
+class CategoriesQueryBudgetTest(ViewTest, QueryBudgetTest):
+    """Case of testing categories endpoints query budgets"""
+
+    def setUp(self):
+        super().setUp()
+        self.categories = [
+            Category.objects.create(title=f'category_{i}', owner=self.user)
+            for i in range(5)
+        ]
+        for category in self.categories:
+            Cost.objects.create(
+                title='test_cost', costs_sum='100.00', category=category,
+                owner=self.user
+            )
+
+    def get_budget_requests(self):
+        category = self.categories[0]
+        return [
+            ('all_categories', 'GET', [], None),
+            ('all_categories', 'GET', [], {'from': '2021-01-01'}),
+            ('all_categories', 'POST', [], {'title': 'new_category'}),
+            ('concrete_category', 'GET', [category.pk], None),
+            (
+                'concrete_category', 'PUT', [category.pk],
+                {'title': 'changed_category'}
+            ),
+            ('category_costs', 'GET', [category.pk], None),
+            ('concrete_category', 'DELETE', [category.pk], None),
+        ]
@@ -1,7 +1,11 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from service_objects.errors import InvalidInputsError
 
-from generics.views import GetCreateGenericView, GetUpdateDeleteGenericView
+from generics.views import (
+    GetCreateGenericView, GetUpdateDeleteGenericView, conditional_user_data,
+    get_invalid_inputs_response
+)
 from .services.base import (
     CreateCategoryService, DeleteCategoryService, ChangeCategoryService,
     GetCategoriesService
@@ -11,9 +15,13 @@ from .serializers import CategorySerializer
 
 
 class GetCreateCategoryView(GetCreateGenericView):
-    """View to get all categories and create a new category"""
+    """View to get all categories and create a new category. Categories
+    are annotated with costs sum and count for the period if optional
+    `from` or `to` date is requested
+    """
 
     get_command = GetAllCategoriesCommand
+    command_query_params = {'from': 'from_date', 'to': 'to_date'}
     create_service = CreateCategoryService
     serializer_class = CategorySerializer
     model_name = 'category'
@@ -30,11 +38,22 @@ class GetUpdateDeleteCategory(GetUpdateDeleteGenericView):
 
 
 class GetCategoryCostsView(APIView):
-    """View to get costs by category"""
+    """View to get costs by category by pages for the period from
+    optional `from` date to optional `to` date
+    """
 
     command = GetCategoryCostsCommand
 
+    @conditional_user_data
     def get(self, request, pk):
-        command = self.command(pk, request.user)
-        result = command.execute()
+        command = self.command(
+            pk, request.user, from_date=request.query_params.get('from', ''),
+            to_date=request.query_params.get('to', ''),
+            cursor=request.query_params.get('cursor')
+        )
+        try:
+            result = command.execute()
+        except InvalidInputsError as error:
+            return get_invalid_inputs_response(error)
+
         return Response(result)
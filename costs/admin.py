@@ -1,10 +1,51 @@
 from django.contrib import admin
+from django.db import transaction
 
 from .models import Cost
+from .services.rollup import change_daily_costs
+from services.cache import bump_user_data_version
 
 
 @admin.register(Cost)
 class CostAdmin(admin.ModelAdmin):
+    """Admin of costs. Saving and deleting costs change daily costs,
+    costs totals and user data version like costs services do, so
+    `rebuild_daily_costs` isn't needed after changes in admin
+    """
+
     list_display = ('title', 'costs_sum', 'category', 'owner', 'date')
     list_filter = ('date',)
     search_fields = ('title',)
+
+    def save_model(self, request, obj, form, change):
+        old_cost = None
+        if change:
+            old_cost = Cost.objects.select_for_update().get(pk=obj.pk)
+
+        super().save_model(request, obj, form, change)
+        if old_cost:
+            _remove_from_daily_costs(old_cost)
+
+        change_daily_costs(
+            obj.owner_id, obj.category_id, obj.date, obj.costs_sum, 1
+        )
+        bump_user_data_version(obj.owner_id)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        _remove_from_daily_costs(obj)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            costs = list(queryset.select_for_update())
+            super().delete_queryset(request, queryset)
+            for cost in costs:
+                _remove_from_daily_costs(cost)
+
+
+def _remove_from_daily_costs(cost: Cost) -> None:
+    """Remove the cost from daily costs and costs totals of its owner"""
+    change_daily_costs(
+        cost.owner_id, cost.category_id, cost.date, -cost.costs_sum, -1
+    )
+    bump_user_data_version(cost.owner_id)
@@ -0,0 +1,61 @@
+import codecs
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from costs.services.imports import CostsImporter
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """Command to import user costs from CSV file"""
+
+    help = (
+        "Import user costs from UTF-8 CSV file with title, category, "
+        "costs_sum and optional date columns"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to CSV file")
+        parser.add_argument(
+            '--user', required=True, help="Username of costs owner"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=CostsImporter.batch_size,
+            help="Number of rows validated and loaded at once"
+        )
+
+    def handle(self, *args, **options):
+        owner = self._get_owner(options['user'])
+        importer = CostsImporter(owner)
+        importer.batch_size = options['batch_size']
+        try:
+            with open(options['path'], 'rb') as csv_file:
+                report = importer.execute(
+                    codecs.iterdecode(csv_file, 'utf-8-sig')
+                )
+        except OSError as error:
+            raise CommandError(f"CSV file can't be opened: {error}")
+        except ValidationError as error:
+            raise CommandError('; '.join(error.messages))
+
+        for row_errors in report['errors']:
+            errors = '; '.join(
+                f"{field}: {' '.join(messages)}"
+                for field, messages in row_errors['errors'].items()
+            )
+            self.stdout.write(f"line {row_errors['line']}: {errors}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['imported']} costs were imported, "
+            f"{len(report['errors'])} rows were skipped"
+        ))
+
+    def _get_owner(self, username):
+        try:
+            return User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"User `{username}` doesn't exist")
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from costs.services.rollup import (
+    rebuild_daily_costs, get_daily_costs_mismatches,
+    get_costs_totals_mismatches
+)
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """Command to rebuild or verify daily costs rollup and totals"""
+
+    help = (
+        "Rebuild or verify daily costs rollup and costs totals for one "
+        "user or everyone"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', help="Username of user. By default all users"
+        )
+        parser.add_argument(
+            '--verify', action='store_true',
+            help="Only check the rollup is consistent with costs"
+        )
+
+    def handle(self, *args, **options):
+        owner = self._get_owner(options['user'])
+        if options['verify']:
+            self._verify(owner)
+            return
+
+        with transaction.atomic():
+            rebuild_daily_costs(owner)
+
+        self.stdout.write(self.style.SUCCESS("Daily costs were rebuilt"))
+
+    def _get_owner(self, username):
+        if not username:
+            return None
+
+        try:
+            return User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"User `{username}` doesn't exist")
+
+    def _verify(self, owner):
+        mismatches = get_daily_costs_mismatches(owner)
+        for owner_id, category_id, date, *sums in mismatches:
+            actual_sum, actual_count, rollup_sum, rollup_count = sums
+            self.stdout.write(
+                f"owner {owner_id}, category {category_id}, {date}: "
+                f"costs {actual_sum} ({actual_count}), "
+                f"rollup {rollup_sum} ({rollup_count})"
+            )
+
+        totals_mismatches = get_costs_totals_mismatches(owner)
+        for owner_id, *sums in totals_mismatches:
+            actual_sum, actual_days, totals_sum, totals_days = sums
+            self.stdout.write(
+                f"owner {owner_id} totals: "
+                f"costs {actual_sum} ({actual_days} days), "
+                f"totals {totals_sum} ({totals_days} days)"
+            )
+
+        if mismatches or totals_mismatches:
+            raise CommandError(
+                f"Daily costs have {len(mismatches)} mismatches and "
+                f"costs totals have {len(totals_mismatches)} mismatches"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Daily costs are consistent"))
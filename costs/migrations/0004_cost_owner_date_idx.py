@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('costs', '0003_alter_cost_options'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cost',
+            index=models.Index(fields=['owner', 'date'], name='cost_owner_date_idx'),
+        ),
+    ]
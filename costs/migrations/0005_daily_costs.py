@@ -0,0 +1,46 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:34
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('costs', '0004_cost_owner_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCosts',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('costs_sum', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('costs_count', models.IntegerField()),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_costs', to='categories.category')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_costs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'daily costs',
+                'verbose_name_plural': 'daily costs',
+                'db_table': 'cost_daily_rollup',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailycosts',
+            constraint=models.UniqueConstraint(fields=('owner', 'date', 'category'), name='unique_daily_costs'),
+        ),
+        migrations.RunSQL(
+            sql=(
+                "INSERT INTO cost_daily_rollup "
+                "(owner_id, category_id, date, costs_sum, costs_count) "
+                "SELECT owner_id, category_id, date, SUM(costs_sum), COUNT(*) "
+                "FROM cost GROUP BY owner_id, category_id, date;"
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('costs', '0005_daily_costs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CostsTotals',
+            fields=[
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='costs_totals', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('costs_sum', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('days_count', models.IntegerField()),
+            ],
+            options={
+                'verbose_name': 'costs totals',
+                'verbose_name_plural': 'costs totals',
+                'db_table': 'cost_user_totals',
+            },
+        ),
+        migrations.RunSQL(
+            sql=(
+                "INSERT INTO cost_user_totals "
+                "(owner_id, costs_sum, days_count) "
+                "SELECT owner_id, SUM(costs_sum), COUNT(DISTINCT date) "
+                "FROM cost_daily_rollup GROUP BY owner_id;"
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('costs', '0006_costs_totals'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cost',
+            name='category',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='costs', to='categories.category'),
+        ),
+        migrations.AddIndex(
+            model_name='cost',
+            index=models.Index(fields=['category', 'date'], name='cost_category_date_idx'),
+        ),
+    ]
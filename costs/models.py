@@ -39,7 +39,8 @@ class Cost(ModelWithUUID):
     title = models.CharField(max_length=255)
     costs_sum = models.DecimalField(max_digits=7, decimal_places=2)
     category = models.ForeignKey(
-        Category, on_delete=models.CASCADE, related_name='costs'
+        Category, on_delete=models.CASCADE, related_name='costs',
+        db_index=False
     )
     owner = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='costs'
@@ -52,9 +53,91 @@ class Cost(ModelWithUUID):
         verbose_name = 'cost'
         verbose_name_plural = 'costs'
         ordering = ('-date', '-pub_datetime')
+        indexes = (
+            models.Index(fields=('owner', 'date'), name='cost_owner_date_idx'),
+            models.Index(
+                fields=('category', 'date'), name='cost_category_date_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title
 
     def get_absolute_url(self) -> str:
         return reverse('costs_for_the_date', args=[self.date.isoformat()])
+
+
+class DailyCosts(models.Model):
+    """Costs of user category for the day. It's a rollup of `Cost`
+    entries maintained by costs services to get statistic without
+    aggregating all user costs
+
+    Attributes
+    ----------
+    owner : ForeignKey(User)
+        Costs owner
+    category : ForeignKey(Category)
+        Costs category
+    date : DateField
+        Costs date
+    costs_sum : DecimalField
+        Sum of costs for the day
+    costs_count : IntegerField
+        Number of costs for the day
+
+    """
+
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='daily_costs'
+    )
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name='daily_costs'
+    )
+    date = models.DateField()
+    costs_sum = models.DecimalField(max_digits=15, decimal_places=2)
+    costs_count = models.IntegerField()
+
+    class Meta:
+        db_table = 'cost_daily_rollup'
+        verbose_name = 'daily costs'
+        verbose_name_plural = 'daily costs'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('owner', 'date', 'category'),
+                name='unique_daily_costs',
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.category_id} {self.date}: {self.costs_sum}"
+
+
+class CostsTotals(models.Model):
+    """Running totals of all user costs maintained by costs services
+    to get average costs for the day without aggregating costs
+
+    Attributes
+    ----------
+    owner : OneToOneField(User)
+        Costs owner
+    costs_sum : DecimalField
+        Sum of all user costs
+    days_count : IntegerField
+        Number of distinct days with user costs
+
+    """
+
+    owner = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True,
+        related_name='costs_totals'
+    )
+    costs_sum = models.DecimalField(max_digits=15, decimal_places=2)
+    days_count = models.IntegerField()
+
+    class Meta:
+        db_table = 'cost_user_totals'
+        verbose_name = 'costs totals'
+        verbose_name_plural = 'costs totals'
+
+    def __str__(self):
+        return f"{self.owner_id}: {self.costs_sum} for {self.days_count} days"
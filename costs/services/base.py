@@ -3,14 +3,20 @@ from decimal import Decimal
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import Http404
 from django import forms
 from service_objects.services import Service
 from services.common import (
     GetTotalSumService, GetUserEntriesService, GetForTheDateService,
-    check_entry_owner
+    BulkValidationError, ModelInstanceField, AsyncServiceMixin
 )
+from services.cache import bump_user_data_version
 from ..models import Cost, Category
-from utils.db import execute_sql_command
+from .rollup import change_daily_costs, add_daily_costs
+from utils.db import execute_sql_command, execute_sql_command_async
+from utils.dates import get_month_range, get_year_range, get_months
 
 
 User = get_user_model()
@@ -34,8 +40,49 @@ class GetCostsTotalSumService(GetTotalSumService):
     sum_field_name = 'costs_sum'
 
 
+class GetCostsForTheExportService(Service):
+    """Service returning user costs from optional `from_date` to
+    optional `to_date` inclusive in optional category for the export.
+    Costs are ordered by date and publication datetime, so they're read
+    in order of owner and date index
+    """
+
+    owner = ModelInstanceField(queryset=User.objects.all())
+    category = ModelInstanceField(
+        queryset=Category.objects.all(), required=False
+    )
+    from_date = forms.DateField(required=False)
+    to_date = forms.DateField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        owner = cleaned_data.get('owner')
+        category = cleaned_data.get('category')
+        if owner and category and category.owner_id != owner.pk:
+            self.add_error('category', "Category doesn't exist")
+
+        return cleaned_data
+
+    def process(self) -> QuerySet:
+        """Return queryset of user costs for the export"""
+        owner = self.cleaned_data['owner']
+        category = self.cleaned_data.get('category')
+        from_date = self.cleaned_data.get('from_date')
+        to_date = self.cleaned_data.get('to_date')
+
+        costs = Cost.objects.filter(owner=owner)
+        if category:
+            costs = costs.filter(category=category)
+        if from_date:
+            costs = costs.filter(date__gte=from_date)
+        if to_date:
+            costs = costs.filter(date__lte=to_date)
+
+        return costs.order_by('date', 'pub_datetime')
+
+
 def _check_category_owner(category, owner):
-    if not category.owner == owner:
+    if category.owner_id != owner.pk:
         raise ValidationError(
             f"Category `{category.title}` owner is not the "
             "same as cost owner"
@@ -47,8 +94,8 @@ class CreateCostService(Service):
 
     title = forms.CharField(max_length=255)
     costs_sum = forms.DecimalField(max_digits=7, decimal_places=2)
-    category = forms.ModelChoiceField(queryset=Category.objects.all())
-    owner = forms.ModelChoiceField(queryset=User.objects.all())
+    category = ModelInstanceField(queryset=Category.objects.all())
+    owner = ModelInstanceField(queryset=User.objects.all())
     date = forms.DateField(required=False)
     _model = Cost
 
@@ -62,6 +109,10 @@ class CreateCostService(Service):
         _check_category_owner(category, owner)
 
         cost = self._create(title, costs_sum, category, owner, date)
+        change_daily_costs(
+            cost.owner_id, cost.category_id, cost.date, cost.costs_sum, 1
+        )
+        bump_user_data_version(cost.owner_id)
         return cost
 
     def _create(self, title, costs_sum, category, owner, date):
@@ -79,69 +130,219 @@ class CreateCostService(Service):
         return cost
 
 
+class BulkCostForm(forms.Form):
+    """Form to validate a cost of costs bulk creation. Category is
+    validated only as UUID to check all categories in one query
+    """
+
+    title = forms.CharField(max_length=255)
+    costs_sum = forms.DecimalField(max_digits=7, decimal_places=2)
+    category = forms.UUIDField()
+    date = forms.DateField(required=False)
+
+
+class BulkCreateCostsService:
+    """Service to create many costs at once"""
+
+    max_costs_count = 1000
+    form_class = BulkCostForm
+    _model = Cost
+
+    def __init__(self, owner: User):
+        self._owner = owner
+
+    def execute(self, costs_data: list[dict]) -> list[Cost]:
+        """Validate all costs and create them using one INSERT
+
+        Raises
+        ------
+        BulkValidationError
+            If some of costs are invalid. No costs are created then
+
+        """
+        if not costs_data:
+            raise BulkValidationError([{'non_field_errors': [
+                "Expected a non-empty list of costs"
+            ]}])
+        if len(costs_data) > self.max_costs_count:
+            raise BulkValidationError([{'non_field_errors': [
+                f"Expected not more than {self.max_costs_count} costs"
+            ]}])
+
+        if not all(isinstance(cost_data, dict) for cost_data in costs_data):
+            raise BulkValidationError([
+                {} if isinstance(cost_data, dict) else
+                {'non_field_errors': ["Expected a cost object"]}
+                for cost_data in costs_data
+            ])
+
+        costs = self._validate(costs_data)
+        with transaction.atomic():
+            costs = self._model.objects.bulk_create(costs)
+            add_daily_costs(self._owner.pk, costs)
+            bump_user_data_version(self._owner.pk)
+
+        return costs
+
+    def _validate(self, costs_data: list[dict]) -> list[Cost]:
+        forms_list = [self.form_class(cost_data) for cost_data in costs_data]
+        errors = [
+            {field: list(messages) for field, messages in form.errors.items()}
+            for form in forms_list
+        ]
+        categories = self._get_categories(forms_list)
+        for form, form_errors in zip(forms_list, errors):
+            category = form.cleaned_data.get('category')
+            if category and category not in categories:
+                form_errors['category'] = [
+                    f"Category `{category}` doesn't exist"
+                ]
+
+        if any(errors):
+            raise BulkValidationError(errors)
+
+        return [
+            self._model(
+                owner=self._owner, category_id=form.cleaned_data['category'],
+                title=form.cleaned_data['title'],
+                costs_sum=form.cleaned_data['costs_sum'],
+                date=form.cleaned_data['date'] or datetime.date.today()
+            ) for form in forms_list
+        ]
+
+    def _get_categories(self, forms_list: list[forms.Form]) -> set:
+        """Return pks of owner categories used in costs"""
+        categories_pks = {
+            form.cleaned_data['category'] for form in forms_list
+            if 'category' in form.cleaned_data
+        }
+        if not categories_pks:
+            return set()
+
+        return set(Category.objects.filter(
+            owner=self._owner, pk__in=categories_pks
+        ).order_by().values_list('pk', flat=True))
+
+
 class ChangeCostService(Service):
-    """Service to change a concrete cost"""
+    """Service to change a concrete cost of the owner using one UPDATE
+    statement which returns old cost values to change daily costs
+    """
+
+    SQL_CHANGE_COST = (
+        "UPDATE cost SET title = %s, costs_sum = %s, category_id = %s, "
+        "date = COALESCE(%s, cost.date) "
+        "FROM (SELECT uuid, category_id, date, costs_sum FROM cost "
+        "WHERE uuid = %s AND owner_id = %s FOR UPDATE) AS old "
+        "WHERE cost.uuid = old.uuid "
+        "RETURNING old.category_id, old.date, old.costs_sum, cost.date;"
+    )
 
-    cost = forms.ModelChoiceField(queryset=Cost.objects.all())
+    cost = forms.UUIDField()
     title = forms.CharField(max_length=255)
     costs_sum = forms.DecimalField(max_digits=7, decimal_places=2)
-    category = forms.ModelChoiceField(queryset=Category.objects.all())
-    owner = forms.ModelChoiceField(queryset=User.objects.all())
+    category = ModelInstanceField(queryset=Category.objects.all())
+    owner = ModelInstanceField(queryset=User.objects.all())
     date = forms.DateField(required=False)
 
-    def process(self) -> Cost:
-        """Change a concrete cost from `cost` attribute"""
-        cost = self.cleaned_data['cost']
+    def process(self) -> None:
+        """Change a concrete cost with pk from `cost` attribute
+
+        Raises
+        ------
+        Http404
+            If owner doesn't have cost with this pk
+
+        """
+        cost_pk = self.cleaned_data['cost']
         title = self.cleaned_data['title']
         costs_sum = self.cleaned_data['costs_sum']
         category = self.cleaned_data['category']
         owner = self.cleaned_data['owner']
         date = self.cleaned_data['date']
-        check_entry_owner(cost, owner)
-        _check_category_owner(category, cost.owner)
+        # costs of other owners aren't found before checking category
+        if category.owner_id != owner.pk and \
+                not Cost.objects.filter(pk=cost_pk, owner=owner).exists():
+            raise Http404
+        _check_category_owner(category, owner)
 
-        cost = self._change_cost(cost, title, costs_sum, category, date)
-        return cost
+        changed_costs = execute_sql_command(self.SQL_CHANGE_COST, [
+            title, costs_sum, category.pk, date, cost_pk, owner.pk
+        ])
+        if not changed_costs:
+            raise Http404
 
-    def _change_cost(self, cost, title, costs_sum, category, date):
-        cost.title = title
-        cost.costs_sum = costs_sum
-        cost.category = category
-        if date:
-            cost.date = date
+        old_category_id, old_date, old_costs_sum, date = changed_costs[0]
+        self._change_daily_costs(
+            owner.pk, (category.pk, date, costs_sum),
+            (old_category_id, old_date, old_costs_sum)
+        )
+        bump_user_data_version(owner.pk)
+
+    def _change_daily_costs(self, owner_id, new_costs, old_costs):
+        category_id, date, costs_sum = new_costs
+        old_category_id, old_date, old_costs_sum = old_costs
+        if (category_id, date) == (old_category_id, old_date):
+            change_daily_costs(
+                owner_id, category_id, date, costs_sum - old_costs_sum, 0
+            )
+            return
 
-        cost.save()
-        return cost
+        change_daily_costs(
+            owner_id, old_category_id, old_date, -old_costs_sum, -1
+        )
+        change_daily_costs(owner_id, category_id, date, costs_sum, 1)
 
 
 class DeleteCostService(Service):
-    """Service to delete a concrete cost"""
+    """Service to delete a concrete cost of the owner using one DELETE
+    statement which returns cost values to change daily costs
+    """
+
+    SQL_DELETE_COST = (
+        "DELETE FROM cost WHERE uuid = %s AND owner_id = %s "
+        "RETURNING category_id, date, costs_sum;"
+    )
 
-    cost = forms.ModelChoiceField(queryset=Cost.objects.all())
-    owner = forms.ModelChoiceField(queryset=User.objects.all())
+    cost = forms.UUIDField()
+    owner = ModelInstanceField(queryset=User.objects.all())
 
     def process(self) -> None:
-        """Delete a concrete cost from `cost` attribute"""
-        cost = self.cleaned_data['cost']
+        """Delete a concrete cost with pk from `cost` attribute
+
+        Raises
+        ------
+        Http404
+            If owner doesn't have cost with this pk
+
+        """
+        cost_pk = self.cleaned_data['cost']
         owner = self.cleaned_data['owner']
-        check_entry_owner(cost, owner)
 
-        cost.delete()
+        deleted_costs = execute_sql_command(
+            self.SQL_DELETE_COST, [cost_pk, owner.pk]
+        )
+        if not deleted_costs:
+            raise Http404
+
+        category_id, date, costs_sum = deleted_costs[0]
+        change_daily_costs(owner.pk, category_id, date, -costs_sum, -1)
+        bump_user_data_version(owner.pk)
 
 
-class GetStatisticForTheMonthService(Service):
+class GetStatisticForTheMonthService(AsyncServiceMixin, Service):
     """Service with getting costs statistic for the month"""
 
     SQL_GET_STATISTIC_FOR_THE_MONTH = (
-        "SELECT category.title, SUM(cost.costs_sum) "
-        "FROM cost INNER JOIN category "
-        "ON cost.category_id = category.uuid "
-        "WHERE category.owner_id = %s AND "
-        "EXTRACT(month FROM cost.date) = %s AND "
-        "EXTRACT(year FROM cost.date) = %s "
+        "SELECT category.title, SUM(daily.costs_sum) "
+        "FROM cost_daily_rollup AS daily INNER JOIN category "
+        "ON daily.category_id = category.uuid "
+        "WHERE daily.owner_id = %s AND "
+        "daily.date >= %s AND daily.date <= %s "
         "GROUP BY category.title;"
     )
-    user = forms.ModelChoiceField(queryset=User.objects.all())
+    db_transaction = False
+    user = ModelInstanceField(queryset=User.objects.all())
     date = forms.DateField(required=False)
 
     def process(self) -> list[dict]:
@@ -156,14 +357,18 @@ class GetStatisticForTheMonthService(Service):
             }]
 
         """
+        result = execute_sql_command(*self._get_sql_command())
+        return self._format_month_statistic_to_list_of_dicts(result)
+
+    async def process_async(self) -> list[dict]:
+        result = await execute_sql_command_async(*self._get_sql_command())
+        return self._format_month_statistic_to_list_of_dicts(result)
+
+    def _get_sql_command(self) -> tuple[str, list]:
         user = self.cleaned_data['user']
         date = self.cleaned_data.get('date', datetime.date.today())
-        result = execute_sql_command(
-            self.SQL_GET_STATISTIC_FOR_THE_MONTH, [
-                user.pk, date.month, date.year
-            ]
-        )
-        return self._format_month_statistic_to_list_of_dicts(result)
+        start, end = get_month_range(date)
+        return self.SQL_GET_STATISTIC_FOR_THE_MONTH, [user.pk, start, end]
 
     def _format_month_statistic_to_list_of_dicts(
             self, fetch_list: list) -> list[dict]:
@@ -178,16 +383,17 @@ class GetStatisticForTheMonthService(Service):
         return statistic
 
 
-class GetStatisticForTheYearService(Service):
+class GetStatisticForTheYearService(AsyncServiceMixin, Service):
     """Service returning statistic for the year"""
 
     SQL_GET_STATISTIC_FOR_THE_YEAR = (
-        "SELECT EXTRACT(month FROM date), SUM(costs_sum) FROM cost "
-        "WHERE EXTRACT(year FROM cost.date) = %s "
-        "AND owner_id = %s "
+        "SELECT EXTRACT(month FROM date), SUM(costs_sum) "
+        "FROM cost_daily_rollup WHERE owner_id = %s "
+        "AND date >= %s AND date <= %s "
         "GROUP BY EXTRACT(month FROM date);"
     )
-    user = forms.ModelChoiceField(queryset=User.objects.all())
+    db_transaction = False
+    user = ModelInstanceField(queryset=User.objects.all())
     date = forms.DateField(required=False)
 
     def process(self) -> list[dict]:
@@ -202,12 +408,18 @@ class GetStatisticForTheYearService(Service):
             }]
 
         """
+        result = execute_sql_command(*self._get_sql_command())
+        return self._format_year_statistic_to_list_of_dicts(result)
+
+    async def process_async(self) -> list[dict]:
+        result = await execute_sql_command_async(*self._get_sql_command())
+        return self._format_year_statistic_to_list_of_dicts(result)
+
+    def _get_sql_command(self) -> tuple[str, list]:
         user = self.cleaned_data['user']
         date = self.cleaned_data.get('date', datetime.date.today())
-        result = execute_sql_command(
-            self.SQL_GET_STATISTIC_FOR_THE_YEAR, [date.year, user.pk]
-        )
-        return self._format_year_statistic_to_list_of_dicts(result)
+        start, end = get_year_range(date)
+        return self.SQL_GET_STATISTIC_FOR_THE_YEAR, [user.pk, start, end]
 
     def _format_year_statistic_to_list_of_dicts(
             self, fetch_list: list) -> list[dict]:
@@ -222,29 +434,235 @@ class GetStatisticForTheYearService(Service):
         return statistic
 
 
-class GetAverageCostsForTheDayService(Service):
-    """Service returning average costs for the day"""
+class MonthsPeriodService(Service):
+    """Base service validating the period from `from_month` to
+    `to_month` inclusive which isn't longer than `MAX_MONTHS_COUNT`
+    """
+
+    MAX_MONTHS_COUNT = 120
+    user = ModelInstanceField(queryset=User.objects.all())
+    from_month = forms.DateField(input_formats=['%Y-%m'])
+    to_month = forms.DateField(input_formats=['%Y-%m'])
+
+    def clean(self):
+        cleaned_data = super().clean()
+        from_month = cleaned_data.get('from_month')
+        to_month = cleaned_data.get('to_month')
+        if not (from_month and to_month):
+            return cleaned_data
+
+        if from_month > to_month:
+            raise ValidationError("`from` month must not be after `to` month")
+        if len(get_months(from_month, to_month)) > self.MAX_MONTHS_COUNT:
+            raise ValidationError(
+                f"Period must not be longer than {self.MAX_MONTHS_COUNT} "
+                "months"
+            )
 
-    SQL_GET_AVERAGE_COSTS_FOR_THE_DAY = (
-        "SELECT AVG(costs_per_date) FROM ("
-        "    SELECT SUM(costs_sum) AS costs_per_date"
-        "    FROM cost WHERE owner_id = %s GROUP BY date"
-        ") AS foo;"
+        return cleaned_data
+
+    def get_months(self) -> list[datetime.date]:
+        """Return first days of the period months"""
+        return get_months(
+            self.cleaned_data['from_month'], self.cleaned_data['to_month']
+        )
+
+
+class GetStatisticForThePeriodService(MonthsPeriodService):
+    """Service returning costs statistic by categories and months
+    for the period of months
+    """
+
+    SQL_GET_STATISTIC_FOR_THE_PERIOD = (
+        "SELECT category.title, date_trunc('month', daily.date)::date, "
+        "SUM(daily.costs_sum) "
+        "FROM cost_daily_rollup AS daily INNER JOIN category "
+        "ON daily.category_id = category.uuid "
+        "WHERE daily.owner_id = %s AND "
+        "daily.date >= %s AND daily.date <= %s "
+        "GROUP BY category.title, date_trunc('month', daily.date) "
+        "ORDER BY category.title;"
     )
-    user = forms.ModelChoiceField(queryset=User.objects.all())
 
-    def process(self) -> Decimal:
-        """Return user average costs for the day"""
+    def process(self) -> dict:
+        """Return costs statistic grouped by categories and months
+
+        Returns
+        -------
+        dict:
+            {
+                'months': [<month_in_YYYY-MM_format>],
+                'categories': [<category_title>],
+                'costs': [[<sum_of_category_costs_for_the_month>]]
+            }
+
+        Each row of `costs` is a category and each column is a month
+
+        """
         user = self.cleaned_data['user']
+        months = self.get_months()
+        end = get_month_range(months[-1])[1]
         result = execute_sql_command(
-            self.SQL_GET_AVERAGE_COSTS_FOR_THE_DAY, [user.pk]
-        )[0][0]
-        return self._normalize_fetch_result(result)
+            self.SQL_GET_STATISTIC_FOR_THE_PERIOD, [user.pk, months[0], end]
+        )
+        return self._format_period_statistic_to_columns(months, result)
 
-    def _normalize_fetch_result(self, result):
-        if isinstance(result, Decimal):
-            result = result.quantize(Decimal("1.00"))
-        else:
-            result = Decimal("0.00")
+    def _format_period_statistic_to_columns(
+            self, months: list, fetch_list: list) -> dict:
+        """
+        Serialize information from period statistic fetchall result
+        to columnar dict
+        """
+        months_indexes = {month: index for index, month in enumerate(months)}
+        categories, costs = [], []
+        for category, month, costs_sum in fetch_list:
+            if not categories or categories[-1] != category:
+                categories.append(category)
+                costs.append([Decimal('0')] * len(months))
+
+            costs[-1][months_indexes[month]] = costs_sum
+
+        return {
+            'months': [month.strftime('%Y-%m') for month in months],
+            'categories': categories,
+            'costs': costs,
+        }
+
+
+class GetBalanceForThePeriodService(MonthsPeriodService):
+    """Service returning incomes, costs, net and cumulative balance by
+    months for the period of months in one statement. Costs are summed
+    from daily costs and balance starts from the net of all incomes and
+    costs before the period
+    """
+
+    SQL_GET_BALANCE_FOR_THE_PERIOD = (
+        "WITH months AS ("
+        "    SELECT generate_series("
+        "        %(start)s::date, %(last_month)s::date, interval '1 month'"
+        "    )::date AS month"
+        "), month_incomes AS ("
+        "    SELECT date_trunc('month', date)::date AS month,"
+        "    SUM(incomes_sum) AS incomes_sum FROM income"
+        "    WHERE owner_id = %(owner_id)s"
+        "    AND date >= %(start)s AND date <= %(end)s"
+        "    GROUP BY 1"
+        "), month_costs AS ("
+        "    SELECT date_trunc('month', date)::date AS month,"
+        "    SUM(costs_sum) AS costs_sum FROM cost_daily_rollup"
+        "    WHERE owner_id = %(owner_id)s"
+        "    AND date >= %(start)s AND date <= %(end)s"
+        "    GROUP BY 1"
+        "), opening AS ("
+        "    SELECT (SELECT COALESCE(SUM(incomes_sum), 0) FROM income"
+        "        WHERE owner_id = %(owner_id)s AND date < %(start)s)"
+        "    - (SELECT COALESCE(SUM(costs_sum), 0) FROM cost_daily_rollup"
+        "        WHERE owner_id = %(owner_id)s AND date < %(start)s)"
+        "    AS balance"
+        ") SELECT months.month,"
+        "COALESCE(month_incomes.incomes_sum, 0) AS incomes_sum,"
+        "COALESCE(month_costs.costs_sum, 0) AS costs_sum,"
+        "COALESCE(month_incomes.incomes_sum, 0)"
+        "- COALESCE(month_costs.costs_sum, 0) AS net,"
+        "opening.balance + SUM("
+        "    COALESCE(month_incomes.incomes_sum, 0)"
+        "    - COALESCE(month_costs.costs_sum, 0)"
+        ") OVER (ORDER BY months.month) "
+        "FROM months CROSS JOIN opening "
+        "LEFT JOIN month_incomes ON month_incomes.month = months.month "
+        "LEFT JOIN month_costs ON month_costs.month = months.month "
+        "ORDER BY months.month;"
+    )
+
+    def process(self) -> dict:
+        """Return balance by months
+
+        Returns
+        -------
+        dict:
+            {
+                'months': [<month_in_YYYY-MM_format>],
+                'incomes': [<sum_of_incomes_for_the_month>],
+                'costs': [<sum_of_costs_for_the_month>],
+                'net': [<incomes_minus_costs_for_the_month>],
+                'balance': [<balance_at_the_end_of_the_month>]
+            }
+
+        """
+        user = self.cleaned_data['user']
+        months = self.get_months()
+        result = execute_sql_command(self.SQL_GET_BALANCE_FOR_THE_PERIOD, {
+            'owner_id': user.pk, 'start': months[0],
+            'last_month': months[-1], 'end': get_month_range(months[-1])[1]
+        })
+        balance = {
+            'months': [], 'incomes': [], 'costs': [], 'net': [],
+            'balance': []
+        }
+        for month, incomes_sum, costs_sum, net, month_balance in result:
+            balance['months'].append(month.strftime('%Y-%m'))
+            balance['incomes'].append(incomes_sum)
+            balance['costs'].append(costs_sum)
+            balance['net'].append(net)
+            balance['balance'].append(month_balance)
+
+        return balance
+
+
+class GetAverageCostsForTheDayService(AsyncServiceMixin, Service):
+    """Service returning average costs for the day. Without period
+    it's a lookup of user costs totals
+    """
+
+    SQL_GET_COSTS_TOTALS = (
+        "SELECT costs_sum, days_count FROM cost_user_totals "
+        "WHERE owner_id = %s;"
+    )
+    SQL_GET_COSTS_TOTALS_FOR_THE_PERIOD = (
+        "SELECT SUM(costs_sum), COUNT(DISTINCT date) "
+        "FROM cost_daily_rollup "
+        "WHERE owner_id = %s AND date >= %s AND date <= %s;"
+    )
+    db_transaction = False
+    user = ModelInstanceField(queryset=User.objects.all())
+    from_date = forms.DateField(required=False)
+    to_date = forms.DateField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        from_date = cleaned_data.get('from_date')
+        to_date = cleaned_data.get('to_date')
+        if from_date and to_date and from_date > to_date:
+            raise ValidationError("`from` date must not be after `to` date")
+
+        return cleaned_data
+
+    def process(self) -> Decimal:
+        """Return user average costs for the day in the period from
+        `from_date` to `to_date` inclusive or for all time
+        """
+        result = execute_sql_command(*self._get_sql_command())
+        return self._get_average_from_totals(result)
+
+    async def process_async(self) -> Decimal:
+        result = await execute_sql_command_async(*self._get_sql_command())
+        return self._get_average_from_totals(result)
+
+    def _get_sql_command(self) -> tuple[str, list]:
+        user = self.cleaned_data['user']
+        from_date = self.cleaned_data.get('from_date')
+        to_date = self.cleaned_data.get('to_date')
+        if from_date or to_date:
+            return self.SQL_GET_COSTS_TOTALS_FOR_THE_PERIOD, [
+                user.pk, from_date or datetime.date.min,
+                to_date or datetime.date.max
+            ]
+
+        return self.SQL_GET_COSTS_TOTALS, [user.pk]
+
+    def _get_average_from_totals(self, result: list) -> Decimal:
+        if not result or not result[0][1]:
+            return Decimal("0.00")
 
-        return result
+        costs_sum, days_count = result[0]
+        return (costs_sum / days_count).quantize(Decimal("1.00"))
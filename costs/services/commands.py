@@ -1,8 +1,11 @@
 from django.db.models import QuerySet
 
-from services.commands import ListEntriesCommand, DateEntriesListCommand
+from services.commands import (
+    ListEntriesCommand, DateEntriesListCommand, ExportEntriesCommand
+)
 from .base import (
-    GetCostsService, GetCostsTotalSumService, GetCostsForTheDateService
+    GetCostsService, GetCostsTotalSumService, GetCostsForTheDateService,
+    GetCostsForTheExportService
 )
 from ..serializers import CostSerializer
 
@@ -19,6 +22,7 @@ class GetAllCostsCommand(CostsListMixin, ListEntriesCommand):
     """Command to get all user costs"""
 
     get_service = GetCostsService
+    paginate_by = 100
 
 
 class GetCostsForTheMonthCommand(CostsListMixin, DateEntriesListCommand):
@@ -37,3 +41,13 @@ class GetCostsForTheDateCommand(CostsListMixin, DateEntriesListCommand):
 
     def get_entries(self) -> QuerySet:
         return self._service.get_for_the_date(self._date)
+
+
+class ExportCostsCommand(ExportEntriesCommand):
+    """Command to export user costs in CSV"""
+
+    export_service = GetCostsForTheExportService
+    columns = {
+        'uuid': 'uuid', 'date': 'date', 'title': 'title',
+        'category': 'category__title', 'costs_sum': 'costs_sum',
+    }
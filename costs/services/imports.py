@@ -0,0 +1,255 @@
+import csv
+import datetime
+import io
+from decimal import Decimal
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple
+from uuid import UUID
+
+from django import forms
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+
+from categories.models import Category
+from services.cache import bump_user_data_version
+from services.commands import unescape_csv_formula
+from utils.db import execute_sql_statement
+from ..models import Cost
+from .rollup import (
+    add_daily_costs, lock_costs_totals, rebuild_costs_totals
+)
+
+
+User = get_user_model()
+
+
+class ImportCostForm(forms.Form):
+    """Form to validate a cost row of CSV import. Category is validated
+    only as title to find or create all categories of rows batch at once
+    """
+
+    title = forms.CharField(max_length=255)
+    costs_sum = forms.DecimalField(max_digits=7, decimal_places=2)
+    category = forms.CharField(max_length=50)
+    date = forms.DateField(required=False)
+
+
+class ImportedCost(NamedTuple):
+    """Validated cost of CSV import in order of staging table columns
+    before the row ordinal
+    """
+
+    title: str
+    costs_sum: Decimal
+    category_id: UUID
+    date: datetime.date
+
+
+class CostsImporter:
+    """Importer of costs from CSV with header (e.g. costs export).
+    Rows are read lazily and validated by batches, categories of each
+    batch are found by titles in one query and missing categories are
+    created. Valid rows are loaded with `COPY` into the staging table
+    merged into costs with one INSERT in the end, other databases get
+    `bulk_create()` of each batch. Invalid rows are skipped and reported
+    by CSV line numbers. Publication datetimes of costs follow order of
+    CSV rows. Costs are imported in one transaction. Costs totals are
+    locked in the beginning like by other changes of costs, daily costs
+    are added by batches and totals are rebuilt once in the end
+    """
+
+    SQL_CREATE_STAGING_TABLE = (
+        "CREATE TEMPORARY TABLE cost_import ("
+        "title varchar(255) NOT NULL, costs_sum numeric(7, 2) NOT NULL, "
+        "category_id uuid NOT NULL, date date NOT NULL, "
+        "ordinal integer NOT NULL"
+        ") ON COMMIT DROP;"
+    )
+
+    SQL_COPY_TO_STAGING_TABLE = (
+        "COPY cost_import (title, costs_sum, category_id, date, ordinal) "
+        "FROM STDIN WITH (FORMAT csv);"
+    )
+
+    SQL_MERGE_STAGING_TABLE = (
+        "INSERT INTO cost "
+        "(uuid, title, costs_sum, category_id, owner_id, date, pub_datetime) "
+        "SELECT gen_random_uuid(), title, costs_sum, category_id, %s, date, "
+        "now() + ordinal * interval '1 microsecond' "
+        "FROM cost_import ORDER BY ordinal;"
+    )
+
+    SQL_DROP_STAGING_TABLE = "DROP TABLE cost_import;"
+
+    required_columns = ('title', 'category', 'costs_sum')
+    batch_size = 1000
+    form_class = ImportCostForm
+    _model = Cost
+
+    def __init__(self, owner: User):
+        self._owner = owner
+        self.use_copy = connection.vendor == 'postgresql'
+
+    def execute(self, lines: Iterable[str]) -> dict:
+        """Import costs from CSV lines and return import report
+
+        Returns
+        -------
+        dict:
+            {'imported': <number of costs>, 'errors': [
+                {'line': <CSV line>, 'errors': {<field>: [<error>]}}
+            ]}
+
+        Raises
+        ------
+        ValidationError
+            If CSV can't be read or doesn't have required columns.
+            No costs are imported then
+
+        """
+        reader = csv.reader(lines)
+        imported_count, errors = 0, []
+        try:
+            with transaction.atomic():
+                columns = next((row for row in reader if row), None)
+                self._check_columns(columns)
+                lock_costs_totals(self._owner.pk)
+                if self.use_copy:
+                    execute_sql_statement(self.SQL_CREATE_STAGING_TABLE, [])
+
+                rows = self._read_rows(reader, columns)
+                while batch := list(islice(rows, self.batch_size)):
+                    costs, batch_errors = self._validate(batch)
+                    self._load(costs, imported_count)
+                    add_daily_costs(
+                        self._owner.pk, costs, change_totals=False
+                    )
+                    imported_count += len(costs)
+                    errors.extend(batch_errors)
+
+                if self.use_copy:
+                    execute_sql_statement(
+                        self.SQL_MERGE_STAGING_TABLE, [self._owner.pk]
+                    )
+                    execute_sql_statement(self.SQL_DROP_STAGING_TABLE, [])
+
+                if imported_count:
+                    rebuild_costs_totals(self._owner)
+                    bump_user_data_version(self._owner.pk)
+        except (csv.Error, UnicodeDecodeError) as error:
+            raise ValidationError(f"CSV can't be read: {error}")
+
+        return {'imported': imported_count, 'errors': errors}
+
+    def _check_columns(self, columns) -> None:
+        missing_columns = [
+            column for column in self.required_columns
+            if column not in (columns or ())
+        ]
+        if missing_columns:
+            raise ValidationError(
+                "CSV header must have columns: " + ', '.join(missing_columns)
+            )
+
+    def _read_rows(
+            self, reader, columns: list[str]) -> Iterator[tuple[int, dict]]:
+        """Return iterator over rows by columns with CSV line numbers
+        where rows start (quoted values can have line breaks). Empty
+        lines are skipped
+        """
+        line = reader.line_num + 1
+        for values in reader:
+            if values:
+                yield line, dict(zip(columns, values))
+
+            line = reader.line_num + 1
+
+    def _validate(
+            self, batch: list[tuple[int, dict]]
+    ) -> tuple[list[ImportedCost], list[dict]]:
+        """Return valid costs of the batch and errors of invalid rows"""
+        rows, errors = [], []
+        for line, row in batch:
+            cleaned_row, row_errors = self._clean_row(row)
+            if row_errors:
+                errors.append({'line': line, 'errors': row_errors})
+            else:
+                rows.append(cleaned_row)
+
+        categories = self._get_categories({row['category'] for row in rows})
+        today = datetime.date.today()
+        costs = [ImportedCost(
+            title=row['title'], costs_sum=row['costs_sum'],
+            category_id=categories[row['category']],
+            date=row['date'] or today
+        ) for row in rows]
+        return costs, errors
+
+    def _clean_row(self, row: dict) -> tuple[dict, dict]:
+        """Return cleaned row and its errors. Row is cleaned by fields
+        of the form class without creating form, because form copies
+        all its fields and it takes most of the validation time. Values
+        escaped by the export are unescaped
+        """
+        cleaned_row, errors = {}, {}
+        for name, field in self.form_class.base_fields.items():
+            value = row.get(name)
+            if value is not None:
+                value = unescape_csv_formula(value)
+
+            try:
+                cleaned_row[name] = field.clean(value)
+            except ValidationError as error:
+                errors[name] = error.messages
+
+        return cleaned_row, errors
+
+    def _get_categories(self, titles: set[str]) -> dict[str, UUID]:
+        """Return pks of owner categories by titles. Missing categories
+        are created, categories created concurrently are skipped by
+        `unique_for_user` constraint and fetched again
+        """
+        if not titles:
+            return {}
+
+        categories = self._find_categories(titles)
+        missing_titles = titles - categories.keys()
+        if missing_titles:
+            Category.objects.bulk_create([
+                Category(title=title, owner=self._owner)
+                for title in missing_titles
+            ], ignore_conflicts=True)
+            categories |= self._find_categories(missing_titles)
+
+        return categories
+
+    def _find_categories(self, titles: set[str]) -> dict[str, UUID]:
+        return dict(Category.objects.filter(
+            owner=self._owner, title__in=titles
+        ).order_by().values_list('title', 'pk'))
+
+    def _load(self, costs: list[ImportedCost], first_ordinal: int) -> None:
+        """Load costs of the batch. Costs loaded into the staging table
+        are numbered from `first_ordinal` to get increasing publication
+        datetimes in the end. `bulk_create()` sets the current time of
+        each cost
+        """
+        if not costs:
+            return
+
+        if not self.use_copy:
+            self._model.objects.bulk_create([
+                self._model(owner=self._owner, **cost._asdict())
+                for cost in costs
+            ])
+            return
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            (*cost, ordinal)
+            for ordinal, cost in enumerate(costs, first_ordinal)
+        )
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(self.SQL_COPY_TO_STAGING_TABLE, buffer)
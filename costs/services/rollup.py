@@ -0,0 +1,253 @@
+import datetime
+from collections import defaultdict
+from typing import Optional, Iterable
+from uuid import UUID
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+
+from utils.db import execute_sql_command, execute_sql_statement
+
+
+User = get_user_model()
+
+
+SQL_CHANGE_DAILY_COSTS = (
+    "INSERT INTO cost_daily_rollup "
+    "(owner_id, category_id, date, costs_sum, costs_count) "
+    "VALUES (%s, %s, %s, %s, %s) "
+    "ON CONFLICT (owner_id, date, category_id) DO UPDATE SET "
+    "costs_sum = cost_daily_rollup.costs_sum + EXCLUDED.costs_sum, "
+    "costs_count = cost_daily_rollup.costs_count + EXCLUDED.costs_count "
+    "RETURNING id, costs_count;"
+)
+
+SQL_ADD_MANY_DAILY_COSTS = (
+    "INSERT INTO cost_daily_rollup "
+    "(owner_id, category_id, date, costs_sum, costs_count) "
+    "VALUES {values} "
+    "ON CONFLICT (owner_id, date, category_id) DO UPDATE SET "
+    "costs_sum = cost_daily_rollup.costs_sum + EXCLUDED.costs_sum, "
+    "costs_count = cost_daily_rollup.costs_count + EXCLUDED.costs_count;"
+)
+
+SQL_DELETE_DAILY_COSTS = "DELETE FROM cost_daily_rollup WHERE id = %s;"
+
+SQL_CHANGE_COSTS_TOTALS = (
+    "INSERT INTO cost_user_totals (owner_id, costs_sum, days_count) "
+    "VALUES (%s, %s, %s) "
+    "ON CONFLICT (owner_id) DO UPDATE SET "
+    "costs_sum = cost_user_totals.costs_sum + EXCLUDED.costs_sum, "
+    "days_count = cost_user_totals.days_count + EXCLUDED.days_count;"
+)
+
+SQL_ADD_DAYS_WITHOUT_COSTS = (
+    "UPDATE cost_user_totals SET days_count = days_count + %s - ("
+    "    SELECT COUNT(DISTINCT date) FROM cost_daily_rollup"
+    "    WHERE owner_id = %s AND date = ANY(%s)"
+    ") WHERE owner_id = %s;"
+)
+
+SQL_CHANGE_DAYS_COUNT_WITHOUT_ANOTHER_COSTS = (
+    "UPDATE cost_user_totals SET days_count = days_count + %s "
+    "WHERE owner_id = %s AND NOT EXISTS (SELECT 1 FROM cost_daily_rollup "
+    "WHERE owner_id = %s AND date = %s AND id <> %s);"
+)
+
+SQL_CLEAR_COSTS_TOTALS = (
+    "DELETE FROM cost_user_totals WHERE (%s IS NULL OR owner_id = %s);"
+)
+
+SQL_FILL_COSTS_TOTALS = (
+    "INSERT INTO cost_user_totals (owner_id, costs_sum, days_count) "
+    "SELECT owner_id, SUM(costs_sum), COUNT(DISTINCT date) "
+    "FROM cost_daily_rollup WHERE (%s IS NULL OR owner_id = %s) "
+    "GROUP BY owner_id;"
+)
+
+SQL_CLEAR_DAILY_COSTS = (
+    "DELETE FROM cost_daily_rollup WHERE (%s IS NULL OR owner_id = %s);"
+)
+
+SQL_FILL_DAILY_COSTS = (
+    "INSERT INTO cost_daily_rollup "
+    "(owner_id, category_id, date, costs_sum, costs_count) "
+    "SELECT owner_id, category_id, date, SUM(costs_sum), COUNT(*) "
+    "FROM cost WHERE (%s IS NULL OR owner_id = %s) "
+    "GROUP BY owner_id, category_id, date;"
+)
+
+SQL_GET_DAILY_COSTS_MISMATCHES = (
+    "SELECT COALESCE(actual.owner_id, rollup.owner_id), "
+    "COALESCE(actual.category_id, rollup.category_id), "
+    "COALESCE(actual.date, rollup.date), "
+    "actual.costs_sum, actual.costs_count, "
+    "rollup.costs_sum, rollup.costs_count "
+    "FROM ("
+    "    SELECT owner_id, category_id, date, SUM(costs_sum) AS costs_sum,"
+    "    COUNT(*) AS costs_count FROM cost"
+    "    WHERE (%s IS NULL OR owner_id = %s)"
+    "    GROUP BY owner_id, category_id, date"
+    ") AS actual FULL OUTER JOIN ("
+    "    SELECT * FROM cost_daily_rollup"
+    "    WHERE (%s IS NULL OR owner_id = %s)"
+    ") AS rollup "
+    "ON actual.owner_id = rollup.owner_id "
+    "AND actual.category_id = rollup.category_id "
+    "AND actual.date = rollup.date "
+    "WHERE actual.costs_sum IS DISTINCT FROM rollup.costs_sum "
+    "OR actual.costs_count IS DISTINCT FROM rollup.costs_count;"
+)
+
+SQL_GET_COSTS_TOTALS_MISMATCHES = (
+    "SELECT COALESCE(actual.owner_id, totals.owner_id), "
+    "actual.costs_sum, actual.days_count, "
+    "totals.costs_sum, totals.days_count "
+    "FROM ("
+    "    SELECT owner_id, SUM(costs_sum) AS costs_sum,"
+    "    COUNT(DISTINCT date) AS days_count FROM cost"
+    "    WHERE (%s IS NULL OR owner_id = %s)"
+    "    GROUP BY owner_id"
+    ") AS actual FULL OUTER JOIN ("
+    "    SELECT * FROM cost_user_totals"
+    "    WHERE (%s IS NULL OR owner_id = %s)"
+    ") AS totals "
+    "ON actual.owner_id = totals.owner_id "
+    "WHERE COALESCE(actual.costs_sum, 0) <> COALESCE(totals.costs_sum, 0) "
+    "OR COALESCE(actual.days_count, 0) <> COALESCE(totals.days_count, 0);"
+)
+
+
+def change_daily_costs(
+        owner_id: int, category_id: UUID, date: datetime.date,
+        costs_sum: Decimal, costs_count: int) -> None:
+    """Add costs sum and count to the user category daily costs.
+    Daily costs without costs are deleted
+
+    Must be called in the same transaction as the costs change
+
+    """
+    _change_costs_totals(owner_id, costs_sum)
+    daily_costs_id, total_count = execute_sql_command(
+        SQL_CHANGE_DAILY_COSTS,
+        [owner_id, category_id, date, costs_sum, costs_count]
+    )[0]
+    if total_count <= 0:
+        execute_sql_statement(SQL_DELETE_DAILY_COSTS, [daily_costs_id])
+
+    is_day_added = costs_count > 0 and total_count == costs_count
+    if is_day_added or total_count <= 0:
+        execute_sql_statement(SQL_CHANGE_DAYS_COUNT_WITHOUT_ANOTHER_COSTS, [
+            1 if is_day_added else -1, owner_id, owner_id, date,
+            daily_costs_id
+        ])
+
+
+def add_daily_costs(
+        owner_id: int, costs: Iterable, change_totals: bool = True) -> None:
+    """Add created costs to daily costs using one statement. Without
+    `change_totals` costs totals aren't changed, so they must be locked
+    with `lock_costs_totals()` before and rebuilt with
+    `rebuild_costs_totals()` before the end of transaction (e.g. for
+    import of many costs batches)
+
+    Must be called in the same transaction as costs creation
+
+    """
+    daily_costs = defaultdict(lambda: [Decimal('0'), 0])
+    for cost in costs:
+        day_costs = daily_costs[(cost.category_id, cost.date)]
+        day_costs[0] += Decimal(cost.costs_sum)
+        day_costs[1] += 1
+
+    if not daily_costs:
+        return
+
+    if change_totals:
+        total_costs_sum = sum(
+            costs_sum for costs_sum, _ in daily_costs.values()
+        )
+        _change_costs_totals(owner_id, total_costs_sum)
+        dates = list({date for _, date in daily_costs})
+        execute_sql_statement(SQL_ADD_DAYS_WITHOUT_COSTS, [
+            len(dates), owner_id, dates, owner_id
+        ])
+
+    args = []
+    for (category_id, date), (costs_sum, costs_count) in daily_costs.items():
+        args.extend([owner_id, category_id, date, costs_sum, costs_count])
+
+    values = ', '.join(['(%s, %s, %s, %s, %s)'] * len(daily_costs))
+    execute_sql_statement(SQL_ADD_MANY_DAILY_COSTS.format(values=values), args)
+
+
+def _change_costs_totals(owner_id: int, costs_sum: Decimal) -> None:
+    """Add costs sum to the user costs totals. Totals row stays locked
+    until the end of transaction, so it's changed before daily costs
+    and concurrent changes of user costs are serialized. Otherwise
+    transactions adding or deleting costs of the same day in different
+    categories don't see each other daily costs and count the day twice
+    """
+    execute_sql_statement(SQL_CHANGE_COSTS_TOTALS, [owner_id, costs_sum, 0])
+
+
+def lock_costs_totals(owner_id: int) -> None:
+    """Lock the user costs totals (creating them if they don't exist)
+    until the end of transaction before changing daily costs without
+    totals. Changes of costs lock totals before daily costs, so locking
+    them later deadlocks with concurrent changes of the same day costs
+    """
+    _change_costs_totals(owner_id, Decimal('0'))
+
+
+def rebuild_daily_costs(owner: Optional[User] = None) -> None:
+    """Rebuild daily costs and costs totals from costs for the owner
+    or for all users
+    """
+    owner_pk = owner.pk if owner else None
+    execute_sql_statement(SQL_CLEAR_DAILY_COSTS, [owner_pk, owner_pk])
+    execute_sql_statement(SQL_FILL_DAILY_COSTS, [owner_pk, owner_pk])
+    rebuild_costs_totals(owner)
+
+
+def rebuild_costs_totals(owner: Optional[User] = None) -> None:
+    """Rebuild costs totals from daily costs for the owner or for
+    all users
+    """
+    owner_pk = owner.pk if owner else None
+    execute_sql_statement(SQL_CLEAR_COSTS_TOTALS, [owner_pk, owner_pk])
+    execute_sql_statement(SQL_FILL_COSTS_TOTALS, [owner_pk, owner_pk])
+
+
+def get_daily_costs_mismatches(owner: Optional[User] = None) -> list[tuple]:
+    """Return daily costs that differ from actual costs for the owner
+    or for all users
+
+    Returns
+    -------
+    list:
+        [(<owner_id>, <category_id>, <date>, <actual_sum>,
+          <actual_count>, <rollup_sum>, <rollup_count>)]
+
+    """
+    owner_pk = owner.pk if owner else None
+    return execute_sql_command(
+        SQL_GET_DAILY_COSTS_MISMATCHES, [owner_pk] * 4
+    )
+
+
+def get_costs_totals_mismatches(owner: Optional[User] = None) -> list[tuple]:
+    """Return costs totals that differ from actual costs for the owner
+    or for all users
+
+    Returns
+    -------
+    list:
+        [(<owner_id>, <actual_sum>, <actual_days_count>,
+          <totals_sum>, <totals_days_count>)]
+
+    """
+    owner_pk = owner.pk if owner else None
+    return execute_sql_command(
+        SQL_GET_COSTS_TOTALS_MISMATCHES, [owner_pk] * 4
+    )
@@ -0,0 +1,83 @@
+import datetime
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from categories.models import Category
+from ..models import Cost
+from ..services.base import CreateCostService
+from ..services.rollup import (
+    get_daily_costs_mismatches, get_costs_totals_mismatches
+)
+from services.cache import get_user_data_version
+
+
+User = get_user_model()
+
+
+class CostAdminTest(TestCase):
+    """Case of testing that costs admin keeps daily costs consistent"""
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username='testuser', password='testpass'
+        )
+        self.category = Category.objects.create(
+            title='test_category', owner=self.user
+        )
+        self.cost = CreateCostService.execute({
+            'title': 'test_cost', 'costs_sum': '100.00',
+            'category': self.category, 'owner': self.user,
+            'date': datetime.date(2020, 1, 1)
+        })
+        self.client.login(username='testuser', password='testpass')
+
+    def assertDailyCostsConsistent(self):
+        self.assertEqual(get_daily_costs_mismatches(self.user), [])
+        self.assertEqual(get_costs_totals_mismatches(self.user), [])
+
+    def test_add_cost(self):
+        version = get_user_data_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('admin:costs_cost_add'), self.get_cost_data('50.00')
+            )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Cost.objects.count(), 2)
+        self.assertDailyCostsConsistent()
+        self.assertNotEqual(get_user_data_version(self.user.pk), version)
+
+    def test_change_cost(self):
+        response = self.client.post(
+            reverse('admin:costs_cost_change', args=[self.cost.pk]),
+            self.get_cost_data('50.00', date='2020-01-02')
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertDailyCostsConsistent()
+
+    def test_delete_cost(self):
+        response = self.client.post(
+            reverse('admin:costs_cost_delete', args=[self.cost.pk]),
+            {'post': 'yes'}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Cost.objects.exists())
+        self.assertDailyCostsConsistent()
+
+    def test_delete_selected_costs(self):
+        response = self.client.post(reverse('admin:costs_cost_changelist'), {
+            'action': 'delete_selected', '_selected_action': [self.cost.pk],
+            'post': 'yes'
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Cost.objects.exists())
+        self.assertDailyCostsConsistent()
+
+    def get_cost_data(self, costs_sum, date='2020-01-01'):
+        return {
+            'title': 'admin_cost', 'costs_sum': costs_sum,
+            'category': self.category.pk, 'owner': self.user.pk,
+            'date': date
+        }
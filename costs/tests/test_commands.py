@@ -0,0 +1,135 @@
+import csv
+import datetime
+import io
+from decimal import Decimal
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import ValidationError as RequestValidationError
+from service_objects.errors import InvalidInputsError
+
+from generics.unittests import ListEntriesCommandTest
+from costs.services.commands import (
+    GetAllCostsCommand, GetCostsForTheMonthCommand, GetCostsForTheDateCommand,
+    ExportCostsCommand
+)
+from costs.models import Cost
+from categories.models import Category
+
+
+User = get_user_model()
+
+
+class BaseCommandTest(TestCase):
+    """Base class for command tests"""
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username='testuser', password='testpass'
+        )
+        self.category = Category.objects.create(
+            title='test_category', owner=self.user
+        )
+        for costs_sum in ('100.00', '50.00'):
+            Cost.objects.create(
+                title='test_cost', costs_sum=costs_sum, owner=self.user,
+                category=self.category
+            )
+
+        self.total_sum = Decimal('150.00')
+        self.today = datetime.date.today()
+
+
+class GetAllCostsCommandTest(BaseCommandTest, ListEntriesCommandTest):
+    """Case of testing GetAllCostsCommand"""
+
+    def setUp(self):
+        super().setUp()
+        self.command = GetAllCostsCommand(self.user)
+
+    def test_stream_with_cursor(self):
+        """Test: does stream reject cursor instead of streaming from the
+        first entry"""
+        command = GetAllCostsCommand(self.user, cursor='cursor')
+        with self.assertRaises(RequestValidationError):
+            command.stream()
+
+
+class GetCostsForTheMonthCommandTest(BaseCommandTest, ListEntriesCommandTest):
+    """Case of testing GetCostsForTheMonthCommand"""
+
+    def setUp(self):
+        super().setUp()
+        self.command = GetCostsForTheMonthCommand(self.user, self.today)
+
+
+class GetCostsForTheDateCommandTest(BaseCommandTest, ListEntriesCommandTest):
+    """Case of testing GetCostsForTheDateCommand"""
+
+    def setUp(self):
+        super().setUp()
+        self.command = GetCostsForTheDateCommand(self.user, self.today)
+
+
+class ExportCostsCommandTest(BaseCommandTest):
+    """Case of testing ExportCostsCommand"""
+
+    def test_execute(self):
+        """Test: does execute return CSV with costs in date order and
+        their category titles
+        """
+        costs = Cost.objects.order_by('pub_datetime')
+        lines = ''.join(ExportCostsCommand(self.user).execute()).splitlines()
+
+        self.assertEqual(lines, ['uuid,date,title,category,costs_sum'] + [
+            f"{cost.pk},{self.today.isoformat()},test_cost,"
+            f"test_category,{cost.costs_sum}" for cost in costs
+        ])
+
+    def test_execute_with_formulas(self):
+        """Test: does execute escape titles starting as spreadsheet
+        formulas
+        """
+        titles = ['=1+2', '+1', '-1', '@SUM(A1)', '\tcost', "'=1", 'a=1']
+        Cost.objects.all().delete()
+        for title in titles:
+            Cost.objects.create(
+                title=title, costs_sum='-1.00', owner=self.user,
+                category=self.category
+            )
+        Category.objects.filter(pk=self.category.pk).update(title='=cmd')
+
+        export = ''.join(ExportCostsCommand(self.user).execute())
+
+        rows = list(csv.reader(io.StringIO(export)))
+        self.assertCountEqual([row[2:] for row in rows[1:]], [
+            [f"'{title}" if title != 'a=1' else title, "'=cmd", '-1.00']
+            for title in titles
+        ])
+
+    def test_execute_by_parts(self):
+        command = ExportCostsCommand(self.user)
+        command.export_buffer_size = 1
+
+        parts = list(command.execute())
+
+        self.assertEqual(len(parts), 3)
+        self.assertEqual(len(''.join(parts).splitlines()), 3)
+
+    def test_execute_with_period(self):
+        tomorrow = self.today + datetime.timedelta(days=1)
+        command = ExportCostsCommand(
+            self.user, from_date=tomorrow.isoformat()
+        )
+
+        self.assertEqual(
+            ''.join(command.execute()),
+            'uuid,date,title,category,costs_sum\r\n'
+        )
+
+    def test_execute_with_invalid_filters(self):
+        """Test: does execute raise error before CSV is iterated"""
+        command = ExportCostsCommand(self.user, to_date='invalid')
+
+        with self.assertRaises(InvalidInputsError):
+            command.execute()
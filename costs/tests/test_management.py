@@ -0,0 +1,80 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+
+from categories.models import Category
+from ..models import Cost, DailyCosts
+
+
+User = get_user_model()
+
+
+class RebuildDailyCostsCommandTest(TestCase):
+    """Case of testing rebuild_daily_costs management command"""
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username='testuser', password='testpass'
+        )
+        self.category = Category.objects.create(
+            title='test_category', owner=self.user
+        )
+        Cost.objects.create(
+            title='test_cost', costs_sum='100.00', category=self.category,
+            owner=self.user
+        )
+
+    def test_verify_inconsistent_rollup(self):
+        with self.assertRaises(CommandError):
+            call_command('rebuild_daily_costs', verify=True, stdout=StringIO())
+
+    def test_rebuild_for_user(self):
+        call_command('rebuild_daily_costs', user='testuser', stdout=StringIO())
+        self.assertEqual(DailyCosts.objects.filter(owner=self.user).count(), 1)
+        call_command(
+            'rebuild_daily_costs', user='testuser', verify=True,
+            stdout=StringIO()
+        )
+
+    def test_rebuild_for_unknown_user(self):
+        with self.assertRaises(CommandError):
+            call_command('rebuild_daily_costs', user='unknown')
+
+
+class ImportCostsCommandTest(TestCase):
+    """Case of testing import_costs management command"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass'
+        )
+        csv_file = tempfile.NamedTemporaryFile(suffix='.csv', delete=False)
+        with csv_file:
+            csv_file.write(
+                b'\xef\xbb\xbftitle,category,costs_sum\r\n'
+                b'test_cost,test_category,100.00\r\n'
+                b'test_cost,test_category,invalid\r\n'
+            )
+
+        self.path = csv_file.name
+        self.addCleanup(os.remove, self.path)
+
+    def test_import(self):
+        output = StringIO()
+        call_command('import_costs', self.path, user='testuser', stdout=output)
+
+        self.assertEqual(Cost.objects.filter(owner=self.user).count(), 1)
+        self.assertIn('line 3: costs_sum', output.getvalue())
+        self.assertIn('1 costs were imported', output.getvalue())
+
+    def test_import_for_unknown_user(self):
+        with self.assertRaises(CommandError):
+            call_command('import_costs', self.path, user='unknown')
+
+    def test_import_not_existing_file(self):
+        with self.assertRaises(CommandError):
+            call_command('import_costs', 'not_existing.csv', user='testuser')
@@ -1,9 +1,13 @@
+from decimal import Decimal
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from rest_framework.renderers import JSONRenderer
 
 from categories.models import Category
 from ..models import Cost
 from ..serializers import CostSerializer
+from services.serializers import get_values_serializer
 
 
 User = get_user_model()
@@ -34,3 +38,44 @@ class CostSerializerTest(TestCase):
         self.assertEqual(
             self.serializer.data['date'], self.cost.date.isoformat()
         )
+
+
+class CostValuesSerializerTest(TestCase):
+    """Case of testing values serializer of CostSerializer"""
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="testuser", password="testpass"
+        )
+        self.category = Category.objects.create(
+            title="test_category", owner=self.user
+        )
+        for costs_sum in ('100.00', '0.5', '99999.99'):
+            Cost.objects.create(
+                title="test_cost", costs_sum=costs_sum,
+                category=self.category, owner=self.user
+            )
+
+        self.serializer = get_values_serializer(CostSerializer)
+
+    def test_serialize(self):
+        costs = Cost.objects.all()
+        rows = self.serializer.get_values(costs)
+
+        self.assertEqual(
+            JSONRenderer().render(self.serializer.serialize(rows)),
+            JSONRenderer().render(CostSerializer(costs, many=True).data)
+        )
+
+    def test_to_representation_with_not_quantized_sum(self):
+        row = self.serializer.get_values(Cost.objects.all())[0]
+        row = row._replace(costs_sum=Decimal('5'))
+
+        data = self.serializer.to_representation(row)
+        self.assertEqual(data['costs_sum'], '5.00')
+
+    def test_get_values_with_ordering_columns(self):
+        row = self.serializer.get_values(Cost.objects.all(), 'date')[0]
+
+        self.assertIn('pub_datetime', row._fields)
+        self.assertEqual(row._fields.count('date'), 1)
@@ -1,27 +1,60 @@
+import codecs
 import datetime
+import io
+import threading
+import time
 from decimal import Decimal
 
-from django.test import TestCase
+from asgiref.sync import async_to_sync
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.http import Http404
+from service_objects.errors import InvalidInputsError
 
 from generics.unittests import (
-    GetEntriesForTheDateTest, GetEntriesServiceTest
+    GetEntriesForTheDateTest, GetEntriesServiceTest, QueryPlanTestMixin
 )
 from costs.services.base import (
     GetCostsForTheDateService, GetCostsService, GetCostsTotalSumService,
     CreateCostService, ChangeCostService, DeleteCostService,
     GetStatisticForTheMonthService, GetStatisticForTheYearService,
-    GetAverageCostsForTheDayService
+    GetAverageCostsForTheDayService, BulkCreateCostsService,
+    GetStatisticForThePeriodService, GetBalanceForThePeriodService,
+    GetCostsForTheExportService
 )
-from costs.models import Cost
+from services.common import BulkValidationError, ModelInstanceField
+from costs.services.imports import CostsImporter
+from costs.services.commands import ExportCostsCommand
+from costs.services.rollup import (
+    rebuild_daily_costs, get_daily_costs_mismatches,
+    get_costs_totals_mismatches
+)
+from costs.models import Cost, DailyCosts
 from categories.models import Category
+from incomes.models import Income
 
 
 User = get_user_model()
 
 
-class BaseServiceTest(TestCase):
-    """Base class for service tests"""
+def create_daily_costs_for_many_days(owner, days_count=10000):
+    """Create daily costs of the new owner category for many days, so
+    planner prefers indexes with owner and date to other indexes
+    """
+    category = Category.objects.create(title='many_days', owner=owner)
+    start_date = datetime.date(2000, 1, 1)
+    DailyCosts.objects.bulk_create([DailyCosts(
+        owner=owner, category=category,
+        date=start_date + datetime.timedelta(days=number),
+        costs_sum=Decimal('1.00'), costs_count=1
+    ) for number in range(days_count)])
+
+
+class ServiceDataMixin:
+    """Mixin creating user with category and cost for service tests"""
 
     def setUp(self):
         self.user = User.objects.create_superuser(
@@ -36,6 +69,51 @@ class BaseServiceTest(TestCase):
         )
 
 
+class BaseServiceTest(ServiceDataMixin, TestCase):
+    """Base class for service tests"""
+
+
+class ModelInstanceFieldTest(BaseServiceTest):
+    """Case of testing ModelInstanceField with created instances"""
+
+    def test_clean_created_instance(self):
+        """Test: does field convert values assigned before saving
+        without selecting the instance again
+        """
+        field = ModelInstanceField(queryset=Cost.objects.all())
+        with self.assertNumQueries(0):
+            cost = field.clean(self.entry)
+
+        self.assertIs(cost, self.entry)
+        self.assertEqual(cost.costs_sum, Decimal('100.00'))
+        self.assertIsInstance(cost.costs_sum, Decimal)
+
+    def test_clean_instance_with_invalid_value(self):
+        """Test: does field raise ValidationError if instance value
+        can't be converted
+        """
+        self.entry.costs_sum = 'invalid'
+        field = ModelInstanceField(queryset=Cost.objects.all())
+        with self.assertRaises(ValidationError):
+            field.clean(self.entry)
+
+    def test_create_cost_with_created_category(self):
+        """Test: does service check owner of category created with
+        owner pk string
+        """
+        rebuild_daily_costs(self.user)
+        category = Category.objects.create(
+            title='created_category', owner_id=str(self.user.pk)
+        )
+        cost = CreateCostService.execute({
+            'title': 'new_cost', 'costs_sum': '50.00',
+            'category': category, 'owner': self.user
+        })
+
+        self.assertEqual(cost.category_id, category.pk)
+        self.assertEqual(get_costs_totals_mismatches(self.user), [])
+
+
 class GetCostsForTheDateServiceTest(BaseServiceTest, GetEntriesForTheDateTest):
     """Case of testing GetCostsForTheDateService"""
 
@@ -43,6 +121,7 @@ class GetCostsForTheDateServiceTest(BaseServiceTest, GetEntriesForTheDateTest):
         super().setUp()
         self.service = GetCostsForTheDateService(self.user)
         self.today = datetime.date.today()
+        self.owner_date_index = 'cost_owner_date_idx'
 
 
 class GetCostsServiceTest(BaseServiceTest, GetEntriesServiceTest):
@@ -84,21 +163,137 @@ class CreateCostServiceTest(BaseServiceTest):
         self.assertNotEqual(cost, self.entry)
 
 
+class BulkCreateCostsServiceTest(BaseServiceTest):
+    """Case of testing BulkCreateCostsService"""
+
+    def setUp(self):
+        super().setUp()
+        rebuild_daily_costs(self.user)
+        self.service = BulkCreateCostsService(self.user)
+
+    def test_execute(self):
+        """Test: does service execute method create all costs with
+        one categories query and one insert
+        """
+        costs_data = [{
+            'title': f'cost_{number}', 'costs_sum': '10.00',
+            'category': str(self.category.pk), 'date': '2020-01-01'
+        } for number in range(3)]
+        # categories, costs, totals, days and daily costs queries
+        # inside savepoint
+        with self.assertNumQueries(5 + 2):
+            costs = self.service.execute(costs_data)
+
+        self.assertEqual(len(costs), 3)
+        self.assertEqual(Cost.objects.filter(date='2020-01-01').count(), 3)
+        self.assertEqual(get_daily_costs_mismatches(self.user), [])
+
+    def test_execute_with_invalid_costs(self):
+        """Test: does service execute method return errors for each
+        invalid cost and not create any costs
+        """
+        another_user = User.objects.create_user(
+            username='anotheruser', password='anotherpass'
+        )
+        another_category = Category.objects.create(
+            title='another_category', owner=another_user
+        )
+        costs_data = [
+            {'title': 'cost', 'costs_sum': '10.00',
+             'category': str(self.category.pk)},
+            {'title': 'cost', 'costs_sum': 'abc',
+             'category': str(self.category.pk)},
+            {'title': 'cost', 'costs_sum': '10.00',
+             'category': str(another_category.pk)},
+        ]
+        with self.assertRaises(BulkValidationError) as context:
+            self.service.execute(costs_data)
+
+        errors = context.exception.errors
+        self.assertEqual(errors[0], {})
+        self.assertEqual(list(errors[1]), ['costs_sum'])
+        self.assertEqual(list(errors[2]), ['category'])
+        self.assertEqual(Cost.objects.count(), 1)
+
+
 class ChangeCostServiceTest(BaseServiceTest):
     """Case of testing ChangeCostService"""
 
     def test_execute(self):
         """Test: does service execute method change the existing cost"""
         cost_data = {
-            'cost': self.entry, 'title': 'new_cost', 'costs_sum': '100.00',
-            'category': self.category.pk, 'owner': self.user.pk
+            'cost': self.entry.pk, 'title': 'new_cost',
+            'costs_sum': '100.00', 'category': self.category.pk,
+            'owner': self.user.pk
         }
-        cost = ChangeCostService.execute(cost_data)
+        ChangeCostService.execute(cost_data)
         all_costs = Cost.objects.all()
 
-        self.assertEqual(cost.pk, self.entry.pk)
-        self.assertEqual(cost.title, 'new_cost')
         self.assertEqual(len(all_costs), 1)
+        self.assertEqual(all_costs[0].pk, self.entry.pk)
+        self.assertEqual(all_costs[0].title, 'new_cost')
+
+    def test_execute_with_fetched_instances(self):
+        """Test: does service change cost without selecting it and
+        fetched category and owner
+        """
+        rebuild_daily_costs(self.user)
+        category = Category.objects.get(pk=self.category.pk)
+        with CaptureQueriesContext(connection) as context:
+            ChangeCostService.execute({
+                'cost': self.entry.pk, 'title': 'new_cost',
+                'costs_sum': '100.00', 'category': category,
+                'owner': self.user
+            })
+
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        self.assertEqual(selects, [])
+
+    def test_execute_with_not_owner_category(self):
+        """Test: does service raise ValidationError if category owner
+        isn't the cost owner and not change the cost
+        """
+        another_user = User.objects.create_user(
+            username='another_user', password='testpass'
+        )
+        category = Category.objects.create(
+            title='another_category', owner=another_user
+        )
+        with CaptureQueriesContext(connection) as context, \
+                self.assertRaises(ValidationError):
+            ChangeCostService.execute({
+                'cost': self.entry.pk, 'title': 'new_cost',
+                'costs_sum': '100.00', 'category': category,
+                'owner': self.user
+            })
+
+        self.assertEqual(Cost.objects.get().category, self.category)
+        self.assertFalse(any(
+            query['sql'].startswith('UPDATE')
+            for query in context.captured_queries
+        ))
+
+    def test_execute_with_not_owner_cost(self):
+        """Test: does service raise Http404 if cost owner isn't the
+        user and not change the cost
+        """
+        another_user = User.objects.create_user(
+            username='another_user', password='testpass'
+        )
+        category = Category.objects.create(
+            title='another_category', owner=another_user
+        )
+        with self.assertRaises(Http404):
+            ChangeCostService.execute({
+                'cost': self.entry.pk, 'title': 'new_cost',
+                'costs_sum': '100.00', 'category': category,
+                'owner': another_user
+            })
+
+        self.assertEqual(Cost.objects.get().title, 'test_cost')
 
 
 class DeleteCostServiceTest(BaseServiceTest):
@@ -107,19 +302,35 @@ class DeleteCostServiceTest(BaseServiceTest):
     def test_execute(self):
         """Test: does service execute method delete the existing cost"""
         cost_data = {
-            'cost': self.entry, 'owner': self.user.pk
+            'cost': self.entry.pk, 'owner': self.user.pk
         }
         DeleteCostService.execute(cost_data)
         all_costs = Cost.objects.all()
         self.assertEqual(len(all_costs), 0)
 
+    def test_execute_with_not_owner_cost(self):
+        """Test: does service raise Http404 if cost owner isn't the
+        user and not delete the cost
+        """
+        another_user = User.objects.create_user(
+            username='another_user', password='testpass'
+        )
+        with self.assertRaises(Http404):
+            DeleteCostService.execute({
+                'cost': self.entry.pk, 'owner': another_user
+            })
+
+        self.assertEqual(Cost.objects.count(), 1)
+
 
-class GetStatisticForTheMonthServiceTest(BaseServiceTest):
+class GetStatisticForTheMonthServiceTest(
+        BaseServiceTest, QueryPlanTestMixin):
     """Case of testing GetStatisticForTheMonthService"""
 
     def setUp(self):
         super().setUp()
         self.today = datetime.date.today()
+        rebuild_daily_costs(self.user)
 
     def test_get_statistic_for_the_current_month(self):
         """Test: does execute method return correct statistic for
@@ -142,13 +353,42 @@ class GetStatisticForTheMonthServiceTest(BaseServiceTest):
         })
         self.assertEqual(statistic, [])
 
+    def test_get_statistic_for_the_last_month(self):
+        """Test: does execute method return statistic for December of
+        the last year supported by dates
+        """
+        CreateCostService.execute({
+            'title': 'test_cost', 'costs_sum': '50.00',
+            'category': self.category, 'owner': self.user,
+            'date': datetime.date(9999, 12, 31)
+        })
+        statistic = GetStatisticForTheMonthService.execute({
+            'user': self.user, 'date': datetime.date(9999, 12, 1)
+        })
+        self.assertEqual(statistic, [{
+            'category': self.category.title, 'costs': Decimal('50.00')
+        }])
+
+    def test_statistic_query_uses_owner_date_index(self):
+        """Test: does statistic query use daily costs index"""
+        create_daily_costs_for_many_days(self.user)
+        self.analyze(DailyCosts)
+        self.assertQueryUsesIndex(
+            GetStatisticForTheMonthService.SQL_GET_STATISTIC_FOR_THE_MONTH,
+            [self.user.pk, datetime.date(2020, 1, 1),
+             datetime.date(2020, 1, 31)],
+            'unique_daily_costs'
+        )
+
 
-class GetStatisticForTheYearServiceTest(BaseServiceTest):
+class GetStatisticForTheYearServiceTest(
+        BaseServiceTest, QueryPlanTestMixin):
     """Case of testing GetStatisticForTheYearService"""
 
     def setUp(self):
         super().setUp()
         self.today = datetime.date.today()
+        rebuild_daily_costs(self.user)
 
     def test_get_statistic_for_the_current_year(self):
         """Test: does execute method return correct statistic for
@@ -171,12 +411,645 @@ class GetStatisticForTheYearServiceTest(BaseServiceTest):
         })
         self.assertEqual(statistic, [])
 
+    def test_get_statistic_for_the_last_year(self):
+        """Test: does execute method return statistic for the last
+        year supported by dates
+        """
+        CreateCostService.execute({
+            'title': 'test_cost', 'costs_sum': '50.00',
+            'category': self.category, 'owner': self.user,
+            'date': datetime.date(9999, 12, 31)
+        })
+        statistic = GetStatisticForTheYearService.execute({
+            'user': self.user, 'date': datetime.date(9999, 1, 1)
+        })
+        self.assertEqual(statistic, [
+            {'cost_month': 12.0, 'cost_sum': Decimal('50.00')}
+        ])
+
+    def test_statistic_query_uses_owner_date_index(self):
+        """Test: does statistic query use daily costs index"""
+        create_daily_costs_for_many_days(self.user)
+        self.analyze(DailyCosts)
+        self.assertQueryUsesIndex(
+            GetStatisticForTheYearService.SQL_GET_STATISTIC_FOR_THE_YEAR,
+            [self.user.pk, datetime.date(2020, 1, 1),
+             datetime.date(2020, 12, 31)],
+            'unique_daily_costs'
+        )
+
+
+class GetStatisticForThePeriodServiceTest(BaseServiceTest):
+    """Case of testing GetStatisticForThePeriodService"""
+
+    def setUp(self):
+        super().setUp()
+        another_category = Category.objects.create(
+            title='another_category', owner=self.user
+        )
+        Cost.objects.create(
+            title='test_cost', costs_sum='50.00', owner=self.user,
+            category=another_category, date=datetime.date(2020, 1, 31)
+        )
+        Cost.objects.create(
+            title='test_cost', costs_sum='20.00', owner=self.user,
+            category=self.category, date=datetime.date(2020, 3, 1)
+        )
+        rebuild_daily_costs(self.user)
+
+    def test_get_statistic_for_the_period(self):
+        """Test: does execute method return costs by categories and
+        months in columnar format
+        """
+        statistic = GetStatisticForThePeriodService.execute({
+            'user': self.user, 'from_month': '2019-12', 'to_month': '2020-03'
+        })
+
+        self.assertEqual(statistic, {
+            'months': ['2019-12', '2020-01', '2020-02', '2020-03'],
+            'categories': ['another_category', 'test_category'],
+            'costs': [
+                [Decimal('0'), Decimal('50.00'), Decimal('0'), Decimal('0')],
+                [Decimal('0'), Decimal('0'), Decimal('0'), Decimal('20.00')],
+            ]
+        })
+
+    def test_get_statistic_in_one_query(self):
+        """Test: does execute method get statistic in one query
+        without fetching user again
+        """
+        # savepoint and its release are queries too
+        with self.assertNumQueries(3):
+            GetStatisticForThePeriodService.execute({
+                'user': self.user, 'from_month': '2019-12',
+                'to_month': '2020-03'
+            })
+
+    def test_get_statistic_for_the_reversed_period(self):
+        """Test: does execute method raise error if `from` month is
+        after `to` month
+        """
+        with self.assertRaises(InvalidInputsError):
+            GetStatisticForThePeriodService.execute({
+                'user': self.user, 'from_month': '2020-03',
+                'to_month': '2020-01'
+            })
+
 
 class GetAverageCostsForTheDayServiceTest(BaseServiceTest):
     """Case of testing GetAverageCostsForTheDayService"""
 
+    def setUp(self):
+        super().setUp()
+        rebuild_daily_costs(self.user)
+
     def test_execute_returns_correct_data(self):
         average_costs = GetAverageCostsForTheDayService.execute({
             'user': self.user
         })
         self.assertEqual(average_costs, Decimal(self.entry.costs_sum))
+
+    def test_execute_for_the_period(self):
+        """Test: does execute method return average costs only for days
+        in the period
+        """
+        CreateCostService.execute({
+            'title': 'old_cost', 'costs_sum': '10.00',
+            'category': self.category.pk, 'owner': self.user.pk,
+            'date': datetime.date(2020, 1, 1)
+        })
+        CreateCostService.execute({
+            'title': 'old_cost', 'costs_sum': '21.00',
+            'category': self.category.pk, 'owner': self.user.pk,
+            'date': datetime.date(2020, 1, 2)
+        })
+        period_average_costs = GetAverageCostsForTheDayService.execute({
+            'user': self.user, 'from_date': datetime.date(2020, 1, 1),
+            'to_date': datetime.date(2020, 1, 31)
+        })
+        average_costs = GetAverageCostsForTheDayService.execute({
+            'user': self.user
+        })
+        self.assertEqual(period_average_costs, Decimal('15.50'))
+        self.assertEqual(average_costs, Decimal('43.67'))
+
+    def test_execute_for_the_reversed_period(self):
+        """Test: does execute method raise error if `from` date is after
+        `to` date
+        """
+        with self.assertRaises(InvalidInputsError):
+            GetAverageCostsForTheDayService.execute({
+                'user': self.user, 'from_date': datetime.date(2020, 1, 31),
+                'to_date': datetime.date(2020, 1, 1)
+            })
+
+
+class DailyCostsTest(BaseServiceTest):
+    """Case of testing daily costs maintenance by costs services"""
+
+    def setUp(self):
+        super().setUp()
+        rebuild_daily_costs(self.user)
+        self.another_category = Category.objects.create(
+            title='another_category', owner=self.user
+        )
+
+    def assertDailyCosts(self, expected):
+        daily_costs = DailyCosts.objects.filter(owner=self.user).values_list(
+            'category', 'date', 'costs_sum', 'costs_count'
+        )
+        self.assertEqual(set(daily_costs), expected)
+        self.assertEqual(get_daily_costs_mismatches(self.user), [])
+        self.assertEqual(get_costs_totals_mismatches(self.user), [])
+
+    def test_rebuild(self):
+        """Test: does rebuild create daily costs from costs"""
+        self.assertDailyCosts({
+            (self.category.pk, self.entry.date, Decimal('100.00'), 1)
+        })
+
+    def test_create(self):
+        """Test: does CreateCostService add cost to daily costs"""
+        CreateCostService.execute({
+            'title': 'new_cost', 'costs_sum': '50.00',
+            'category': self.category.pk, 'owner': self.user.pk
+        })
+        self.assertDailyCosts({
+            (self.category.pk, self.entry.date, Decimal('150.00'), 2)
+        })
+
+    def test_change_sum(self):
+        """Test: does ChangeCostService change daily costs sum"""
+        ChangeCostService.execute({
+            'cost': self.entry.pk, 'title': 'new_cost', 'costs_sum': '30.00',
+            'category': self.category.pk, 'owner': self.user.pk
+        })
+        self.assertDailyCosts({
+            (self.category.pk, self.entry.date, Decimal('30.00'), 1)
+        })
+
+    def test_change_category_and_date(self):
+        """Test: does ChangeCostService move cost to another daily costs"""
+        ChangeCostService.execute({
+            'cost': self.entry.pk, 'title': 'new_cost', 'costs_sum': '30.00',
+            'category': self.another_category.pk, 'owner': self.user.pk,
+            'date': datetime.date(2020, 1, 1)
+        })
+        self.assertDailyCosts({
+            (self.another_category.pk, datetime.date(2020, 1, 1),
+             Decimal('30.00'), 1)
+        })
+
+    def test_delete(self):
+        """Test: does DeleteCostService remove cost from daily costs"""
+        DeleteCostService.execute({
+            'cost': self.entry.pk, 'owner': self.user.pk
+        })
+        self.assertDailyCosts(set())
+
+    def test_mismatches(self):
+        """Test: does get_daily_costs_mismatches find costs changed
+        bypassing services
+        """
+        Cost.objects.filter(pk=self.entry.pk).update(costs_sum='10.00')
+        mismatches = get_daily_costs_mismatches(self.user)
+        self.assertEqual(len(mismatches), 1)
+        self.assertEqual(mismatches[0][3:], (
+            Decimal('10.00'), 1, Decimal('100.00'), 1
+        ))
+
+
+class ConcurrentDailyCostsTest(TransactionTestCase):
+    """Case of testing costs totals when costs of the same day in
+    different categories are changed by concurrent transactions
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username='testuser', password='testpass'
+        )
+        self.categories = [
+            Category.objects.create(title=title, owner=self.user)
+            for title in ('first_category', 'second_category')
+        ]
+        self.date = datetime.date(2020, 1, 1)
+
+    def create_cost(self, category):
+        return CreateCostService.execute({
+            'title': 'test_cost', 'costs_sum': '100.00',
+            'category': category, 'owner': self.user, 'date': self.date
+        })
+
+    def delete_cost(self, cost):
+        DeleteCostService.execute({'cost': cost.pk, 'owner': self.user})
+
+    def run_concurrently(self, first_change, second_change):
+        """Run the second change while transaction of the first change
+        isn't committed yet"""
+        first_changed = threading.Event()
+        second_started = threading.Event()
+
+        def run_first():
+            try:
+                with transaction.atomic():
+                    first_change()
+                    first_changed.set()
+                    second_started.wait(timeout=5)
+                    # let the second change reach the database
+                    time.sleep(0.2)
+            finally:
+                connection.close()
+
+        def run_second():
+            try:
+                first_changed.wait(timeout=5)
+                second_started.set()
+                second_change()
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=run_first),
+            threading.Thread(target=run_second),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_concurrent_creation(self):
+        """Test: is the day counted once when its first costs are
+        created in different categories concurrently"""
+        first_category, second_category = self.categories
+        self.run_concurrently(
+            lambda: self.create_cost(first_category),
+            lambda: self.create_cost(second_category)
+        )
+
+        self.assertEqual(Cost.objects.count(), 2)
+        self.assertEqual(get_costs_totals_mismatches(self.user), [])
+
+    def test_concurrent_deletion(self):
+        """Test: is the day uncounted when its last costs are deleted
+        in different categories concurrently"""
+        first_cost, second_cost = [
+            self.create_cost(category) for category in self.categories
+        ]
+        self.run_concurrently(
+            lambda: self.delete_cost(first_cost),
+            lambda: self.delete_cost(second_cost)
+        )
+
+        self.assertEqual(Cost.objects.count(), 0)
+        self.assertEqual(get_costs_totals_mismatches(self.user), [])
+
+    def test_import_with_concurrent_creation(self):
+        """Test: doesn't import deadlock with creation of the same day
+        and category cost between import batches"""
+        category = self.categories[0]
+        errors = []
+
+        def create_cost():
+            try:
+                self.create_cost(category)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        creation = threading.Thread(target=create_cost)
+
+        def get_lines():
+            yield 'title,category,costs_sum,date'
+            yield f'first_cost,{category.title},10.00,{self.date}'
+            creation.start()
+            # let the creation reach the database while daily costs of
+            # the first batch are changed and not committed
+            time.sleep(0.2)
+            yield f'second_cost,{category.title},20.00,{self.date}'
+
+        importer = CostsImporter(self.user)
+        importer.batch_size = 1
+        importer.execute(get_lines())
+        creation.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Cost.objects.count(), 3)
+        self.assertEqual(get_daily_costs_mismatches(self.user), [])
+        self.assertEqual(get_costs_totals_mismatches(self.user), [])
+
+
+class GetBalanceForThePeriodServiceTest(BaseServiceTest):
+    """Case of testing GetBalanceForThePeriodService"""
+
+    def setUp(self):
+        super().setUp()
+        costs = (('2019-11-30', '10.00'), ('2020-01-31', '50.00'))
+        for date, costs_sum in costs:
+            Cost.objects.create(
+                title='test_cost', costs_sum=costs_sum, owner=self.user,
+                category=self.category, date=date
+            )
+
+        rebuild_daily_costs(self.user)
+        incomes = (('2019-11-01', '100.00'), ('2020-02-01', '30.00'))
+        for date, incomes_sum in incomes:
+            income = Income.objects.create(
+                incomes_sum=incomes_sum, owner=self.user
+            )
+            Income.objects.filter(pk=income.pk).update(date=date)
+
+    def test_get_balance_for_the_period(self):
+        """Test: does execute method return incomes, costs, net and
+        balance starting from the balance before the period
+        """
+        balance = GetBalanceForThePeriodService.execute({
+            'user': self.user, 'from_month': '2019-12', 'to_month': '2020-02'
+        })
+
+        self.assertEqual(balance, {
+            'months': ['2019-12', '2020-01', '2020-02'],
+            'incomes': [Decimal('0'), Decimal('0'), Decimal('30.00')],
+            'costs': [Decimal('0'), Decimal('50.00'), Decimal('0')],
+            'net': [Decimal('0'), Decimal('-50.00'), Decimal('30.00')],
+            'balance': [
+                Decimal('90.00'), Decimal('40.00'), Decimal('70.00')
+            ],
+        })
+
+    def test_get_balance_in_one_query(self):
+        # savepoint and its release are queries too
+        with self.assertNumQueries(3):
+            GetBalanceForThePeriodService.execute({
+                'user': self.user, 'from_month': '2019-12',
+                'to_month': '2020-02'
+            })
+
+    def test_get_balance_for_the_reversed_period(self):
+        with self.assertRaises(InvalidInputsError):
+            GetBalanceForThePeriodService.execute({
+                'user': self.user, 'from_month': '2020-02',
+                'to_month': '2019-12'
+            })
+
+
+class GetCostsForTheExportServiceTest(BaseServiceTest):
+    """Case of testing GetCostsForTheExportService"""
+
+    def setUp(self):
+        super().setUp()
+        self.another_category = Category.objects.create(
+            title='another_category', owner=self.user
+        )
+        self.old_cost = Cost.objects.create(
+            title='old_cost', costs_sum='50.00', owner=self.user,
+            category=self.another_category, date='2020-01-01'
+        )
+
+    def test_get_all(self):
+        """Test: does execute return all user costs ordered by date"""
+        costs = GetCostsForTheExportService.execute({'owner': self.user})
+
+        self.assertEqual(list(costs), [self.old_cost, self.entry])
+
+    def test_get_for_the_period_in_category(self):
+        costs = GetCostsForTheExportService.execute({
+            'owner': self.user, 'from_date': '2019-12-01',
+            'to_date': '2020-01-31', 'category': self.another_category.pk
+        })
+        self.assertEqual(list(costs), [self.old_cost])
+
+        costs = GetCostsForTheExportService.execute({
+            'owner': self.user, 'from_date': '2019-12-01',
+            'to_date': '2020-01-31', 'category': self.category.pk
+        })
+        self.assertEqual(list(costs), [])
+
+    def test_get_with_another_user_category(self):
+        another_user = User.objects.create_user(
+            username='another_user', password='testpass'
+        )
+        category = Category.objects.create(
+            title='category', owner=another_user
+        )
+
+        with self.assertRaises(InvalidInputsError):
+            GetCostsForTheExportService.execute({
+                'owner': self.user, 'category': category.pk
+            })
+
+    def test_get_with_invalid_date(self):
+        with self.assertRaises(InvalidInputsError):
+            GetCostsForTheExportService.execute({
+                'owner': self.user, 'from_date': '2020-13-01'
+            })
+
+
+class CostsImporterTest(BaseServiceTest):
+    """Case of testing CostsImporter"""
+
+    def import_costs(self, lines, use_copy=True):
+        importer = CostsImporter(self.user)
+        importer.use_copy = use_copy
+        importer.batch_size = 2
+        return importer.execute(lines)
+
+    def get_lines(self):
+        return [
+            'date,title,category,costs_sum\r\n',
+            '2020-01-01,"Coffee, large",test_category,5.50\r\n',
+            '2020-01-01,Taxi,transport,20.00\r\n',
+            'invalid,,transport,1.234\r\n',
+            ',Bus,transport,2.00\r\n',
+        ]
+
+    def test_import(self):
+        """Test: does execute import valid costs in categories found and
+        created by titles and report invalid rows
+        """
+        for use_copy in (True, False):
+            with self.subTest(use_copy=use_copy):
+                Cost.objects.exclude(pk=self.entry.pk).delete()
+                rebuild_daily_costs(self.user)
+                report = self.import_costs(self.get_lines(), use_copy)
+
+                self.assertEqual(report, {'imported': 3, 'errors': [{
+                    'line': 4, 'errors': {
+                        'title': ['This field is required.'],
+                        'costs_sum': [
+                            'Ensure that there are no more than 2 decimal '
+                            'places.'
+                        ],
+                        'date': ['Enter a valid date.'],
+                    }
+                }]})
+                costs = Cost.objects.filter(owner=self.user).exclude(
+                    pk=self.entry.pk
+                ).order_by('title').values_list(
+                    'title', 'costs_sum', 'category__title', 'date'
+                )
+                self.assertEqual(list(costs), [
+                    ('Bus', Decimal('2.00'), 'transport',
+                     datetime.date.today()),
+                    ('Coffee, large', Decimal('5.50'), 'test_category',
+                     datetime.date(2020, 1, 1)),
+                    ('Taxi', Decimal('20.00'), 'transport',
+                     datetime.date(2020, 1, 1)),
+                ])
+                self.assertEqual(Category.objects.filter(
+                    owner=self.user, title='transport'
+                ).count(), 1)
+                self.assertEqual(get_daily_costs_mismatches(self.user), [])
+                self.assertEqual(get_costs_totals_mismatches(self.user), [])
+
+    def test_import_keeps_rows_order(self):
+        """Test: does execute give costs increasing publication
+        datetimes in order of CSV rows
+        """
+        lines = ['date,title,category,costs_sum\r\n'] + [
+            f'2020-01-01,cost_{number},test_category,1.00\r\n'
+            for number in range(5)
+        ]
+        self.import_costs(lines)
+
+        costs = Cost.objects.filter(date=datetime.date(2020, 1, 1)).order_by(
+            'pub_datetime'
+        ).values_list('title', 'pub_datetime')
+        titles, pub_datetimes = zip(*costs)
+        self.assertEqual(
+            titles, tuple(f'cost_{number}' for number in range(5))
+        )
+        self.assertEqual(len(set(pub_datetimes)), 5)
+
+    def test_import_multiline_rows(self):
+        """Test: does execute report invalid rows by lines where they
+        start when quoted values have line breaks
+        """
+        report = self.import_costs([
+            'title,category,costs_sum\r\n',
+            '"first\r\n', 'line",test_category,1.00\r\n',
+            '\r\n',
+            '"second\r\n', 'line",test_category,invalid\r\n',
+            'third,test_category,invalid\r\n',
+        ])
+
+        self.assertEqual(report['imported'], 1)
+        self.assertEqual(
+            [row_errors['line'] for row_errors in report['errors']], [5, 7]
+        )
+
+    def test_import_changes_totals_once(self):
+        """Test: does execute lock costs totals before all batches and
+        rebuild them after all batches instead of changing them by each
+        batch
+        """
+        rebuild_daily_costs(self.user)
+        lines = ['date,title,category,costs_sum\r\n'] + [
+            f'2020-01-0{day},cost,test_category,1.00\r\n'
+            for day in range(1, 6)
+        ]
+
+        with CaptureQueriesContext(connection) as context:
+            self.import_costs(lines)
+
+        queries = [query['sql'] for query in context.captured_queries]
+        totals_queries = [
+            number for number, sql in enumerate(queries)
+            if 'cost_user_totals' in sql
+        ]
+        daily_costs_queries = [
+            number for number, sql in enumerate(queries)
+            if sql.startswith('INSERT INTO cost_daily_rollup')
+        ]
+        self.assertEqual(len(daily_costs_queries), 3)
+        self.assertLess(min(totals_queries), min(daily_costs_queries))
+        self.assertGreater(max(totals_queries), max(daily_costs_queries))
+        self.assertFalse([
+            number for number in totals_queries
+            if min(daily_costs_queries) < number < max(daily_costs_queries)
+        ])
+        self.assertEqual(get_costs_totals_mismatches(self.user), [])
+
+    def test_import_export_with_formulas(self):
+        """Test: does execute unescape titles escaped by the export"""
+        Cost.objects.all().delete()
+        for title in ('=1+2', "'=1", "'text"):
+            Cost.objects.create(
+                title=title, costs_sum='1.00', owner=self.user,
+                category=self.category
+            )
+        export = ''.join(ExportCostsCommand(self.user).execute())
+        Cost.objects.all().delete()
+
+        self.import_costs(io.StringIO(export))
+
+        self.assertCountEqual(
+            Cost.objects.values_list('title', flat=True),
+            ['=1+2', "'=1", "'text"]
+        )
+
+    def test_import_resolves_categories_once_per_batch(self):
+        lines = ['title,category,costs_sum\r\n'] + [
+            'cost,test_category,1.00\r\n'
+        ] * 4
+        importer = CostsImporter(self.user)
+        importer.batch_size = 4
+
+        with CaptureQueriesContext(connection) as context:
+            importer.execute(lines)
+
+        self.assertEqual(len([
+            query for query in context.captured_queries
+            if 'FROM "category"' in query['sql']
+        ]), 1)
+
+    def test_import_without_required_columns(self):
+        with self.assertRaises(ValidationError):
+            self.import_costs(['date,title,costs_sum\r\n'])
+
+        with self.assertRaises(ValidationError):
+            self.import_costs([])
+
+    def test_import_not_utf8(self):
+        lines = codecs.iterdecode([
+            b'title,category,costs_sum\r\n', b'\xff,test_category,1.00\r\n'
+        ], 'utf-8')
+
+        with self.assertRaises(ValidationError):
+            self.import_costs(lines)
+
+        self.assertEqual(Cost.objects.count(), 1)
+
+
+class AsyncStatisticServicesTest(ServiceDataMixin, TransactionTestCase):
+    """Case of testing async execution of statistic services. Async
+    services query database in the thread pool, so test data must be
+    committed
+    """
+
+    def setUp(self):
+        super().setUp()
+        rebuild_daily_costs(self.user)
+
+    def test_execute_async(self):
+        """Test: does execute_async return the same data as execute"""
+        today = datetime.date.today()
+        services_data = (
+            (GetStatisticForTheMonthService, {'date': today}),
+            (GetStatisticForTheYearService, {'date': today}),
+            (GetAverageCostsForTheDayService, {}),
+            (GetAverageCostsForTheDayService, {'from_date': today}),
+        )
+        for service, data in services_data:
+            with self.subTest(service=service.__name__, data=data):
+                data |= {'user': self.user}
+                self.assertEqual(
+                    async_to_sync(service.execute_async)(data),
+                    service.execute(data)
+                )
+
+    def test_execute_async_with_invalid_inputs(self):
+        with self.assertRaises(InvalidInputsError):
+            async_to_sync(GetAverageCostsForTheDayService.execute_async)({
+                'user': self.user, 'from_date': 'invalid'
+            })
@@ -1,11 +1,21 @@
-from django.test import TestCase
+import base64
+import datetime
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
+from django.utils.http import http_date
 
 from ..models import Cost
+from ..services.base import CreateCostService
+from services.cache import bump_user_data_version, get_user_data_version
 from generics.unittests import (
     GetCreateEntriesViewTest, GetUpdateDeleteEntryViewTest,
-    GetEntriesForTheMonthViewTest, GetEntriesForTheDateViewTest
+    GetEntriesForTheMonthViewTest, GetEntriesForTheDateViewTest,
+    QueryBudgetTest
 )
 from categories.models import Category
 
@@ -13,10 +23,11 @@ from categories.models import Category
 User = get_user_model()
 
 
-class ViewTest(TestCase):
-    """Base test class for views"""
+class ViewDataMixin:
+    """Mixin creating user with category for views tests"""
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_superuser(
             username="testuser", password="testpass"
         )
@@ -25,11 +36,23 @@ class ViewTest(TestCase):
         )
 
 
+class ViewTest(ViewDataMixin, TestCase):
+    """Base test class for views"""
+
+
 class GetCreateCostsViewTest(ViewTest, GetCreateEntriesViewTest):
     """Case of testing GetCreateCostsView"""
 
     endpoint = 'all_costs'
 
+    def test_get_stream_with_cursor(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.get(
+            reverse("all_costs"), {'stream': 'true', 'cursor': 'cursor'}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cursor', response.json())
+
     def request_post(self):
         return self.client.post(
             reverse("all_costs"), {
@@ -38,6 +61,162 @@ class GetCreateCostsViewTest(ViewTest, GetCreateEntriesViewTest):
             }, content_type="application/json"
         )
 
+    def test_post_with_not_owner_category(self):
+        another_user = User.objects.create_user(
+            username="another_user", password="testpass"
+        )
+        category = Category.objects.create(
+            title="another_category", owner=another_user
+        )
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.post(
+            reverse("all_costs"), {
+                'title': 'test_cost', 'costs_sum': '100.00',
+                'category': category.pk
+            }, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('non_field_errors', response.json())
+        self.assertFalse(Cost.objects.exists())
+
+
+class BulkCreateCostsViewTest(ViewTest):
+    """Case of testing BulkCreateCostsView"""
+
+    def request_post(self, data):
+        return self.client.post(
+            reverse('bulk_costs'), data, content_type="application/json"
+        )
+
+    def test_post_with_logged_in_user(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.request_post([{
+            'title': 'test_cost', 'costs_sum': '100.00',
+            'category': str(self.category.pk)
+        }])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['costs']), 1)
+
+    def test_post_not_list(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.request_post({'title': 'test_cost'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_post_invalid_costs(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.request_post([{'title': 'test_cost'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            set(response.json()[0]), {'costs_sum', 'category'}
+        )
+
+    def test_post_with_unlogged_in_user(self):
+        response = self.request_post([])
+        self.assertEqual(response.status_code, 403)
+
+
+class ExportCostsViewTest(ViewTest):
+    """Case of testing ExportCostsView"""
+
+    def setUp(self):
+        super().setUp()
+        self.cost = Cost.objects.create(
+            title="test_cost", costs_sum='100.00', owner=self.user,
+            category=self.category, date='2020-01-01'
+        )
+
+    def test_get_with_logged_in_user(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.get(reverse("costs_export"), {
+            'from': '2020-01-01', 'category': str(self.category.pk)
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(
+            response['Content-Disposition'],
+            'attachment; filename="costs.csv"'
+        )
+        self.assertEqual(
+            b''.join(response.streaming_content).decode().splitlines(), [
+                'uuid,date,title,category,costs_sum',
+                f'{self.cost.pk},2020-01-01,test_cost,some_category,100.00'
+            ]
+        )
+
+    def test_get_with_invalid_filters(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.get(reverse("costs_export"), {
+            'from': 'invalid', 'category': 'invalid'
+        })
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            set(response.json()), {'from_date', 'category'}
+        )
+
+    def test_get_with_unlogged_in_user(self):
+        response = self.client.get(reverse("costs_export"))
+        self.assertEqual(response.status_code, 403)
+
+
+class ImportCostsViewTest(ViewTest):
+    """Case of testing ImportCostsView"""
+
+    csv_content = (
+        b'title,category,costs_sum\r\n'
+        b'test_cost,some_category,1.00\r\n'
+    )
+
+    def test_post_csv_body(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.post(
+            reverse("costs_import"), self.csv_content,
+            content_type="text/csv"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'imported': 1, 'errors': []})
+        self.assertEqual(
+            Cost.objects.get(owner=self.user).category, self.category
+        )
+
+    def test_post_csv_file(self):
+        self.client.login(username="testuser", password="testpass")
+        csv_file = SimpleUploadedFile(
+            'costs.csv', self.csv_content, content_type='text/csv'
+        )
+        response = self.client.post(
+            reverse("costs_import"), {'file': csv_file}
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['imported'], 1)
+
+    def test_post_without_file(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.post(reverse("costs_import"), {})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('file', response.json())
+
+    def test_post_without_header(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.post(
+            reverse("costs_import"), b'', content_type="text/csv"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('non_field_errors', response.json())
+
+    def test_post_with_unlogged_in_user(self):
+        response = self.client.post(
+            reverse("costs_import"), self.csv_content,
+            content_type="text/csv"
+        )
+        self.assertEqual(response.status_code, 403)
+
 
 class GetUpdateDeleteCostViewTest(ViewTest, GetUpdateDeleteEntryViewTest):
     """Case of testing GetUpdateDeleteCostView"""
@@ -82,6 +261,13 @@ class CostsMonthStatisticView(ViewTest):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_get_last_month(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.get(
+            reverse("costs_statistic_month", args=("9999", "12"))
+        )
+        self.assertEqual(response.status_code, 200)
+
     def test_get_with_unlogged_in_user(self):
         response = self.client.get(
             reverse("costs_statistic_month", args=("2020", "01"))
@@ -99,6 +285,13 @@ class CostsYearStatisticView(ViewTest):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_get_last_year(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.get(
+            reverse("costs_statistic_year", args=("9999",))
+        )
+        self.assertEqual(response.status_code, 200)
+
     def test_get_with_unlogged_in_user(self):
         response = self.client.get(
             reverse("costs_statistic_year", args=("2020",))
@@ -106,6 +299,80 @@ class CostsYearStatisticView(ViewTest):
         self.assertEqual(response.status_code, 403)
 
 
+class CostsPeriodStatisticView(ViewTest):
+    """Case of testing CostsPeriodStatisticView"""
+
+    def test_get_with_logged_in_user(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.get(
+            reverse("costs_statistic_period"),
+            {'from': '2020-01', 'to': '2020-12'}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_till_last_month(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.get(
+            reverse("costs_statistic_period"),
+            {'from': '9999-01', 'to': '9999-12'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['months']), 12)
+
+    def test_get_with_invalid_period(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.get(
+            reverse("costs_statistic_period"), {'from': '2020-01'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_with_unlogged_in_user(self):
+        response = self.client.get(reverse("costs_statistic_period"))
+        self.assertEqual(response.status_code, 403)
+
+
+class BalanceStatisticView(ViewTest):
+    """Case of testing BalanceStatisticView"""
+
+    def test_get_with_logged_in_user(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.get(
+            reverse("balance_statistic"), {'from': '2020-01', 'to': '2020-12'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['balance']), 12)
+
+    def test_get_till_last_month(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.get(
+            reverse("balance_statistic"), {'from': '9999-01', 'to': '9999-12'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['months'][-1], '9999-12')
+
+    def test_get_with_invalid_period(self):
+        self.client.login(username="testuser", password="testpass")
+        response = self.client.get(
+            reverse("balance_statistic"), {'to': '2020-01'}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('from_month', response.json())
+
+    def test_balance_is_invalidated_by_income_creation(self):
+        self.client.login(username="testuser", password="testpass")
+        month = datetime.date.today().strftime('%Y-%m')
+        period = {'from': month, 'to': month}
+        self.client.get(reverse("balance_statistic"), period)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("all_incomes"), {'incomes_sum': '100.00'},
+                content_type='application/json'
+            )
+
+        response = self.client.get(reverse("balance_statistic"), period)
+        self.assertEqual(response.json()['balance'], [100.0])
+
+
 class AverageCostsView(ViewTest):
     """Case of testing AverageCostsView"""
 
@@ -117,3 +384,271 @@ class AverageCostsView(ViewTest):
     def test_get_with_unlogged_in_user(self):
         response = self.client.get('/costs/statistic/average/')
         self.assertEqual(response.status_code, 403)
+
+
+class StatisticCacheTest(ViewTest):
+    """Case of testing statistic views cache"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username="testuser", password="testpass")
+
+    def request_average(self):
+        return self.client.get('/costs/statistic/average/').json()
+
+    def test_statistic_is_cached(self):
+        self.request_average()
+        self.request_average()
+        response = self.client.get(reverse("statistic_cache_stats"))
+        self.assertEqual(response.json(), {'hits': 1, 'misses': 1})
+
+    def test_cache_is_invalidated_by_cost_creation(self):
+        self.assertEqual(self.request_average(), {'average_costs': 0.0})
+        with self.captureOnCommitCallbacks(execute=True):
+            CreateCostService.execute({
+                'title': 'test_cost', 'costs_sum': '100.00',
+                'category': self.category.pk, 'owner': self.user.pk
+            })
+
+        self.assertEqual(self.request_average(), {'average_costs': 100.0})
+
+    def test_bumps_set_unique_versions(self):
+        """Test: does every bump set a new version without not atomic
+        `incr()`, so concurrent bumps can't collapse into one version"""
+        versions = {get_user_data_version(self.user.pk)}
+        with mock.patch.object(cache, 'incr', side_effect=AssertionError):
+            for _ in range(3):
+                with self.captureOnCommitCallbacks(execute=True):
+                    bump_user_data_version(self.user.pk)
+
+                versions.add(get_user_data_version(self.user.pk))
+
+        self.assertEqual(len(versions), 4)
+
+    def test_cache_stats_with_not_admin_user(self):
+        User.objects.create_user(username="simpleuser", password="testpass")
+        self.client.login(username="simpleuser", password="testpass")
+        response = self.client.get(reverse("statistic_cache_stats"))
+        self.assertEqual(response.status_code, 403)
+
+
+class StatisticAsyncViewsTest(ViewDataMixin, TransactionTestCase):
+    """Case of testing async statistic views. They query database in
+    the thread pool, so test data must be committed
+    """
+
+    def setUp(self):
+        super().setUp()
+        CreateCostService.execute({
+            'title': 'test_cost', 'costs_sum': '100.00',
+            'category': self.category.pk, 'owner': self.user.pk
+        })
+        self.client.login(username="testuser", password="testpass")
+        self.today = datetime.date.today()
+
+    def assertSameAsSyncView(self, url_name, async_url_name, args, data):
+        response = self.client.get(reverse(async_url_name, args=args), data)
+        sync_response = self.client.get(reverse(url_name, args=args), data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(response['ETag'], sync_response['ETag'])
+        self.assertEqual(
+            response['Cache-Control'], sync_response['Cache-Control']
+        )
+
+    def test_get_month_statistic(self):
+        self.assertSameAsSyncView(
+            'costs_statistic_month', 'costs_statistic_month_async',
+            [self.today.year, self.today.month], {}
+        )
+
+    def test_get_year_statistic(self):
+        self.assertSameAsSyncView(
+            'costs_statistic_year', 'costs_statistic_year_async',
+            [self.today.year - 1], {}
+        )
+
+    def test_get_average_costs(self):
+        self.assertSameAsSyncView(
+            'average_costs', 'average_costs_async', [],
+            {'from': self.today.isoformat()}
+        )
+
+    def test_get_with_invalid_period(self):
+        response = self.client.get(
+            reverse('average_costs_async'), {'from': 'invalid'}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('from_date', response.json())
+
+    def test_get_not_modified(self):
+        url = reverse('costs_statistic_year_async', args=[self.today.year])
+        response = self.client.get(url)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_with_unlogged_in_user(self):
+        self.client.logout()
+        response = self.client.get(reverse('average_costs_async'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_get_with_basic_authentication(self):
+        self.client.logout()
+        for password, status_code in (('testpass', 200), ('invalid', 403)):
+            with self.subTest(password=password):
+                credentials = base64.b64encode(
+                    f"testuser:{password}".encode()
+                ).decode()
+                for url_name in ('average_costs_async', 'average_costs'):
+                    response = self.client.get(
+                        reverse(url_name),
+                        HTTP_AUTHORIZATION=f"Basic {credentials}"
+                    )
+
+                    self.assertEqual(response.status_code, status_code)
+
+    def test_post(self):
+        response = self.client.post(reverse('average_costs_async'))
+        self.assertEqual(response.status_code, 405)
+
+
+class ConditionalRequestsTest(ViewTest):
+    """Case of testing ETag and Cache-Control of costs views"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username="testuser", password="testpass")
+        today = datetime.date.today()
+        self.current_month_url = reverse(
+            "costs_statistic_month", args=(today.year, today.month)
+        )
+
+    def test_not_modified(self):
+        response = self.client.get(self.current_month_url)
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.current_month_url,
+                HTTP_IF_NONE_MATCH=response['ETag']
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertIn('ETag', response)
+
+    def test_etag_is_changed_by_cost_creation(self):
+        response = self.client.get(reverse("all_costs"))
+        with self.captureOnCommitCallbacks(execute=True):
+            CreateCostService.execute({
+                'title': 'test_cost', 'costs_sum': '100.00',
+                'category': self.category.pk, 'owner': self.user.pk
+            })
+
+        response = self.client.get(
+            reverse("all_costs"), HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['costs']), 1)
+
+    def test_etags_of_different_users(self):
+        response = self.client.get(reverse("all_costs"))
+        User.objects.create_user(username="simpleuser", password="testpass")
+        self.client.login(username="simpleuser", password="testpass")
+
+        response = self.client.get(
+            reverse("all_costs"), HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since_is_ignored(self):
+        # the change is made in the same second as the previous response
+        if_modified_since = http_date()
+        with self.captureOnCommitCallbacks(execute=True):
+            CreateCostService.execute({
+                'title': 'test_cost', 'costs_sum': '100.00',
+                'category': self.category.pk, 'owner': self.user.pk
+            })
+
+        response = self.client.get(
+            reverse("all_costs"), HTTP_IF_MODIFIED_SINCE=if_modified_since
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_past_month_cache_control(self):
+        response = self.client.get(reverse("month_costs", args=(2020, 1)))
+        self.assertEqual(
+            response['Cache-Control'], 'private, max-age=86400'
+        )
+
+    def test_current_month_cache_control(self):
+        response = self.client.get(self.current_month_url)
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+
+class CostsQueryBudgetTest(ViewTest, QueryBudgetTest):
+    """Case of testing costs endpoints query budgets"""
+
+    def setUp(self):
+        super().setUp()
+        self.costs = [
+            CreateCostService.execute({
+                'title': f'test_cost_{i}', 'costs_sum': '100.00',
+                'category': self.category.pk, 'owner': self.user.pk
+            }) for i in range(5)
+        ]
+
+    def get_budget_requests(self):
+        today = self.costs[0].date
+        cost = self.costs[0]
+        month = today.strftime('%Y-%m')
+        cost_data = {
+            'title': 'test_cost', 'costs_sum': '100.00',
+            'category': str(self.category.pk)
+        }
+        return [
+            ('all_costs', 'GET', [], None),
+            ('all_costs', 'POST', [], cost_data),
+            ('bulk_costs', 'POST', [], [cost_data, cost_data]),
+            ('costs_export', 'GET', [], None),
+            (
+                'costs_import', 'POST', [],
+                'title,category,costs_sum\r\n' + ''.join(
+                    f"test_cost,{title},100.00\r\n"
+                    for title in ['some_category', 'new_category'] * 5
+                )
+            ),
+            (
+                'costs_export', 'GET', [],
+                {'from': today.isoformat(), 'category': self.category.pk}
+            ),
+            ('concrete_cost', 'GET', [cost.pk], None),
+            ('concrete_cost', 'PUT', [cost.pk], cost_data),
+            ('concrete_cost', 'DELETE', [cost.pk], None),
+            ('month_costs', 'GET', [today.year, today.month], None),
+            (
+                'date_costs', 'GET', [today.year, today.month, today.day],
+                None
+            ),
+            (
+                'costs_statistic_month', 'GET',
+                [today.year, today.month], None
+            ),
+            ('costs_statistic_year', 'GET', [today.year], None),
+            (
+                'costs_statistic_period', 'GET', [],
+                {'from': month, 'to': month}
+            ),
+            ('balance_statistic', 'GET', [], {'from': month, 'to': month}),
+            ('average_costs', 'GET', [], None),
+            (
+                'costs_statistic_month_async', 'GET',
+                [today.year, today.month], None
+            ),
+            ('costs_statistic_year_async', 'GET', [today.year], None),
+            ('average_costs_async', 'GET', [], None),
+        ]
@@ -5,6 +5,9 @@ from . import views
 
 urlpatterns = [
     path('', views.GetCreateCostsView.as_view(), name="all_costs"),
+    path('bulk/', views.BulkCreateCostsView.as_view(), name="bulk_costs"),
+    path('export.csv', views.ExportCostsView.as_view(), name="costs_export"),
+    path('import/', views.ImportCostsView.as_view(), name="costs_import"),
     path('<uuid:pk>/', views.GetUpdateDeleteCost.as_view(),
          name="concrete_cost"),
     path(
@@ -23,8 +26,36 @@ urlpatterns = [
         'statistic/<int:year>/',
         views.CostsYearStatisticView.as_view(), name="costs_statistic_year"
     ),
+    path(
+        'statistic/period/',
+        views.CostsPeriodStatisticView.as_view(),
+        name="costs_statistic_period"
+    ),
+    path(
+        'statistic/balance/',
+        views.BalanceStatisticView.as_view(), name="balance_statistic"
+    ),
     path(
         'statistic/average/',
         views.AverageCostsView.as_view(), name="average_costs"
     ),
+    path(
+        'statistic/async/<int:year>/<int:month>/',
+        views.CostsMonthStatisticAsyncView.as_view(),
+        name="costs_statistic_month_async"
+    ),
+    path(
+        'statistic/async/<int:year>/',
+        views.CostsYearStatisticAsyncView.as_view(),
+        name="costs_statistic_year_async"
+    ),
+    path(
+        'statistic/async/average/',
+        views.AverageCostsAsyncView.as_view(), name="average_costs_async"
+    ),
+    path(
+        'statistic/cache/',
+        views.StatisticCacheStatsView.as_view(),
+        name="statistic_cache_stats"
+    ),
 ]
@@ -1,19 +1,33 @@
+import codecs
 import datetime
 
+from django.core.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from service_objects.errors import InvalidInputsError
 
 from generics.views import (
-    GetCreateGenericView, GetUpdateDeleteGenericView, GetForTheDateGenericView
+    GetCreateGenericView, GetUpdateDeleteGenericView,
+    GetForTheDateGenericView, ExportGenericView, AsyncUserDataView,
+    conditional_user_data, get_invalid_inputs_response,
+    get_service_error_response, get_json_response
+)
+from services.common import BulkValidationError
+from services.cache import (
+    get_user_cached, get_user_cached_async, get_user_cache_stats
 )
 from .services.base import (
     CreateCostService, GetCostsService, DeleteCostService, ChangeCostService,
     GetStatisticForTheMonthService, GetStatisticForTheYearService,
-    GetAverageCostsForTheDayService
+    GetAverageCostsForTheDayService, BulkCreateCostsService,
+    GetStatisticForThePeriodService, GetBalanceForThePeriodService
 )
 from .services.commands import (
     GetAllCostsCommand, GetCostsForTheMonthCommand, GetCostsForTheDateCommand,
+    ExportCostsCommand
 )
+from .services.imports import CostsImporter
 from .serializers import CostSerializer
 
 
@@ -21,11 +35,71 @@ class GetCreateCostsView(GetCreateGenericView):
     """View to get all costs and create a new cost"""
 
     get_command = GetAllCostsCommand
+    command_query_params = ('cursor',)
     create_service = CreateCostService
     serializer_class = CostSerializer
     model_name = 'cost'
 
 
+class BulkCreateCostsView(APIView):
+    """View to create many costs at once"""
+
+    service_class = BulkCreateCostsService
+
+    def post(self, request):
+        if not isinstance(request.data, list):
+            return Response(
+                {'non_field_errors': ["Expected a list of costs"]}, status=400
+            )
+
+        service = self.service_class(request.user)
+        try:
+            costs = service.execute(request.data)
+        except BulkValidationError as error:
+            return Response(error.errors, status=400)
+
+        return Response({'costs': [cost.pk for cost in costs]}, status=201)
+
+
+class ExportCostsView(ExportGenericView):
+    """View to export costs in CSV for the period from optional `from`
+    date to optional `to` date in optional `category`
+    """
+
+    get_command = ExportCostsCommand
+    command_query_params = {
+        'from': 'from_date', 'to': 'to_date', 'category': 'category'
+    }
+    filename = 'costs.csv'
+
+
+class ImportCostsView(APIView):
+    """View to import costs from UTF-8 CSV sent as request body or as
+    `file` field of multipart form. CSV is read by lines while costs
+    are imported, so the request body isn't loaded in memory
+    """
+
+    importer_class = CostsImporter
+
+    def post(self, request):
+        if request.content_type.startswith('multipart/form-data'):
+            csv_file = request.FILES.get('file')
+            if not csv_file:
+                return Response(
+                    {'file': ["No file was submitted"]}, status=400
+                )
+        else:
+            csv_file = request.stream or ()
+
+        importer = self.importer_class(request.user)
+        try:
+            report = importer.execute(codecs.iterdecode(csv_file, 'utf-8-sig'))
+        except ValidationError as error:
+            return get_service_error_response(error)
+
+        return Response(report, status=201)
+
+
 class GetUpdateDeleteCost(GetUpdateDeleteGenericView):
     """View to get a concrete cost and change/delete an existing cost"""
 
@@ -53,10 +127,14 @@ class CostsMonthStatisticView(APIView):
 
     service_class = GetStatisticForTheMonthService
 
+    @conditional_user_data
     def get(self, request, year, month):
         date = datetime.date(year, month, 1)
         service_data = {'user': request.user, 'date': date}
-        statistic = self.service_class.execute(service_data)
+        statistic = get_user_cached(
+            request.user.pk, f"costs_statistic_month:{year}:{month}",
+            lambda: self.service_class.execute(service_data)
+        )
         return Response(statistic)
 
 
@@ -65,18 +143,147 @@ class CostsYearStatisticView(APIView):
 
     service_class = GetStatisticForTheYearService
 
+    @conditional_user_data
     def get(self, request, year):
         date = datetime.date(year, 1, 1)
         service_data = {'user': request.user, 'date': date}
-        statistic = self.service_class.execute(service_data)
+        statistic = get_user_cached(
+            request.user.pk, f"costs_statistic_year:{year}",
+            lambda: self.service_class.execute(service_data)
+        )
         return Response(statistic)
 
 
+class CostsPeriodStatisticView(APIView):
+    """View to get costs statistic by categories and months for the
+    period from `from` month to `to` month in `YYYY-MM` format
+    """
+
+    service_class = GetStatisticForThePeriodService
+
+    @conditional_user_data
+    def get(self, request):
+        from_month = request.query_params.get('from', '')
+        to_month = request.query_params.get('to', '')
+        service_data = {
+            'user': request.user, 'from_month': from_month,
+            'to_month': to_month
+        }
+        try:
+            statistic = get_user_cached(
+                request.user.pk,
+                f"costs_statistic_period:{from_month}:{to_month}",
+                lambda: self.service_class.execute(service_data)
+            )
+        except InvalidInputsError as error:
+            return get_invalid_inputs_response(error)
+
+        return Response(statistic)
+
+
+class BalanceStatisticView(APIView):
+    """View to get incomes, costs, net and cumulative balance by months
+    for the period from `from` month to `to` month in `YYYY-MM` format
+    """
+
+    service_class = GetBalanceForThePeriodService
+
+    @conditional_user_data
+    def get(self, request):
+        from_month = request.query_params.get('from', '')
+        to_month = request.query_params.get('to', '')
+        service_data = {
+            'user': request.user, 'from_month': from_month,
+            'to_month': to_month
+        }
+        try:
+            balance = get_user_cached(
+                request.user.pk, f"balance:{from_month}:{to_month}",
+                lambda: self.service_class.execute(service_data)
+            )
+        except InvalidInputsError as error:
+            return get_invalid_inputs_response(error)
+
+        return Response(balance)
+
+
 class AverageCostsView(APIView):
-    """View to get an average costs"""
+    """View to get an average costs for the day for all time or for
+    the period from optional `from` date to optional `to` date
+    """
 
     average_service = GetAverageCostsForTheDayService
 
+    @conditional_user_data
     def get(self, request):
-        average_costs = self.average_service.execute({'user': request.user})
+        from_date = request.query_params.get('from', '')
+        to_date = request.query_params.get('to', '')
+        service_data = {
+            'user': request.user, 'from_date': from_date, 'to_date': to_date
+        }
+        try:
+            average_costs = get_user_cached(
+                request.user.pk, f"average_costs:{from_date}:{to_date}",
+                lambda: self.average_service.execute(service_data)
+            )
+        except InvalidInputsError as error:
+            return get_invalid_inputs_response(error)
+
         return Response({'average_costs': average_costs})
+
+
+class CostsMonthStatisticAsyncView(AsyncUserDataView):
+    """Async version of `CostsMonthStatisticView` for ASGI servers"""
+
+    service_class = GetStatisticForTheMonthService
+
+    async def get(self, request, user, year, month):
+        date = datetime.date(year, month, 1)
+        service_data = {'user': user, 'date': date}
+        statistic = await get_user_cached_async(
+            user.pk, f"costs_statistic_month:{year}:{month}",
+            lambda: self.service_class.execute_async(service_data)
+        )
+        return get_json_response(statistic)
+
+
+class CostsYearStatisticAsyncView(AsyncUserDataView):
+    """Async version of `CostsYearStatisticView` for ASGI servers"""
+
+    service_class = GetStatisticForTheYearService
+
+    async def get(self, request, user, year):
+        date = datetime.date(year, 1, 1)
+        service_data = {'user': user, 'date': date}
+        statistic = await get_user_cached_async(
+            user.pk, f"costs_statistic_year:{year}",
+            lambda: self.service_class.execute_async(service_data)
+        )
+        return get_json_response(statistic)
+
+
+class AverageCostsAsyncView(AsyncUserDataView):
+    """Async version of `AverageCostsView` for ASGI servers"""
+
+    average_service = GetAverageCostsForTheDayService
+
+    async def get(self, request, user):
+        from_date = request.GET.get('from', '')
+        to_date = request.GET.get('to', '')
+        service_data = {
+            'user': user, 'from_date': from_date, 'to_date': to_date
+        }
+        average_costs = await get_user_cached_async(
+            user.pk, f"average_costs:{from_date}:{to_date}",
+            lambda: self.average_service.execute_async(service_data)
+        )
+        return get_json_response({'average_costs': average_costs})
+
+
+class StatisticCacheStatsView(APIView):
+    """View to get statistic cache hits and misses counts"""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_user_cache_stats())
@@ -64,9 +64,12 @@ INSTALLED_APPS = [
     'categories',
     'incomes',
     'accounts',
+    'dashboard',
+    'benchmarks',
 ]
 
 MIDDLEWARE = [
+    'utils.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -136,8 +139,24 @@ CACHES = {
 }
 
 
+# Tests
+
+TEST_RUNNER = 'utils.test_runner.TestRunner'
+
+
+# Number of seconds clients can use responses with data of periods
+# ended before the current month without revalidation
+
+PAST_PERIOD_CACHE_MAX_AGE = 60 * 60 * 24
+
+
 # Logging
 
+# Requests are logged to `DJANGO_LOG_FILE`. Without it they are logged
+# to the console, which is collected by gunicorn and the platform
+
+LOG_FILE = os.getenv('DJANGO_LOG_FILE')
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -159,22 +178,63 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
-        'file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'formatter': 'verbose',
-            'filename': os.path.join(BASE_DIR, 'costsmap.log'),
-        },
     },
 
     'loggers': {
         'filelogger': {
-            'handlers': ['file'],
+            'handlers': ['file' if LOG_FILE else 'console'],
             'level': 'INFO',
         },
     },
 }
 
+if LOG_FILE:
+    LOGGING['handlers']['file'] = {
+        'level': 'INFO',
+        'class': 'logging.FileHandler',
+        'formatter': 'verbose',
+        'filename': LOG_FILE,
+    }
+
+
+# Query budgets
+# Max number of SQL queries for the endpoint by url name and request
+# method including session and user lookups and savepoints of tests
+# transactions. Requests exceeding budget are logged with warning level
+# and fail query budget tests. Queries of async views executed in the
+# thread pool use their own connections and aren't counted
+
+QUERY_BUDGET_DEFAULT = 10
+
+QUERY_BUDGETS = {
+    'all_costs': {'GET': 3, 'POST': 9},
+    'bulk_costs': {'POST': 9},
+    'costs_export': {'GET': 6},
+    'costs_import': {'POST': 15},
+    'concrete_cost': {'GET': 3, 'PUT': 13, 'DELETE': 9},
+    'month_costs': {'GET': 3},
+    'date_costs': {'GET': 3},
+    'costs_statistic_month': {'GET': 5},
+    'costs_statistic_year': {'GET': 5},
+    'costs_statistic_period': {'GET': 5},
+    'balance_statistic': {'GET': 5},
+    'average_costs': {'GET': 5},
+    'costs_statistic_month_async': {'GET': 2},
+    'costs_statistic_year_async': {'GET': 2},
+    'average_costs_async': {'GET': 2},
+    'statistic_cache_stats': {'GET': 2},
+    'all_incomes': {'GET': 3, 'POST': 5},
+    'incomes_export': {'GET': 5},
+    'concrete_income': {'GET': 3, 'PUT': 5, 'DELETE': 5},
+    'month_incomes': {'GET': 3},
+    'date_incomes': {'GET': 3},
+    'all_categories': {'GET': 5, 'POST': 5},
+    'concrete_category': {'GET': 3, 'PUT': 5, 'DELETE': 7},
+    'category_costs': {'GET': 7},
+    'dashboard': {'GET': 9},
+    'account_signup': {'POST': 24},
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -218,6 +278,19 @@ ACCOUNT_UNIQUE_EMAIL = True
 ACCOUNT_SIGNUP_PASSWORD_ENTER_TWICE = False
 
 
+# Default categories
+# Titles of categories created for the new user by language from
+# Accept-Language header of signup request. Users with other languages
+# get categories of DEFAULT_CATEGORIES_LANGUAGE
+
+DEFAULT_CATEGORIES = {
+    'ru': ['Еда', 'Здоровье', 'Развлечения', 'Транспорт', 'Одежда'],
+    'en': ['Food', 'Health', 'Entertainment', 'Transport', 'Clothes'],
+}
+
+DEFAULT_CATEGORIES_LANGUAGE = 'ru'
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.0/topics/i18n/
 
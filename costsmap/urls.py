@@ -22,4 +22,5 @@ urlpatterns = [
     path('costs/', include('costs.urls')),
     path('categories/', include('categories.urls')),
     path('incomes/', include('incomes.urls')),
+    path('dashboard/', include('dashboard.urls')),
 ]
@@ -0,0 +1,72 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+
+from categories.services.commands import GetAllCategoriesCommand
+from costs.services.base import (
+    GetStatisticForTheMonthService, GetStatisticForTheYearService,
+    GetAverageCostsForTheDayService
+)
+from costs.services.commands import GetCostsForTheMonthCommand
+from incomes.services.commands import GetIncomesForTheMonthCommand
+from utils.db import repeatable_read
+
+
+User = get_user_model()
+
+
+class GetDashboardCommand:
+    """Command to get all data of the home screen for the month: month
+    costs and incomes, month and year costs statistic, average costs
+    for the day and categories. Every part is the same data as the
+    endpoint with the same name returns. All parts are read from one
+    snapshot of database, so they are consistent with each other
+    """
+
+    month_costs_command = GetCostsForTheMonthCommand
+    month_incomes_command = GetIncomesForTheMonthCommand
+    categories_command = GetAllCategoriesCommand
+    month_statistic_service = GetStatisticForTheMonthService
+    year_statistic_service = GetStatisticForTheYearService
+    average_service = GetAverageCostsForTheDayService
+
+    def __init__(self, user: User, date: datetime.date):
+        self._user = user
+        self._date = date
+
+    def execute(self) -> dict:
+        """Return home screen data for the month
+
+        Returns
+        -------
+        dict:
+            {
+                'month_costs': <costs for the month>,
+                'month_incomes': <incomes for the month>,
+                'costs_statistic_month': <costs by categories>,
+                'costs_statistic_year': <costs by months of the year>,
+                'average_costs': <average costs for the day>,
+                'categories': <all categories>
+            }
+
+        """
+        service_data = {'user': self._user, 'date': self._date}
+        with repeatable_read():
+            return {
+                'month_costs': self.month_costs_command(
+                    self._user, self._date
+                ).execute(),
+                'month_incomes': self.month_incomes_command(
+                    self._user, self._date
+                ).execute(),
+                'costs_statistic_month': self.month_statistic_service.execute(
+                    service_data
+                ),
+                'costs_statistic_year': self.year_statistic_service.execute(
+                    service_data
+                ),
+                'average_costs': self.average_service.execute(
+                    {'user': self._user}
+                ),
+                'categories': self.categories_command(self._user).execute(),
+            }
@@ -0,0 +1,108 @@
+import datetime
+import threading
+from decimal import Decimal
+
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from categories.models import Category
+from costs.services.base import CreateCostService
+from dashboard.services.commands import GetDashboardCommand
+from incomes.models import Income
+from incomes.services.commands import GetIncomesForTheMonthCommand
+
+
+User = get_user_model()
+
+
+class DashboardDataMixin:
+    """Mixin creating user with category, cost and income"""
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username='testuser', password='testpass'
+        )
+        self.category = Category.objects.create(
+            title='test_category', owner=self.user
+        )
+        self.create_cost('100.00')
+        Income.objects.create(incomes_sum='300.00', owner=self.user)
+        self.today = datetime.date.today()
+
+    def create_cost(self, costs_sum):
+        return CreateCostService.execute({
+            'title': 'test_cost', 'costs_sum': costs_sum,
+            'category': self.category.pk, 'owner': self.user.pk
+        })
+
+
+class GetDashboardCommandTest(DashboardDataMixin, TestCase):
+    """Case of testing GetDashboardCommand"""
+
+    def test_execute(self):
+        dashboard = GetDashboardCommand(self.user, self.today).execute()
+
+        self.assertEqual(dashboard['month_costs']['total_sum'], 100)
+        self.assertEqual(len(dashboard['month_costs']['costs']), 1)
+        self.assertEqual(dashboard['month_incomes']['total_sum'], 300)
+        self.assertEqual(dashboard['costs_statistic_month'], [
+            {'category': 'test_category', 'costs': Decimal('100.00')}
+        ])
+        self.assertEqual(dashboard['costs_statistic_year'], [
+            {'cost_month': self.today.month, 'cost_sum': Decimal('100.00')}
+        ])
+        self.assertEqual(dashboard['average_costs'], Decimal('100.00'))
+        self.assertEqual(
+            [category['title'] for category in dashboard['categories']],
+            ['test_category']
+        )
+
+    def test_execute_for_another_month(self):
+        dashboard = GetDashboardCommand(
+            self.user, datetime.date(2020, 1, 1)
+        ).execute()
+
+        self.assertEqual(dashboard['month_costs']['costs'], [])
+        self.assertEqual(dashboard['costs_statistic_month'], [])
+        self.assertEqual(dashboard['average_costs'], Decimal('100.00'))
+
+
+class GetDashboardCommandSnapshotTest(
+        DashboardDataMixin, TransactionTestCase):
+    """Case of testing that dashboard parts are read from one snapshot
+    when cost is created concurrently
+    """
+
+    def create_cost_concurrently(self):
+        def create_cost():
+            try:
+                self.create_cost('50.00')
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=create_cost)
+        thread.start()
+        thread.join()
+
+    def test_execute_with_concurrent_cost(self):
+        """Test: are costs statistic got after concurrently created cost
+        the same as month costs got before it"""
+        test = self
+
+        class ConcurrentCostIncomesCommand(GetIncomesForTheMonthCommand):
+
+            def execute(self):
+                incomes = super().execute()
+                test.create_cost_concurrently()
+                return incomes
+
+        command = GetDashboardCommand(self.user, self.today)
+        command.month_incomes_command = ConcurrentCostIncomesCommand
+        dashboard = command.execute()
+
+        self.assertEqual(dashboard['month_costs']['total_sum'], 100)
+        self.assertEqual(dashboard['costs_statistic_month'], [
+            {'category': 'test_category', 'costs': Decimal('100.00')}
+        ])
+        self.assertEqual(dashboard['average_costs'], Decimal('100.00'))
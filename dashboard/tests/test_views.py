@@ -0,0 +1,120 @@
+import datetime
+
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+
+from categories.models import Category
+from costs.services.base import CreateCostService
+from generics.unittests import QueryBudgetTest
+from incomes.models import Income
+from utils.db import SQL_SET_REPEATABLE_READ
+
+
+User = get_user_model()
+
+
+class DashboardDataMixin:
+    """Mixin creating user with category, costs and income"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser(
+            username="testuser", password="testpass"
+        )
+        self.category = Category.objects.create(
+            title="some_category", owner=self.user
+        )
+        for costs_sum in ('100.00', '50.00'):
+            CreateCostService.execute({
+                'title': 'test_cost', 'costs_sum': costs_sum,
+                'category': self.category.pk, 'owner': self.user.pk
+            })
+
+        Income.objects.create(incomes_sum='300.00', owner=self.user)
+        self.today = datetime.date.today()
+        self.url = reverse(
+            'dashboard', args=[self.today.year, self.today.month]
+        )
+
+
+class ViewTest(DashboardDataMixin, TestCase):
+    """Base test class for views"""
+
+
+class DashboardViewTest(ViewTest):
+    """Case of testing DashboardView"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username="testuser", password="testpass")
+
+    def test_get(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        dashboard = response.json()
+        month = [self.today.year, self.today.month]
+        for name, url_args in (
+                ('month_costs', month), ('month_incomes', month),
+                ('costs_statistic_month', month),
+                ('costs_statistic_year', [self.today.year])):
+            with self.subTest(name=name):
+                endpoint_response = self.client.get(
+                    reverse(name, args=url_args)
+                )
+                self.assertEqual(dashboard[name], endpoint_response.json())
+
+        average_response = self.client.get(reverse('average_costs'))
+        self.assertEqual(
+            dashboard['average_costs'],
+            average_response.json()['average_costs']
+        )
+        categories_response = self.client.get(reverse('all_categories'))
+        self.assertEqual(dashboard['categories'], categories_response.json())
+
+    def test_get_not_modified(self):
+        response = self.client.get(self.url)
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_past_month_cache_control(self):
+        response = self.client.get(reverse('dashboard', args=(2020, 1)))
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+    def test_get_with_unlogged_in_user(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+
+class DashboardQueryBudgetTest(ViewTest, QueryBudgetTest):
+    """Case of testing dashboard endpoint query budget"""
+
+    def get_budget_requests(self):
+        month = [self.today.year, self.today.month]
+        return [('dashboard', 'GET', month, None)]
+
+
+class DashboardQueriesTest(DashboardDataMixin, TransactionTestCase):
+    """Case of testing dashboard queries outside of tests transaction"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username="testuser", password="testpass")
+
+    def test_get_queries(self):
+        """Test: does dashboard get session, user, set isolation level
+        and get each of six parts with one query"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        queries = [query['sql'] for query in context.captured_queries]
+        self.assertEqual(len(queries), 9, '\n'.join(queries))
+        self.assertEqual(queries[2], SQL_SET_REPEATABLE_READ)
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import views
+
+
+urlpatterns = [
+    path(
+        '<int:year>/<int:month>/', views.DashboardView.as_view(),
+        name="dashboard"
+    ),
+]
@@ -0,0 +1,22 @@
+import datetime
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from generics.views import conditional_user_data
+from .services.commands import GetDashboardCommand
+
+
+class DashboardView(APIView):
+    """View to get all data of the home screen for the month in one
+    request. Dashboard has all time average costs and categories, so
+    responses for past months are revalidated too
+    """
+
+    command = GetDashboardCommand
+
+    @conditional_user_data(cache_period=False)
+    def get(self, request, year, month):
+        date = datetime.date(year, month, 1)
+        dashboard = self.command(request.user, date).execute()
+        return Response(dashboard)
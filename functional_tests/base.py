@@ -4,6 +4,14 @@ import simplejson as json
 from django.urls import reverse
 
 
+def get_json_content(response):
+    """Return loaded JSON content of the response or streaming response"""
+    if response.streaming:
+        return json.loads(b''.join(response.streaming_content))
+
+    return json.loads(response.content)
+
+
 class CRUDFunctionalTest:
     """Tests for crud object functionality"""
 
@@ -22,6 +30,15 @@ class CRUDFunctionalTest:
         """Returns response for GET request on all entries endpoint"""
         raise NotImplementedError
 
+    def test_get_all_endpoint_stream(self):
+        """Test: does GET all endpoint with `stream` param return the
+        same document as without it"""
+        response = self.client.get(
+            reverse(self.all_endpoint), {'stream': 'true'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_json_content(response), self.get_all_response())
+
     def test_get_all_endpoint_with_bad_user(self):
         """Test: does GET all endpoint requested by bad user return no
         user entries"""
@@ -128,6 +145,18 @@ class DateCRUDFunctionalTest(CRUDFunctionalTest):
         """Return response for GET request on month endpoint"""
         raise NotImplementedError
 
+    def test_get_for_the_month_stream(self):
+        today = datetime.date.today()
+        response = self.client.get(
+            reverse(self.month_endpoint, args=[today.year, today.month]),
+            {'stream': 'true'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            get_json_content(response), self.get_month_response()
+        )
+
     def test_get_for_the_another_month(self):
         random_date = datetime.date(2020, 1, 1)
         response = self._request_month_endpoint(random_date)
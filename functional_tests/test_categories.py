@@ -7,6 +7,7 @@ from django.urls import reverse
 from .base import CRUDFunctionalTest
 from categories.models import Category
 from costs.models import Cost
+from costs.services.rollup import rebuild_daily_costs
 
 
 User = get_user_model()
@@ -52,6 +53,7 @@ class CategoriesAPIEndpointsTest(TestCase, CRUDFunctionalTest):
 			title='some_cost', costs_sum='100.00', category=self.entry,
 			owner=self.user
 		)
+		rebuild_daily_costs(self.user)
 		serialized_cost = {
 			'pk': str(cost.pk), 'title': 'some_cost', 'costs_sum': '100.00',
 			'category': str(self.entry.pk), 'owner': self.user.pk,
@@ -65,5 +67,6 @@ class CategoriesAPIEndpointsTest(TestCase, CRUDFunctionalTest):
 		self.assertEqual(json_response, {
 			'total_sum': 100.0,
 			'costs': [serialized_cost],
-			'category': self.entry.title
+			'category': self.entry.title,
+			'next': None
 		})
@@ -1,13 +1,19 @@
+import base64
 import datetime
+from unittest import mock
+
 import simplejson as json
 
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
 from .base import DateCRUDFunctionalTest
 from categories.models import Category
 from costs.models import Cost
+from costs.services.commands import GetAllCostsCommand
+from costs.services.rollup import rebuild_daily_costs
 
 
 User = get_user_model()
@@ -23,6 +29,7 @@ class CostsAPIEndpointsTest(TestCase, DateCRUDFunctionalTest):
     model = Cost
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_superuser(
             username="testuser", password="testpass"
         )
@@ -37,6 +44,7 @@ class CostsAPIEndpointsTest(TestCase, DateCRUDFunctionalTest):
             title='test_cost', costs_sum='100.00', category=self.category,
             owner=self.user
         )
+        rebuild_daily_costs(self.user)
         self.serialized_entry = {
             'pk': str(self.entry.pk), 'title': 'test_cost',
             'costs_sum': '100.00',
@@ -47,15 +55,53 @@ class CostsAPIEndpointsTest(TestCase, DateCRUDFunctionalTest):
     def get_all_response(self):
         return {
             'total_sum': float(self.entry.costs_sum),
-            'costs': [self.serialized_entry]
+            'costs': [self.serialized_entry],
+            'next': None
         }
 
     def get_all_bad_response(self):
         return {
             'total_sum': 0.0,
-            'costs': []
+            'costs': [],
+            'next': None
         }
 
+    def test_get_all_endpoint_by_pages(self):
+        older_cost = Cost.objects.create(
+            title='older_cost', costs_sum='50.00', category=self.category,
+            owner=self.user, date=datetime.date(2020, 1, 1)
+        )
+        with mock.patch.object(GetAllCostsCommand, 'paginate_by', 1):
+            first_page = json.loads(self._request_get_all_endpoint().content)
+            response = self.client.get(
+                reverse(self.all_endpoint), {'cursor': first_page['next']}
+            )
+
+        self.assertEqual(first_page['total_sum'], 150.0)
+        self.assertEqual(first_page['costs'], [self.serialized_entry])
+        self.assertTrue(first_page['next'])
+        second_page = json.loads(response.content)
+        self.assertEqual(second_page['total_sum'], 150.0)
+        self.assertEqual(
+            [cost['pk'] for cost in second_page['costs']],
+            [str(older_cost.pk)]
+        )
+        self.assertIsNone(second_page['next'])
+
+    def test_get_all_endpoint_with_invalid_cursor(self):
+        response = self.client.get(
+            reverse(self.all_endpoint), {'cursor': 'invalid'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_all_endpoint_with_null_cursor_values(self):
+        cursor = base64.urlsafe_b64encode(b'[null, null, null]').decode()
+        response = self.client.get(
+            reverse(self.all_endpoint), {'cursor': cursor}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'cursor': 'Invalid cursor'})
+
     def get_create_data(self):
         return {
             'title': 'some_cost', 'costs_sum': '100.00',
@@ -1,10 +1,14 @@
 import datetime
+from unittest import mock
 
+import simplejson as json
 from django.test import TestCase
+from django.urls import reverse
 from django.contrib.auth import get_user_model
 
 from .base import CRUDFunctionalTest
 from incomes.models import Income
+from incomes.services.commands import GetAllIncomesCommand
 
 
 User = get_user_model()
@@ -39,15 +43,36 @@ class IncomesAPIEndpointsTest(TestCase, CRUDFunctionalTest):
         """Test: does /incomes/ endpoint return all incomes"""
         return {
             'total_sum': float(self.entry.incomes_sum),
-            'incomes': [self.serialized_entry]
+            'incomes': [self.serialized_entry],
+            'next': None
         }
 
     def get_all_bad_response(self):
         return {
             'total_sum': 0.0,
-            'incomes': []
+            'incomes': [],
+            'next': None
         }
 
+    def test_get_all_endpoint_by_pages(self):
+        newer_income = Income.objects.create(
+            incomes_sum='50.00', owner=self.user
+        )
+        with mock.patch.object(GetAllIncomesCommand, 'paginate_by', 1):
+            first_page = json.loads(self._request_get_all_endpoint().content)
+            response = self.client.get(
+                reverse(self.all_endpoint), {'cursor': first_page['next']}
+            )
+
+        self.assertEqual(first_page['total_sum'], 150.0)
+        self.assertEqual(
+            [income['pk'] for income in first_page['incomes']],
+            [str(newer_income.pk)]
+        )
+        second_page = json.loads(response.content)
+        self.assertEqual(second_page['incomes'], [self.serialized_entry])
+        self.assertIsNone(second_page['next'])
+
     def get_create_data(self):
         return {
             'incomes_sum': '500.00'
@@ -1,11 +1,96 @@
+import copy
 import datetime
 import uuid
 
+from django.db import connection
 from django.http import Http404
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from utils.middleware import get_query_budget
 
-class GetEntriesForTheDateTest:
+
+class QueryPlanTestMixin:
+	"""Mixin with assertions about PostgreSQL query plans"""
+
+	def assertQueryUsesIndex(self, sql, params, index_name):
+		"""Assert that query plan uses index when sequential scan
+		is disabled (tests tables are too small to prefer indexes)
+		"""
+		self.assertIn(index_name, self.get_query_plan(sql, params))
+
+	def assertQuerySetUsesIndex(self, queryset, index_name):
+		sql, params = queryset.query.sql_with_params()
+		self.assertQueryUsesIndex(sql, params, index_name)
+
+	def assertQuerySetReadsIndexOrder(self, queryset):
+		"""Assert that queryset entries are read by index scan in the
+		index order without sort step
+		"""
+		sql, params = queryset.query.sql_with_params()
+		plan = self.get_query_plan(
+			sql, params, "SET LOCAL enable_bitmapscan = off"
+		)
+		self.assertRegex(plan, r"Index Scan (Backward )?using")
+		self.assertNotIn('Sort', plan)
+
+	def analyze(self, *models):
+		"""Collect statistics of models tables, so the planner chooses
+		indexes by tables data instead of defaults for empty tables
+		"""
+		with connection.cursor() as cursor:
+			for model in models:
+				cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+	def get_query_plan(self, sql, params, *settings) -> str:
+		"""Return query plan with disabled sequential scan and other
+		planner settings
+		"""
+		with connection.cursor() as cursor:
+			cursor.execute("SET LOCAL enable_seqscan = off")
+			for setting in settings:
+				cursor.execute(setting)
+			cursor.execute(f"EXPLAIN {sql}", params)
+			return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+class QueryBudgetTest:
+	"""Tests that endpoints don't exceed their query budgets from
+	`QUERY_BUDGETS` setting. Entries must be created several times to
+	find N+1 queries
+	"""
+
+	def get_budget_requests(self):
+		"""Return list of `(url_name, method, url_args, data)` requests
+		in order of execution
+		"""
+		raise NotImplementedError
+
+	def test_endpoints_query_budgets(self):
+		self.client.login(username='testuser', password='testpass')
+		for url_name, method, url_args, data in self.get_budget_requests():
+			with self.subTest(url_name=url_name, method=method):
+				self.assertWithinQueryBudget(url_name, method, url_args, data)
+
+	def assertWithinQueryBudget(self, url_name, method, url_args, data):
+		budget = get_query_budget(url_name, method)
+		request = getattr(self.client, method.lower())
+		with CaptureQueriesContext(connection) as context:
+			response = request(
+				reverse(url_name, args=url_args), data,
+				content_type='application/json'
+			)
+
+		self.assertLess(response.status_code, 400)
+		self.assertLessEqual(
+			len(context.captured_queries), budget,
+			f"{method} {url_name} exceeds query budget:\n" + '\n'.join(
+				query['sql'] for query in context.captured_queries
+			)
+		)
+
+
+class GetEntriesForTheDateTest(QueryPlanTestMixin):
 	"""Tests for Get<model>ForTheDateService service"""
 
 	def test_get_for_the_today_month(self):
@@ -32,6 +117,33 @@ class GetEntriesForTheDateTest:
 		entries = self.service.get_for_the_date(datetime.date(2020, 1, 1))
 		self.assertEqual(len(entries), 0)
 
+	def test_get_for_the_month_uses_owner_date_index(self):
+		"""Test: does get_for_the_month query use (owner, date) index"""
+		self.create_entry_copies_for_many_days()
+		entries = self.service.get_for_the_month(self.today)
+		self.assertQuerySetUsesIndex(entries, self.owner_date_index)
+
+	def create_entry_copies_for_many_days(self, days_count=10000):
+		"""Create copies of the entry for many days before it and
+		collect statistics, so the planner prefers (owner, date) index
+		to the owner index
+		"""
+		entries = []
+		for _ in range(days_count):
+			entry = copy.copy(self.entry)
+			entry.pk = uuid.uuid4()
+			entry._state.adding = True
+			entries.append(entry)
+
+		model = type(self.entry)
+		model.objects.bulk_create(entries)
+		# dates of new entries can be set to today by `auto_now_add`
+		for number, entry in enumerate(entries, 1):
+			entry.date = self.entry.date - datetime.timedelta(days=number)
+
+		model.objects.bulk_update(entries, ('date',), batch_size=1000)
+		self.analyze(model)
+
 
 class GetEntriesServiceTest:
 	"""Tests for Get<model>Service service"""
@@ -55,6 +167,18 @@ class GetEntriesServiceTest:
 		self.assertEqual(entries[0], self.entry)
 
 
+class ListEntriesCommandTest:
+	"""Tests for List<model>Command commands"""
+
+	def test_execute_in_one_query(self):
+		"""Test: does execute fetch entries with total sum in one query"""
+		with self.assertNumQueries(1):
+			result = self.command.execute()
+
+		self.assertEqual(result['total_sum'], self.total_sum)
+		self.assertEqual(len(result[self.command.queryset_name]), 2)
+
+
 class GetCreateEntriesViewTest:
 	"""Tests for GetCreate<model>View view"""
 
@@ -129,6 +253,13 @@ class GetEntriesForTheMonthViewTest:
 		)
 		self.assertEqual(response.status_code, 200)
 
+	def test_get_last_month(self):
+		self.client.login(username='testuser', password='testpass')
+		response = self.client.get(
+			reverse(self.endpoint, args=['9999', '12'])
+		)
+		self.assertEqual(response.status_code, 200)
+
 	def test_get_with_unlogged_in_user(self):
 		response = self.client.get(
 			reverse(self.endpoint, args=['2020', '01'])
@@ -1,15 +1,247 @@
 import datetime
+from functools import partial, wraps
+from typing import Optional
 
-from django.core.exceptions import ImproperlyConfigured
+from django.conf import settings
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.http import (
+	StreamingHttpResponse, JsonResponse, HttpResponseNotAllowed
+)
+from django.utils.cache import (
+	get_conditional_response, patch_cache_control, quote_etag
+)
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 
+from rest_framework.exceptions import (
+	AuthenticationFailed, NotAuthenticated
+)
+from rest_framework.request import Request
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from service_objects.errors import InvalidInputsError
+
+from services.cache import get_user_data_version
+
+
+def is_stream_requested(request, command) -> bool:
+	"""Check does request have `stream` query param and command can
+	stream its result
+	"""
+	stream = request.query_params.get('stream', '').lower()
+	return stream in ('1', 'true', 'yes') and hasattr(command, 'stream')
+
+
+def get_service_error_response(error: ValidationError) -> Response:
+	"""Return response with errors of the service which rejected data
+	validated by serializer (e.g. category of another user)
+	"""
+	return Response({'non_field_errors': error.messages}, status=400)
+
+
+def get_invalid_inputs_response(error: InvalidInputsError) -> Response:
+	"""Return response with errors of the service inputs built from
+	request query params
+	"""
+	return Response(get_invalid_inputs_errors(error), status=400)
+
+
+def get_invalid_inputs_errors(error: InvalidInputsError) -> dict:
+	"""Return errors of the service inputs by fields"""
+	return {
+		field: list(messages) for field, messages in error.errors.items()
+	}
+
+
+def get_json_response(data, status: int = 200) -> JsonResponse:
+	"""Return response with data in JSON the same way as DRF JSON
+	renderer does for views which can't return DRF responses
+	"""
+	return JsonResponse(
+		data, status=status, safe=False, encoder=JSONEncoder,
+		json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')}
+	)
+
+
+def get_streaming_response(command) -> StreamingHttpResponse:
+	"""Return response with JSON streamed by command"""
+	return StreamingHttpResponse(
+		command.stream(), content_type='application/json'
+	)
+
+
+def get_user_data_etag(request, *args, **kwargs) -> Optional[str]:
+	"""Return ETag of the current version of request user data"""
+	if not request.user.is_authenticated:
+		return None
+
+	version = get_user_data_version(request.user.pk)
+	return f"{request.user.pk}-{version}"
+
+
+def get_period_max_age(
+		year: Optional[int] = None, month: Optional[int] = None,
+		**kwargs) -> int:
+	"""Return number of seconds the response with data of the year or
+	month can be used by client without revalidation. Data of periods
+	ended before the current month rarely changes, so it's cached for
+	`PAST_PERIOD_CACHE_MAX_AGE`, other data must be revalidated
+	"""
+	if year is None:
+		return 0
+
+	today = datetime.date.today()
+	if (year, month or 12) < (today.year, today.month):
+		return settings.PAST_PERIOD_CACHE_MAX_AGE
+
+	return 0
+
+
+def conditional_user_data(view_method=None, *, cache_period: bool = True):
+	"""Decorator for GET methods of views responding with user data.
+	Requests with the current ETag get 304 response before view method
+	is called, so heavy queries aren't executed. Responses have no
+	Last-Modified: its one second resolution can't tell changes made
+	in the same second, so only the ETag validates them. Responses
+	are private and data of past periods is cached by client for
+	`PAST_PERIOD_CACHE_MAX_AGE`. Views responding with data not limited
+	by the period of URL use `cache_period=False`, so their responses
+	are always revalidated
+	"""
+	if view_method is None:
+		return partial(conditional_user_data, cache_period=cache_period)
+
+	conditional_method = method_decorator(
+		condition(etag_func=get_user_data_etag)
+	)(view_method)
+
+	@wraps(view_method)
+	def wrapper(self, request, *args, **kwargs):
+		response = conditional_method(self, request, *args, **kwargs)
+		if cache_period:
+			patch_user_data_cache_control(response, **kwargs)
+		else:
+			patch_user_data_cache_control(response)
+		return response
+
+	return wrapper
+
+
+def patch_user_data_cache_control(response, **kwargs) -> None:
+	"""Make response with user data private. Data of the past year or
+	month from view kwargs is cached by client for
+	`PAST_PERIOD_CACHE_MAX_AGE`, other data must be revalidated
+	"""
+	max_age = get_period_max_age(**kwargs)
+	if max_age:
+		patch_cache_control(response, private=True, max_age=max_age)
+	else:
+		patch_cache_control(response, private=True, no_cache=True)
+
+
+class AsyncUserDataView:
+	"""Base view with async `get()` method returning user data for ASGI
+	servers. Django 3.2 class-based views and DRF views can't be async,
+	so `as_view()` returns async function dispatching requests. As in
+	DRF views users are authenticated by `authentication_classes`,
+	anonymous users get 403 response and invalid service inputs get 400
+	response. Responses are conditional as responses of views with
+	`conditional_user_data` decorator
+	"""
+
+	authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+
+	@classmethod
+	def as_view(cls):
+		async def view(request, *args, **kwargs):
+			return await cls().dispatch(request, *args, **kwargs)
+
+		view.view_class = cls
+		view.__doc__ = cls.__doc__
+		return view
+
+	async def dispatch(self, request, *args, **kwargs):
+		if request.method not in ('GET', 'HEAD'):
+			return HttpResponseNotAllowed(['GET', 'HEAD'])
+
+		try:
+			user, etag = await sync_to_async(
+				self._get_user_data_etag
+			)(request)
+		except (NotAuthenticated, AuthenticationFailed) as error:
+			return self._get_not_authenticated_response(request, error)
+
+		response = get_conditional_response(request, etag=etag)
+		if response is None:
+			try:
+				response = await self.get(request, user, *args, **kwargs)
+			except InvalidInputsError as error:
+				response = get_json_response(
+					get_invalid_inputs_errors(error), status=400
+				)
+
+		response.setdefault('ETag', etag)
+		patch_user_data_cache_control(response, **kwargs)
+		return response
+
+	async def get(self, request, user, *args, **kwargs):
+		"""Return response with data of the authenticated user"""
+		raise NotImplementedError
+
+	def get_authenticators(self) -> list:
+		return [
+			authentication() for authentication in self.authentication_classes
+		]
+
+	def _get_user_data_etag(self, request) -> tuple:
+		"""Return request user with ETag of user data. User is
+		authenticated here, because session and user can't be fetched
+		in async code
+
+		Raises
+		------
+		AuthenticationFailed
+			If request has invalid credentials
+		NotAuthenticated
+			If request doesn't have credentials
+
+		"""
+		# DRF request sets the authenticated user to the request too
+		user = Request(request, authenticators=self.get_authenticators()).user
+		if not user.is_authenticated:
+			raise NotAuthenticated
+
+		etag = get_user_data_etag(request)
+		return user, etag and quote_etag(etag)
+
+	def _get_not_authenticated_response(self, request, error):
+		"""Return 401 response with WWW-Authenticate header of the first
+		authenticator or 403 response if it doesn't have the header
+		(e.g. session authentication) as DRF views do
+		"""
+		authenticators = self.get_authenticators()
+		header = authenticators and \
+			authenticators[0].authenticate_header(request)
+		response = get_json_response(
+			{'detail': error.detail}, status=401 if header else 403
+		)
+		if header:
+			response['WWW-Authenticate'] = header
+
+		return response
 
 
 class CommandGenericView(APIView):
-	"""Base generic view to get entries using command"""
+	"""Base generic view to get entries using command. Query params
+	listed in `command_query_params` are passed to the command. It can
+	be a dict mapping query params to command keyword arguments
+	"""
 
 	get_command = None
+	command_query_params = ()
 
 	def __init__(self, *args, **kwargs):
 		super().__init__(*args, **kwargs)
@@ -18,11 +250,60 @@ class CommandGenericView(APIView):
 				f"{self.__class__.__name__} must have `get_command` attribute"
 			)
 
+	@conditional_user_data
 	def get(self, request):
-		command = self.get_command(request.user)
-		data = command.execute()
+		command = self.get_command(
+			request.user, **self.get_command_kwargs(request)
+		)
+		if is_stream_requested(request, command):
+			return get_streaming_response(command)
+
+		try:
+			data = command.execute()
+		except InvalidInputsError as error:
+			return get_invalid_inputs_response(error)
+
 		return Response(data)
 
+	def get_command_kwargs(self, request) -> dict:
+		"""Return command keyword arguments from request query params
+		listed in `command_query_params`
+		"""
+		params = self.command_query_params
+		if not isinstance(params, dict):
+			params = {param: param for param in params}
+
+		return {
+			argument: request.query_params[param]
+			for param, argument in params.items()
+			if param in request.query_params
+		}
+
+
+class ExportGenericView(CommandGenericView):
+	"""Base generic view to export entries in CSV file streamed by
+	command. Invalid filters from query params get 400 response before
+	streaming starts
+	"""
+
+	filename = 'export.csv'
+
+	@conditional_user_data
+	def get(self, request):
+		command = self.get_command(
+			request.user, **self.get_command_kwargs(request)
+		)
+		try:
+			content = command.execute()
+		except InvalidInputsError as error:
+			return get_invalid_inputs_response(error)
+
+		response = StreamingHttpResponse(content, content_type='text/csv')
+		response['Content-Disposition'] = (
+			f'attachment; filename="{self.filename}"'
+		)
+		return response
+
 
 class GetCreateGenericView(CommandGenericView):
 	"""Base generic view to get and create entry"""
@@ -45,13 +326,17 @@ class GetCreateGenericView(CommandGenericView):
 			)
 
 	def post(self, request):
-		entry_data = request.data | {'owner': request.user}
-		serializer = self.serializer_class(data=entry_data)
-		if serializer.is_valid():
-			entry = self.create_service.execute(entry_data)
-			return Response({self.model_name: entry.pk}, status=201)
+		serializer = self.serializer_class(data=request.data)
+		if not serializer.is_valid():
+			return Response(serializer.errors, status=400)
+
+		service_data = serializer.validated_data | {'owner': request.user}
+		try:
+			entry = self.create_service.execute(service_data)
+		except ValidationError as error:
+			return get_service_error_response(error)
 
-		return Response(serializer.errors, status=400)
+		return Response({self.model_name: entry.pk}, status=201)
 
 
 class GetUpdateDeleteGenericView(APIView):
@@ -88,29 +373,39 @@ class GetUpdateDeleteGenericView(APIView):
 
 	def dispatch(self, request, pk):
 		self.get_service = self.get_service_class(request.user)
-		self.entry = self.get_service.get_concrete(pk)
 		return super().dispatch(request, pk)
 
 	def get(self, request, pk):
-		serializer = self.serializer_class(self.entry)
+		entry = self.get_service.get_concrete(pk)
+		serializer = self.serializer_class(entry)
 		return Response(serializer.data)
 
 	def delete(self, request, pk):
+		"""Delete the entry without fetching it. Service raises Http404
+		if user doesn't have entry with this pk
+		"""
 		self.delete_service_class.execute({
-			self.model_name: self.entry, 'owner': request.user
+			self.model_name: pk, 'owner': request.user
 		})
 		return Response(status=204)
 
 	def put(self, request, pk):
-		serializer = self.serializer_class(self.entry, data=request.data)
-		if serializer.is_valid():
-			service_data = serializer.validated_data | {
-				self.model_name: self.entry, 'owner': request.user
-			}
+		"""Change the entry without fetching it. Service raises Http404
+		if user doesn't have entry with this pk
+		"""
+		serializer = self.serializer_class(data=request.data)
+		if not serializer.is_valid():
+			return Response(serializer.errors, status=400)
+
+		service_data = serializer.validated_data | {
+			self.model_name: pk, 'owner': request.user
+		}
+		try:
 			self.update_service_class.execute(service_data)
-			return Response(status=204)
+		except ValidationError as error:
+			return get_service_error_response(error)
 
-		return Response(serializer.errors, status=400)
+		return Response(status=204)
 
 
 class GetForTheDateGenericView(APIView):
@@ -125,11 +420,15 @@ class GetForTheDateGenericView(APIView):
 				f"{self.__class__.__name__} must have `command` attribute"
 			)
 
+	@conditional_user_data
 	def get(self, request, **kwargs):
 		if 'day' not in kwargs:
 			kwargs |= {'day': 1}
 			
 		date = datetime.date(**kwargs)
 		command = self.command(request.user, date)
+		if is_stream_requested(request, command):
+			return get_streaming_response(command)
+
 		entries = command.execute()
 		return Response(entries)
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incomes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['owner', 'date'], name='income_owner_date_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('incomes', '0002_income_owner_date_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='income',
+            name='income_owner_date_idx',
+        ),
+        migrations.AlterField(
+            model_name='income',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='incomes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['owner', 'date', 'pub_datetime'], name='income_owner_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['owner', '-pub_datetime', '-uuid'], name='income_owner_pub_datetime_idx'),
+        ),
+    ]
@@ -31,7 +31,7 @@ class Income(ModelWithUUID):
 
     incomes_sum = models.DecimalField(max_digits=7, decimal_places=2)
     owner = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name='incomes'
+        User, on_delete=models.CASCADE, related_name='incomes', db_index=False
     )
     date = models.DateField(auto_now_add=True)
     pub_datetime = models.DateTimeField(auto_now_add=True)
@@ -39,6 +39,16 @@ class Income(ModelWithUUID):
     class Meta:
         db_table = 'income'
         ordering = ('-pub_datetime',)
+        indexes = (
+            models.Index(
+                fields=('owner', 'date', 'pub_datetime'),
+                name='income_owner_date_idx'
+            ),
+            models.Index(
+                fields=('owner', '-pub_datetime', '-uuid'),
+                name='income_owner_pub_datetime_idx'
+            ),
+        )
 
     def __str__(self):
         return f"Income: {self.incomes_sum}"
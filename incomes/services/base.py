@@ -1,10 +1,13 @@
 from django import forms
+from django.db.models import QuerySet
+from django.http import Http404
 from service_objects.services import Service
 from django.contrib.auth import get_user_model
 
+from services.cache import bump_user_data_version
 from services.common import (
     GetTotalSumService, GetUserEntriesService, GetForTheDateService,
-    check_entry_owner
+    ModelInstanceField
 )
 from ..models import Income
 
@@ -13,9 +16,14 @@ User = get_user_model()
 
 
 class GetIncomesForTheDateService(GetForTheDateService):
-    """Service to get incomes for the date"""
+    """Service to get incomes for the date. Incomes are ordered by date
+    and publication datetime, so they're read in order of owner and date
+    index. It's the same order as the model ordering because the income
+    date is the publication date
+    """
 
     model = Income
+    ordering = ('-date', '-pub_datetime')
 
 
 class GetIncomesService(GetUserEntriesService):
@@ -30,11 +38,37 @@ class GetIncomesTotalSumService(GetTotalSumService):
     sum_field_name = 'incomes_sum'
 
 
+class GetIncomesForTheExportService(Service):
+    """Service returning user incomes from optional `from_date` to
+    optional `to_date` inclusive for the export. Incomes are ordered by
+    date and publication datetime, so they're read in order of owner
+    and date index
+    """
+
+    owner = ModelInstanceField(queryset=User.objects.all())
+    from_date = forms.DateField(required=False)
+    to_date = forms.DateField(required=False)
+
+    def process(self) -> QuerySet:
+        """Return queryset of user incomes for the export"""
+        owner = self.cleaned_data['owner']
+        from_date = self.cleaned_data.get('from_date')
+        to_date = self.cleaned_data.get('to_date')
+
+        incomes = Income.objects.filter(owner=owner)
+        if from_date:
+            incomes = incomes.filter(date__gte=from_date)
+        if to_date:
+            incomes = incomes.filter(date__lte=to_date)
+
+        return incomes.order_by('date', 'pub_datetime')
+
+
 class CreateIncomeService(Service):
     """Service to create new incomes"""
 
     incomes_sum = forms.DecimalField(max_digits=7, decimal_places=2)
-    owner = forms.ModelChoiceField(queryset=User.objects.all())
+    owner = ModelInstanceField(queryset=User.objects.all())
     _model = Income
 
     def process(self) -> Income:
@@ -45,38 +79,67 @@ class CreateIncomeService(Service):
         income = self._model.objects.create(
             incomes_sum=incomes_sum, owner=owner
         )
+        bump_user_data_version(owner.pk)
         return income
 
 
 class ChangeIncomeService(Service):
-    """Service to change a concrete income"""
+    """Service to change a concrete income of the owner using one
+    UPDATE statement
+    """
 
-    income = forms.ModelChoiceField(queryset=Income.objects.all())
+    income = forms.UUIDField()
     incomes_sum = forms.DecimalField(max_digits=7, decimal_places=2)
-    owner = forms.ModelChoiceField(queryset=User.objects.all())
+    owner = ModelInstanceField(queryset=User.objects.all())
+    _model = Income
 
-    def process(self) -> Income:
-        """Change a concrete income from `income` attribute"""
-        income = self.cleaned_data['income']
+    def process(self) -> None:
+        """Change a concrete income with pk from `income` attribute
+
+        Raises
+        ------
+        Http404
+            If owner doesn't have income with this pk
+
+        """
+        income_pk = self.cleaned_data['income']
         incomes_sum = self.cleaned_data['incomes_sum']
         owner = self.cleaned_data['owner']
-        check_entry_owner(income, owner)
 
-        income.incomes_sum = incomes_sum
-        income.save()
-        return income
+        changed_count = self._model.objects.filter(
+            pk=income_pk, owner=owner
+        ).update(incomes_sum=incomes_sum)
+        if not changed_count:
+            raise Http404
+
+        bump_user_data_version(owner.pk)
 
 
 class DeleteIncomeService(Service):
-    """Service to delete a concrete income"""
+    """Service to delete a concrete income of the owner using one
+    DELETE statement
+    """
 
-    income = forms.ModelChoiceField(queryset=Income.objects.all())
-    owner = forms.ModelChoiceField(queryset=User.objects.all())
+    income = forms.UUIDField()
+    owner = ModelInstanceField(queryset=User.objects.all())
+    _model = Income
 
     def process(self) -> None:
-        """Delete a concrete income from `income` attribute"""
-        income = self.cleaned_data['income']
+        """Delete a concrete income with pk from `income` attribute
+
+        Raises
+        ------
+        Http404
+            If owner doesn't have income with this pk
+
+        """
+        income_pk = self.cleaned_data['income']
         owner = self.cleaned_data['owner']
-        check_entry_owner(income, owner)
-        
-        income.delete()
+
+        deleted_count, _ = self._model.objects.filter(
+            pk=income_pk, owner=owner
+        ).delete()
+        if not deleted_count:
+            raise Http404
+
+        bump_user_data_version(owner.pk)
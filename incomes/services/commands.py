@@ -1,9 +1,12 @@
 from django.db.models import QuerySet
 from django.contrib.auth import get_user_model
 
-from services.commands import ListEntriesCommand, DateEntriesListCommand
+from services.commands import (
+	ListEntriesCommand, DateEntriesListCommand, ExportEntriesCommand
+)
 from .base import (
-	GetIncomesService, GetIncomesTotalSumService, GetIncomesForTheDateService
+	GetIncomesService, GetIncomesTotalSumService, GetIncomesForTheDateService,
+	GetIncomesForTheExportService
 )
 from ..serializers import IncomeSerializer
 
@@ -23,6 +26,7 @@ class GetAllIncomesCommand(IncomesListMixin, ListEntriesCommand):
 	"""Command to get all user incomes"""
 
 	get_service = GetIncomesService
+	paginate_by = 100
 
 
 class GetIncomesForTheMonthCommand(IncomesListMixin, DateEntriesListCommand):
@@ -41,3 +45,10 @@ class GetIncomesForTheDateCommand(IncomesListMixin, DateEntriesListCommand):
 
 	def get_entries(self) -> QuerySet:
 		return self._service.get_for_the_date(self._date)
+
+
+class ExportIncomesCommand(ExportEntriesCommand):
+	"""Command to export user incomes in CSV"""
+
+	export_service = GetIncomesForTheExportService
+	columns = {'uuid': 'uuid', 'date': 'date', 'incomes_sum': 'incomes_sum'}
@@ -0,0 +1,69 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from generics.unittests import ListEntriesCommandTest
+from incomes.services.commands import (
+	GetAllIncomesCommand, GetIncomesForTheMonthCommand,
+	GetIncomesForTheDateCommand, ExportIncomesCommand
+)
+from incomes.models import Income
+
+
+User = get_user_model()
+
+
+class BaseCommandTest(TestCase):
+	"""Base class for command tests"""
+
+	def setUp(self):
+		self.user = User.objects.create_superuser(
+			username='testuser', password='testpass'
+		)
+		for incomes_sum in ('100.00', '50.00'):
+			Income.objects.create(incomes_sum=incomes_sum, owner=self.user)
+
+		self.total_sum = Decimal('150.00')
+		self.today = datetime.date.today()
+
+
+class GetAllIncomesCommandTest(BaseCommandTest, ListEntriesCommandTest):
+	"""Case of testing GetAllIncomesCommand"""
+
+	def setUp(self):
+		super().setUp()
+		self.command = GetAllIncomesCommand(self.user)
+
+
+class GetIncomesForTheMonthCommandTest(
+		BaseCommandTest, ListEntriesCommandTest):
+	"""Case of testing GetIncomesForTheMonthCommand"""
+
+	def setUp(self):
+		super().setUp()
+		self.command = GetIncomesForTheMonthCommand(self.user, self.today)
+
+
+class GetIncomesForTheDateCommandTest(BaseCommandTest, ListEntriesCommandTest):
+	"""Case of testing GetIncomesForTheDateCommand"""
+
+	def setUp(self):
+		super().setUp()
+		self.command = GetIncomesForTheDateCommand(self.user, self.today)
+
+
+class ExportIncomesCommandTest(BaseCommandTest):
+	"""Case of testing ExportIncomesCommand"""
+
+	def test_execute(self):
+		"""Test: does execute return CSV with incomes in date order"""
+		incomes = Income.objects.order_by('pub_datetime')
+		command = ExportIncomesCommand(self.user)
+		lines = ''.join(command.execute()).splitlines()
+
+		self.assertEqual(lines, ['uuid,date,incomes_sum'] + [
+			f"{income.pk},{self.today.isoformat()},{income.incomes_sum}"
+			for income in incomes
+		])
@@ -1,8 +1,10 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from rest_framework.renderers import JSONRenderer
 
 from ..models import Income
 from ..serializers import IncomeSerializer
+from services.serializers import get_values_serializer
 
 
 User = get_user_model()
@@ -27,3 +29,25 @@ class IncomeSerializerTest(TestCase):
 		self.assertEqual(
 			self.serializer.data['date'], self.income.date.isoformat()
 		)
+
+
+class IncomeValuesSerializerTest(TestCase):
+	"""Case of testing values serializer of IncomeSerializer"""
+
+	def setUp(self):
+		self.user = User.objects.create_superuser(
+			username='testuser', password='testpass'
+		)
+		for incomes_sum in ('100.00', '0.5'):
+			Income.objects.create(incomes_sum=incomes_sum, owner=self.user)
+
+		self.serializer = get_values_serializer(IncomeSerializer)
+
+	def test_serialize(self):
+		incomes = Income.objects.all()
+		rows = self.serializer.get_values(incomes)
+
+		self.assertEqual(
+			JSONRenderer().render(self.serializer.serialize(rows)),
+			JSONRenderer().render(IncomeSerializer(incomes, many=True).data)
+		)
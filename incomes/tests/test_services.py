@@ -3,13 +3,16 @@ from decimal import Decimal
 
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.http import Http404
+from service_objects.errors import InvalidInputsError
 
 from generics.unittests import (
-	GetEntriesForTheDateTest, GetEntriesServiceTest
+	GetEntriesForTheDateTest, GetEntriesServiceTest, QueryPlanTestMixin
 )
 from incomes.services.base import (
 	GetIncomesForTheDateService, GetIncomesService, GetIncomesTotalSumService,
-	CreateIncomeService, ChangeIncomeService, DeleteIncomeService
+	CreateIncomeService, ChangeIncomeService, DeleteIncomeService,
+	GetIncomesForTheExportService
 )
 from incomes.models import Income
 
@@ -36,15 +39,40 @@ class GetIncomesForTheDateServiceTest(BaseServiceTest, GetEntriesForTheDateTest)
 		super().setUp()
 		self.service = GetIncomesForTheDateService(self.user)
 		self.today = datetime.date.today()
+		self.owner_date_index = 'income_owner_date_idx'
 
+	def test_get_for_the_month_reads_incomes_in_index_order(self):
+		entries = self.service.get_for_the_month(self.today)
+		self.assertQuerySetReadsIndexOrder(entries)
 
-class GetIncomesServiceTest(BaseServiceTest, GetEntriesServiceTest):
+	def test_get_for_the_date_reads_incomes_in_index_order(self):
+		entries = self.service.get_for_the_date(self.today)
+		self.assertQuerySetReadsIndexOrder(entries)
+
+	def test_get_for_the_month_order(self):
+		Income.objects.create(incomes_sum='50.00', owner=self.user)
+		entries = self.service.get_for_the_month(self.today)
+
+		self.assertEqual(
+			list(entries), list(Income.objects.filter(owner=self.user))
+		)
+
+
+class GetIncomesServiceTest(
+		BaseServiceTest, GetEntriesServiceTest, QueryPlanTestMixin):
 	"""Case of testing GetIncomesService"""
 
 	def setUp(self):
 		super().setUp()
 		self.service = GetIncomesService(self.user)
 
+	def test_get_all_page_reads_incomes_in_index_order(self):
+		entries = GetIncomesTotalSumService().annotate(
+			self.service.get_all()
+		).order_by('-pub_datetime', '-uuid')[:101]
+
+		self.assertQuerySetReadsIndexOrder(entries)
+
 
 class GetIncomesTotalSumServiceTest(BaseServiceTest):
 	"""Case of testing GetIncomesTotalSumService"""
@@ -80,15 +108,27 @@ class ChangeIncomeServiceTest(BaseServiceTest):
 	def test_execute(self):
 		"""Test: does service execute method change the existing income"""
 		income_data = {
-			'income': self.entry, 'incomes_sum': '200.00',
+			'income': self.entry.pk, 'incomes_sum': '200.00',
 			'owner': self.user.pk
 		}
-		income = ChangeIncomeService.execute(income_data)
+		ChangeIncomeService.execute(income_data)
 		all_incomes = Income.objects.all()
 
-		self.assertEqual(income.pk, self.entry.pk)
-		self.assertEqual(income.incomes_sum, Decimal('200.00'))
 		self.assertEqual(len(all_incomes), 1)
+		self.assertEqual(all_incomes[0].pk, self.entry.pk)
+		self.assertEqual(all_incomes[0].incomes_sum, Decimal('200.00'))
+
+	def test_execute_with_not_owner_income(self):
+		"""Test: does service raise Http404 if income owner isn't
+		the user"""
+		another_user = User.objects.create_user(
+			username='another_user', password='testpass'
+		)
+		with self.assertRaises(Http404):
+			ChangeIncomeService.execute({
+				'income': self.entry.pk, 'incomes_sum': '200.00',
+				'owner': another_user
+			})
 
 
 class DeleteIncomeServiceTest(BaseServiceTest):
@@ -96,7 +136,51 @@ class DeleteIncomeServiceTest(BaseServiceTest):
 
 	def test_execute(self):
 		"""Test: does service execute method delete the existing income"""
-		income_data = {'income': self.entry, 'owner': self.user.pk}
+		income_data = {'income': self.entry.pk, 'owner': self.user.pk}
 		DeleteIncomeService.execute(income_data)
 		all_incomes = Income.objects.all()
 		self.assertEqual(len(all_incomes), 0)
+
+	def test_execute_with_not_owner_income(self):
+		"""Test: does service raise Http404 if income owner isn't
+		the user and not delete the income"""
+		another_user = User.objects.create_user(
+			username='another_user', password='testpass'
+		)
+		with self.assertRaises(Http404):
+			DeleteIncomeService.execute({
+				'income': self.entry.pk, 'owner': another_user
+			})
+
+		self.assertEqual(Income.objects.count(), 1)
+
+
+class GetIncomesForTheExportServiceTest(BaseServiceTest):
+	"""Case of testing GetIncomesForTheExportService"""
+
+	def setUp(self):
+		super().setUp()
+		self.old_income = Income.objects.create(
+			incomes_sum='50.00', owner=self.user
+		)
+		Income.objects.filter(pk=self.old_income.pk).update(date='2020-01-01')
+
+	def test_get_all(self):
+		"""Test: does execute return all user incomes ordered by date"""
+		incomes = GetIncomesForTheExportService.execute({'owner': self.user})
+
+		self.assertEqual(list(incomes), [self.old_income, self.entry])
+
+	def test_get_for_the_period(self):
+		incomes = GetIncomesForTheExportService.execute({
+			'owner': self.user, 'from_date': '2019-12-01',
+			'to_date': '2020-01-31'
+		})
+
+		self.assertEqual(list(incomes), [self.old_income])
+
+	def test_get_with_invalid_date(self):
+		with self.assertRaises(InvalidInputsError):
+			GetIncomesForTheExportService.execute({
+				'owner': self.user, 'to_date': '2020-01-32'
+			})
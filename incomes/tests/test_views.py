@@ -4,7 +4,8 @@ from django.urls import reverse, reverse_lazy
 
 from generics.unittests import (
     GetCreateEntriesViewTest, GetUpdateDeleteEntryViewTest,
-    GetEntriesForTheMonthViewTest, GetEntriesForTheDateViewTest
+    GetEntriesForTheMonthViewTest, GetEntriesForTheDateViewTest,
+    QueryBudgetTest
 )
 from ..models import Income
 
@@ -63,3 +64,82 @@ class GetIncomesForTheDateViewTest(ViewTest, GetEntriesForTheDateViewTest):
     """Case of testing GetIncomesForTheDateView"""
 
     endpoint = 'date_incomes'
+
+
+class ExportIncomesViewTest(ViewTest):
+    """Case of testing ExportIncomesView"""
+
+    def test_get_with_logged_in_user(self):
+        income = Income.objects.create(incomes_sum='100.00', owner=self.user)
+        self.client.login(username='testuser', password='testpass')
+        response = self.client.get(reverse('incomes_export'), {
+            'from': income.date.isoformat(), 'to': income.date.isoformat()
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(
+            b''.join(response.streaming_content).decode().splitlines(), [
+                'uuid,date,incomes_sum',
+                f'{income.pk},{income.date.isoformat()},100.00'
+            ]
+        )
+
+    def test_get_with_invalid_period(self):
+        self.client.login(username='testuser', password='testpass')
+        response = self.client.get(reverse('incomes_export'), {'to': '2020'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('to_date', response.json())
+
+    def test_get_with_unlogged_in_user(self):
+        response = self.client.get(reverse('incomes_export'))
+        self.assertEqual(response.status_code, 403)
+
+
+class IncomesConditionalRequestsTest(ViewTest):
+    """Case of testing ETag of incomes views"""
+
+    def test_etag_is_changed_by_income_creation(self):
+        self.client.login(username='testuser', password='testpass')
+        response = self.client.get(reverse('all_incomes'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('all_incomes'), {'incomes_sum': '100.00'},
+                content_type='application/json'
+            )
+
+        response = self.client.get(
+            reverse('all_incomes'), HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['incomes']), 1)
+
+
+class IncomesQueryBudgetTest(ViewTest, QueryBudgetTest):
+    """Case of testing incomes endpoints query budgets"""
+
+    def setUp(self):
+        super().setUp()
+        self.incomes = [
+            Income.objects.create(incomes_sum='100.00', owner=self.user)
+            for _ in range(5)
+        ]
+
+    def get_budget_requests(self):
+        income = self.incomes[0]
+        date = income.date
+        income_data = {'incomes_sum': '100.00'}
+        return [
+            ('all_incomes', 'GET', [], None),
+            ('all_incomes', 'POST', [], income_data),
+            ('incomes_export', 'GET', [], None),
+            ('concrete_income', 'GET', [income.pk], None),
+            ('concrete_income', 'PUT', [income.pk], income_data),
+            ('concrete_income', 'DELETE', [income.pk], None),
+            ('month_incomes', 'GET', [date.year, date.month], None),
+            (
+                'date_incomes', 'GET', [date.year, date.month, date.day],
+                None
+            ),
+        ]
@@ -5,6 +5,8 @@ from . import views
 
 urlpatterns = [
     path('', views.GetCreateIncomesView.as_view(), name="all_incomes"),
+    path('export.csv', views.ExportIncomesView.as_view(),
+         name="incomes_export"),
     path('<uuid:pk>/', views.GetUpdateDeleteIncome.as_view(),
          name="concrete_income"),
     path('<int:year>/<int:month>/', views.GetIncomesForTheMonthView.as_view(),
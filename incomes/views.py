@@ -1,5 +1,6 @@
 from generics.views import (
-    GetCreateGenericView, GetUpdateDeleteGenericView, GetForTheDateGenericView
+    GetCreateGenericView, GetUpdateDeleteGenericView, GetForTheDateGenericView,
+    ExportGenericView
 )
 from .services.base import (
     CreateIncomeService, GetIncomesService, DeleteIncomeService,
@@ -7,7 +8,7 @@ from .services.base import (
 )
 from .services.commands import (
     GetAllIncomesCommand, GetIncomesForTheMonthCommand,
-    GetIncomesForTheDateCommand
+    GetIncomesForTheDateCommand, ExportIncomesCommand
 )
 from .serializers import IncomeSerializer
 
@@ -16,11 +17,22 @@ class GetCreateIncomesView(GetCreateGenericView):
     """View to get all incomes and create a new income"""
 
     get_command = GetAllIncomesCommand
+    command_query_params = ('cursor',)
     create_service = CreateIncomeService
     serializer_class = IncomeSerializer
     model_name = 'income'
 
 
+class ExportIncomesView(ExportGenericView):
+    """View to export incomes in CSV for the period from optional
+    `from` date to optional `to` date
+    """
+
+    get_command = ExportIncomesCommand
+    command_query_params = {'from': 'from_date', 'to': 'to_date'}
+    filename = 'incomes.csv'
+
+
 class GetUpdateDeleteIncome(GetUpdateDeleteGenericView):
     """View to get a concrete income and change/delete an existing income"""
 
@@ -0,0 +1,116 @@
+import secrets
+import time
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+
+
+USER_DATA_VERSION_KEY = 'user_data_version:{user_id}'
+USER_DATA_KEY = 'user_data:{user_id}:{version}:{name}'
+CACHE_HITS_KEY = 'user_data_cache_hits'
+CACHE_MISSES_KEY = 'user_data_cache_misses'
+USER_DATA_TIMEOUT = 60 * 60 * 24
+
+
+def get_user_data_version(user_id: int) -> int:
+    """Return current version of user data. If version isn't set yet
+    (or was evicted) it's initialized with a new version, so it never
+    matches the evicted one
+    """
+    version_key = USER_DATA_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, _get_new_version(), timeout=None)
+        version = cache.get(version_key)
+
+    return version
+
+
+def bump_user_data_version(user_id: int) -> None:
+    """Invalidate all cached user data after the current transaction
+    is committed
+    """
+    transaction.on_commit(lambda: _set_new_user_data_version(user_id))
+
+
+def _set_new_user_data_version(user_id: int) -> None:
+    """Set a new version of user data. Version isn't incremented,
+    because `incr()` of some backends (e.g. file based cache) isn't
+    atomic and concurrent bumps could give one version. Each bump sets
+    a unique version after its transaction is committed, so data cached
+    under the last set version is never stale
+    """
+    version_key = USER_DATA_VERSION_KEY.format(user_id=user_id)
+    cache.set(version_key, _get_new_version(), timeout=None)
+
+
+def _get_new_version() -> int:
+    """Return version made of the current time with random low bits,
+    so versions set at the same time by different processes differ
+    """
+    return time.time_ns() << 16 | secrets.randbits(16)
+
+
+def get_user_cached(user_id: int, name: str, compute: Callable) -> Any:
+    """Return user data with `name` from cache or compute and cache it
+    under the current user data version
+    """
+    data_key, data = _get_user_cached_data(user_id, name)
+    if data is None:
+        data = compute()
+        cache.set(data_key, data, timeout=USER_DATA_TIMEOUT)
+
+    return data
+
+
+async def get_user_cached_async(
+        user_id: int, name: str, compute: Callable[[], Awaitable]) -> Any:
+    """Async version of `get_user_cached` awaiting `compute` coroutine
+    function. Cache is accessed in the thread pool, because cache
+    backends are synchronous
+    """
+    data_key, data = await sync_to_async(
+        _get_user_cached_data, thread_sensitive=False
+    )(user_id, name)
+    if data is None:
+        data = await compute()
+        await sync_to_async(cache.set, thread_sensitive=False)(
+            data_key, data, timeout=USER_DATA_TIMEOUT
+        )
+
+    return data
+
+
+def _get_user_cached_data(user_id: int, name: str) -> tuple[str, Any]:
+    """Return cache key of user data with `name` under the current user
+    data version and cached data or None counting cache hits and misses
+    """
+    version = get_user_data_version(user_id)
+    data_key = USER_DATA_KEY.format(
+        user_id=user_id, version=version, name=name
+    )
+    data = cache.get(data_key)
+    if data is not None:
+        _increment_counter(CACHE_HITS_KEY)
+    else:
+        _increment_counter(CACHE_MISSES_KEY)
+
+    return data_key, data
+
+
+def _increment_counter(counter_key: str) -> None:
+    if not cache.add(counter_key, 1, timeout=None):
+        try:
+            cache.incr(counter_key)
+        except ValueError:
+            cache.add(counter_key, 1, timeout=None)
+
+
+def get_user_cache_stats() -> dict:
+    """Return number of user data cache hits and misses"""
+    return {
+        'hits': cache.get(CACHE_HITS_KEY, 0),
+        'misses': cache.get(CACHE_MISSES_KEY, 0),
+    }
@@ -1,22 +1,68 @@
+import csv
 import datetime
+import io
+import json
+from decimal import Decimal
+from typing import Optional, Iterator
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models import QuerySet
+from rest_framework.exceptions import ValidationError as RequestValidationError
+from rest_framework.utils.encoders import JSONEncoder
+
+from .common import CursorPaginationService
+from .serializers import get_values_serializer
 
 
 User = get_user_model()
 
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def escape_csv_formula(value):
+    """Prefix string starting as spreadsheet formula with `'`, so it's
+    shown as text. Strings already starting with quotes before formula
+    get one more quote, so `unescape_csv_formula()` restores them
+    """
+    if isinstance(value, str) and \
+            value.lstrip("'").startswith(CSV_FORMULA_PREFIXES):
+        return f"'{value}"
+
+    return value
+
+
+def unescape_csv_formula(value: str) -> str:
+    """Remove `'` prefix added by `escape_csv_formula()`"""
+    if value.startswith("'") and \
+            value.lstrip("'").startswith(CSV_FORMULA_PREFIXES):
+        return value[1:]
+
+    return value
+
+
+def _to_json(data) -> str:
+    """Return data in JSON the same way as DRF JSON renderer does"""
+    return json.dumps(
+        data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')
+    )
+
 
 class ListEntriesCommand:
-    """Base command to get entries list"""
+    """Base command to get entries list. Entries are fetched as
+    `values_list()` rows and serialized by values serializer giving
+    the same data as `serializer_class`
+    """
 
     get_service = None
     total_sum_service = None
     serializer_class = None
     queryset_name = 'objects'
+    paginate_by = None
+    stream_chunk_size = 2000
+    stream_buffer_size = 100
 
-    def __init__(self, user: User):
+    def __init__(self, user: User, cursor: Optional[str] = None):
         if not self.get_service:
             raise ImproperlyConfigured(
                 f"{self.__class__.__name__} must have `get_service` attribute"
@@ -33,25 +79,169 @@ class ListEntriesCommand:
             )
 
         self._user = user
+        self._cursor = cursor
         self._service = self.get_service(user)
+        self._serializer = get_values_serializer(self.serializer_class)
 
     def execute(self) -> dict:
         entries = self.get_entries()
-        total_entries_sum = self.total_sum_service.execute(entries)
-        serialized_entries = self.serializer_class(entries, many=True).data
+        if not self.paginate_by:
+            entries = list(self._get_values(entries))
+            total_entries_sum = self.total_sum_service.get_entries_sum(entries)
+            serialized_entries = self._serializer.serialize(entries)
+            return {
+                'total_sum': total_entries_sum,
+                self.queryset_name: serialized_entries
+            }
+
+        page, next_cursor, total_entries_sum = self._paginate(entries)
+        serialized_entries = self._serializer.serialize(page)
         return {
             'total_sum': total_entries_sum,
-            self.queryset_name: serialized_entries
+            self.queryset_name: serialized_entries,
+            'next': next_cursor
         }
 
+    def _paginate(self, entries: QuerySet) -> tuple:
+        """Return page entries, next page cursor and total sum of all
+        entries. The first page is fetched with total sum in one query
+        """
+        pagination_service = CursorPaginationService(self.paginate_by)
+        if self._cursor:
+            total_entries_sum = self.total_sum_service.execute(entries)
+            page, next_cursor = pagination_service.execute(
+                self._get_values(entries), self._cursor
+            )
+            return page, next_cursor, total_entries_sum
+
+        page, next_cursor = pagination_service.execute(self._get_values(
+            self.total_sum_service.annotate(entries), 'entries_total_sum'
+        ))
+        total_entries_sum = self.total_sum_service.get_annotated_sum(page)
+        return page, next_cursor, total_entries_sum
+
+    def stream(self) -> Iterator[str]:
+        """Return iterator over all entries document in JSON parts.
+        Entries are fetched using server-side cursor and serialized one
+        by one, so entries list is never kept in memory. Total sum is
+        counted while iterating and written after entries
+
+        Raises
+        ------
+        RequestValidationError
+            If cursor is passed, because stream always has all entries
+
+        """
+        if self._cursor:
+            raise RequestValidationError({
+                'cursor': "Cursor can't be used with stream"
+            })
+
+        return self._stream()
+
+    def _stream(self) -> Iterator[str]:
+        entries = self._get_values(self.get_entries()).iterator(
+            chunk_size=self.stream_chunk_size
+        )
+        total_entries_sum = Decimal('0')
+        buffer = []
+        yield f'{{"{self.queryset_name}":['
+        for number, entry in enumerate(entries):
+            total_entries_sum += self.total_sum_service.get_entries_sum(
+                [entry]
+            )
+            separator = ',' if number else ''
+            serialized_entry = _to_json(
+                self._serializer.to_representation(entry)
+            )
+            buffer.append(separator + serialized_entry)
+            if len(buffer) >= self.stream_buffer_size:
+                yield ''.join(buffer)
+                buffer = []
+
+        document_end = {'total_sum': total_entries_sum}
+        if self.paginate_by:
+            document_end['next'] = None
+
+        yield ''.join(buffer) + '],' + _to_json(document_end)[1:]
+
     def get_entries(self) -> QuerySet:
         """Get all entries list"""
         return self._service.get_all()
 
+    def _get_values(self, entries: QuerySet, *extra_columns) -> QuerySet:
+        """Return entries as named rows with serialized fields, sum
+        field and ordering fields needed for cursor pagination
+        """
+        return self._serializer.get_values(
+            entries, self.total_sum_service.sum_field_name, *extra_columns
+        )
+
 
 class DateEntriesListCommand(ListEntriesCommand):
     """Base command for commands to get entries for the date"""
 
-    def __init__(self, user: User, date: datetime.date):
-        super().__init__(user)
+    def __init__(self, user: User, date: datetime.date,
+                 cursor: Optional[str] = None):
+        super().__init__(user, cursor)
         self._date = date
+
+
+class ExportEntriesCommand:
+    """Base command to export entries in CSV. Entries are fetched by
+    `export_service` as `values_list()` rows using server-side cursor
+    and written by parts, so memory usage doesn't depend on number of
+    entries. `columns` maps CSV header to entry column (related fields
+    are joined in the same query, e.g. `category__title`). Strings
+    starting as spreadsheet formulas are escaped
+    """
+
+    export_service = None
+    columns = {}
+    export_chunk_size = 2000
+    export_buffer_size = 500
+
+    def __init__(self, user: User, **filters):
+        if not self.export_service:
+            raise ImproperlyConfigured(
+                f"{self.__class__.__name__} must have "
+                "`export_service` attribute"
+            )
+        if not self.columns:
+            raise ImproperlyConfigured(
+                f"{self.__class__.__name__} must have `columns` attribute"
+            )
+
+        self._user = user
+        self._filters = filters
+
+    def execute(self) -> Iterator[str]:
+        """Return iterator over CSV document parts. Filters are
+        validated before iteration starts
+
+        Raises
+        ------
+        InvalidInputsError
+            If filters are invalid
+
+        """
+        entries = self.export_service.execute(
+            {'owner': self._user} | self._filters
+        )
+        rows = entries.values_list(*self.columns.values()).iterator(
+            chunk_size=self.export_chunk_size
+        )
+        return self._write(rows)
+
+    def _write(self, rows: Iterator[tuple]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.columns)
+        for number, row in enumerate(rows, 1):
+            writer.writerow([escape_csv_formula(value) for value in row])
+            if number % self.export_buffer_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
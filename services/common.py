@@ -1,23 +1,87 @@
+import base64
+import binascii
 import datetime
+import json
 from typing import Optional
 from uuid import UUID
 from decimal import Decimal
 
+from django import forms
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
-from django.db.models import QuerySet, Model, Sum
-from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.db.models import QuerySet, Model, Sum, Q, Window
+from django.core.exceptions import (
+    ImproperlyConfigured, PermissionDenied, ValidationError
+)
+from rest_framework.exceptions import ValidationError as RequestValidationError
+
+from utils.dates import get_month_range
 
 
 User = get_user_model()
 
 
-def check_entry_owner(entry: Model, owner: User):
-    """Check is entry owner the same as owner in the second arg"""
-    if not entry.owner == owner:
-        raise ValidationError(
-            f"User `{owner.username}` can't change this entry"
-        )
+class BulkValidationError(Exception):
+    """Error raised when some entries of bulk operation are invalid
+
+    Attributes
+    ----------
+    errors : list
+        Errors of each entry in the same order as entries. Valid
+        entries have empty errors dict
+
+    """
+
+    def __init__(self, errors: list[dict]):
+        super().__init__(errors)
+        self.errors = errors
+
+
+class ModelInstanceField(forms.ModelChoiceField):
+    """Model choice field accepting already fetched model instances
+    without looking them up again. Other values are looked up in the
+    queryset as in `ModelChoiceField`, so instances must be fetched
+    from the same queryset
+    """
+
+    def to_python(self, value):
+        if isinstance(value, self.queryset.model) and \
+                not value._state.adding:
+            return self._coerce_instance(value)
+
+        return super().to_python(value)
+
+    def _coerce_instance(self, instance: Model) -> Model:
+        """Convert loaded values of instance fields to python types of
+        fields as after fetching. Saved instances keep values assigned
+        before saving (e.g. strings of created decimal fields)
+        """
+        deferred_fields = instance.get_deferred_fields()
+        for field in instance._meta.concrete_fields:
+            if field.attname in deferred_fields:
+                continue
+
+            value = getattr(instance, field.attname)
+            setattr(instance, field.attname, field.to_python(value))
+
+        return instance
+
+
+class AsyncServiceMixin:
+    """Mixin for services reading data with SQL commands which can be
+    executed in async code. `execute_async()` validates inputs as
+    `execute()` and awaits `process_async()` outside of transaction.
+    Inputs must not need queries (e.g. users must be instances)
+    """
+
+    @classmethod
+    async def execute_async(cls, inputs: dict, files=None, **kwargs):
+        instance = cls(inputs, files, **kwargs)
+        instance.service_clean()
+        return await instance.process_async()
+
+    async def process_async(self):
+        raise NotImplementedError
 
 
 class ModelService:
@@ -33,7 +97,12 @@ class ModelService:
 
 
 class GetForTheDateService(ModelService):
-    """Service to get entries for the date"""
+    """Service to get entries for the date. Entries are ordered by
+    `ordering` attribute if it's set instead of the model ordering
+    (e.g. to match the order of owner and date index)
+    """
+
+    ordering = ()
 
     def __init__(self, owner: User):
         super().__init__()
@@ -43,15 +112,24 @@ class GetForTheDateService(ModelService):
             self, date: Optional[datetime.date] = None) -> QuerySet:
         """Return user entries for the month"""
         date = date or datetime.date.today()
-        return self.model.objects.filter(
-            date__month=date.month, date__year=date.year, owner=self.owner
-        )
+        start, end = get_month_range(date)
+        return self._order(self.model.objects.filter(
+            owner=self.owner, date__gte=start, date__lte=end
+        ))
 
     def get_for_the_date(
             self, date: Optional[datetime.date] = None) -> QuerySet:
         """Return user entries for the concrete date"""
         date = date or datetime.date.today()
-        return self.model.objects.filter(date=date, owner=self.owner)
+        return self._order(
+            self.model.objects.filter(date=date, owner=self.owner)
+        )
+
+    def _order(self, entries: QuerySet) -> QuerySet:
+        if not self.ordering:
+            return entries
+
+        return entries.order_by(*self.ordering)
 
 
 class GetUserEntriesService(ModelService):
@@ -64,8 +142,12 @@ class GetUserEntriesService(ModelService):
             raise PermissionDenied
 
     def get_concrete(self, pk: UUID) -> Model:
-        """Return a concrete user entry with pk"""
-        return get_object_or_404(self.model, pk=pk, owner=self._owner)
+        """Return a concrete user entry with pk. Entry owner is set to
+        the user, so it isn't fetched again
+        """
+        entry = get_object_or_404(self.model, pk=pk, owner=self._owner)
+        entry.owner = self._owner
+        return entry
 
     def get_all(self) -> QuerySet:
         """Return all user entries"""
@@ -88,3 +170,112 @@ class GetTotalSumService:
         """Return sum of queryset entries sums"""
         total_sum = queryset.aggregate(total_sum=Sum(self.sum_field_name))
         return total_sum['total_sum'] or Decimal('0')
+
+    def get_entries_sum(self, entries: list[Model]) -> Decimal:
+        """Return sum of already fetched entries sums"""
+        return sum(
+            (getattr(entry, self.sum_field_name) for entry in entries),
+            Decimal('0')
+        )
+
+    def annotate(self, queryset: QuerySet) -> QuerySet:
+        """Annotate queryset entries with total sum of all queryset
+        entries using `SUM() OVER ()` window, so it's fetched with
+        entries even if the queryset is sliced
+        """
+        return queryset.annotate(
+            entries_total_sum=Window(Sum(self.sum_field_name))
+        )
+
+    def get_annotated_sum(self, entries: list[Model]) -> Decimal:
+        """Return total sum from entries of annotated queryset"""
+        if not entries:
+            return Decimal('0')
+
+        return entries[0].entries_total_sum or Decimal('0')
+
+
+class CursorPaginationService:
+    """Service to paginate queryset using keyset (cursor) pagination
+
+    Entries are ordered by the model `Meta.ordering` with primary key
+    as a tie-breaker. The cursor encodes ordering values of the last
+    entry on the page, so the next page is selected with an indexed
+    range predicate instead of OFFSET
+
+    """
+
+    def __init__(self, page_size: int):
+        if not page_size or page_size < 1:
+            raise ImproperlyConfigured(
+                f"{self.__class__.__name__} page size must be positive"
+            )
+
+        self.page_size = page_size
+
+    def execute(self, queryset: QuerySet,
+                cursor: Optional[str] = None) -> tuple[list, Optional[str]]:
+        """Return page entries and cursor to the next page or `None`
+        if it's the last page
+        """
+        ordering = self._get_ordering(queryset.model)
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            values = self._decode_cursor(queryset.model, ordering, cursor)
+            queryset = queryset.filter(self._get_after_q(ordering, values))
+
+        entries = list(queryset[:self.page_size + 1])
+        if len(entries) <= self.page_size:
+            return entries, None
+
+        entries = entries[:self.page_size]
+        return entries, self._encode_cursor(
+            queryset.model, entries[-1], ordering
+        )
+
+    def _get_ordering(self, model) -> list[str]:
+        """Return model ordering with primary key as a tie-breaker"""
+        ordering = list(model._meta.ordering)
+        descending = bool(ordering) and ordering[-1].startswith('-')
+        pk_name = model._meta.pk.name
+        ordering.append(f"-{pk_name}" if descending else pk_name)
+        return ordering
+
+    def _get_after_q(self, ordering: list[str], values: list) -> Q:
+        """Return filter selecting entries placed after cursor values"""
+        after_q = Q()
+        equal_q = Q()
+        for field, value in zip(ordering, values):
+            field_name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            after_q |= equal_q & Q(**{f"{field_name}__{lookup}": value})
+            equal_q &= Q(**{field_name: value})
+
+        return after_q
+
+    def _encode_cursor(self, model, entry, ordering: list[str]) -> str:
+        """Return cursor of the entry. Entry can be a model instance or
+        a named row of `values_list()` with ordering fields
+        """
+        values = [
+            model._meta.get_field(field.lstrip('-')).value_to_string(entry)
+            for field in ordering
+        ]
+        raw_cursor = json.dumps(values).encode()
+        return base64.urlsafe_b64encode(raw_cursor).decode()
+
+    def _decode_cursor(self, model, ordering: list[str],
+                       cursor: str) -> list:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(ordering):
+                raise ValueError
+            # cursors contain only strings from `value_to_string()`
+            if not all(isinstance(value, str) for value in values):
+                raise ValueError
+            return [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(ordering, values)
+            ]
+        except (binascii.Error, ValueError, TypeError, ValidationError):
+            raise RequestValidationError({'cursor': 'Invalid cursor'})
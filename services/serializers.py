@@ -0,0 +1,126 @@
+import datetime
+from functools import lru_cache
+from typing import Callable, Iterable, NamedTuple
+
+from django.db.models import QuerySet
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+class ValuesSerializer:
+    """Read-only serializer of entries fetched with `values_list()`
+    giving the same data as the model serializer. Columns and field
+    converters are computed once from the model serializer fields, so
+    serializing row doesn't create model instances and field objects
+
+    Parameters
+    ----------
+    serializer_class : ModelSerializer
+        Model serializer which data is reproduced
+
+    """
+
+    def __init__(self, serializer_class):
+        fields = serializer_class().fields
+        model = serializer_class.Meta.model
+        self.model = model
+        self.field_names = tuple(fields)
+        self.columns = tuple(
+            self._get_column(model, field) for field in fields.values()
+        )
+        self.converters = tuple(
+            self._get_converter(field) for field in fields.values()
+        )
+
+    def get_values(self, queryset: QuerySet, *extra_columns) -> QuerySet:
+        """Return queryset of named rows with serialized fields columns,
+        model ordering columns needed for cursor pagination and extra
+        columns (e.g. annotations)
+        """
+        ordering_columns = [
+            field.lstrip('-') for field in self.model._meta.ordering
+        ]
+        extra_columns = [
+            column for column in dict.fromkeys(
+                (*ordering_columns, *extra_columns)
+            )
+            if column not in self.columns
+        ]
+        return queryset.values_list(
+            *self.columns, *extra_columns, named=True
+        )
+
+    def to_representation(self, row: NamedTuple) -> dict:
+        """Return serialized row"""
+        return {
+            name: None if value is None else convert(value)
+            for name, convert, value in zip(
+                self.field_names, self.converters, row
+            )
+        }
+
+    def serialize(self, rows: Iterable[NamedTuple]) -> list[dict]:
+        """Return list of serialized rows"""
+        return [self.to_representation(row) for row in rows]
+
+    def _get_column(self, model, field) -> str:
+        if field.source == 'pk':
+            return model._meta.pk.attname
+
+        return model._meta.get_field(field.source).attname
+
+    def _get_converter(self, field) -> Callable:
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field:
+                return field.pk_field.to_representation
+            return _identity
+
+        if isinstance(field, serializers.UUIDField) and \
+                field.uuid_format == 'hex_verbose':
+            return str
+
+        if type(field) is serializers.CharField:
+            return str
+
+        if isinstance(field, serializers.DateField) and \
+                not isinstance(field, serializers.DateTimeField):
+            output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+            if output_format and output_format.lower() == ISO_8601:
+                return datetime.date.isoformat
+
+        if isinstance(field, serializers.DecimalField):
+            coerce_to_string = getattr(
+                field, 'coerce_to_string',
+                api_settings.COERCE_DECIMAL_TO_STRING
+            )
+            if coerce_to_string and not field.localize:
+                return _get_decimal_converter(field)
+
+        return field.to_representation
+
+
+def _identity(value):
+    return value
+
+
+def _get_decimal_converter(field) -> Callable:
+    """Return converter formatting decimals which already have field
+    decimal places without quantizing them. Other decimals are
+    converted by the field
+    """
+    exponent = -field.decimal_places
+
+    def convert(value):
+        if value.as_tuple().exponent == exponent:
+            return format(value, 'f')
+        return field.to_representation(value)
+
+    return convert
+
+
+@lru_cache(maxsize=None)
+def get_values_serializer(serializer_class) -> ValuesSerializer:
+    """Return values serializer of the model serializer. It's created
+    once for each model serializer
+    """
+    return ValuesSerializer(serializer_class)
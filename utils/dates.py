@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import calendar
+import datetime
+
+
+DateRange = tuple[datetime.date, datetime.date]
+
+
+def get_month_range(date: datetime.date) -> DateRange:
+    """Return inclusive `[start, end]` dates range of the date month.
+    End is the last day of the month, so the range of December 9999
+    exists as well
+    """
+    start = date.replace(day=1)
+    days_count = calendar.monthrange(start.year, start.month)[1]
+    return start, start.replace(day=days_count)
+
+
+def get_year_range(date: datetime.date) -> DateRange:
+    """Return inclusive `[start, end]` dates range of the date year"""
+    return date.replace(month=1, day=1), date.replace(month=12, day=31)
+
+
+def get_months(
+        start: datetime.date, end: datetime.date) -> list[datetime.date]:
+    """Return first days of months from the start month to the end
+    month inclusive
+    """
+    start_index = start.year * 12 + start.month - 1
+    end_index = end.year * 12 + end.month - 1
+    return [
+        datetime.date(index // 12, index % 12 + 1, 1)
+        for index in range(start_index, end_index + 1)
+    ]
@@ -1,12 +1,72 @@
 from __future__ import annotations
 
-from django.db import connection
+from contextlib import contextmanager
+from typing import Iterator
 
+from asgiref.sync import sync_to_async
+from django.db import connection, close_old_connections, transaction
 
-def execute_sql_command(command: str, args: list) -> list[tuple]:
-    """Execute sql command and return `fetchall()` result"""
+
+SQL_SET_REPEATABLE_READ = "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ;"
+
+
+def execute_sql_command(command: str, args: list | dict) -> list[tuple]:
+    """Execute sql command with positional (list) or named (dict)
+    arguments and return `fetchall()` result
+    """
     with connection.cursor() as cursor:
         cursor.execute(command, args)
         result = cursor.fetchall()
 
     return result
+
+
+def execute_sql_statement(command: str, args: list) -> int:
+    """Execute sql command without result rows and return `rowcount`"""
+    with connection.cursor() as cursor:
+        cursor.execute(command, args)
+        rowcount = cursor.rowcount
+
+    return rowcount
+
+
+@contextmanager
+def repeatable_read() -> Iterator[None]:
+    """Context manager executing queries of the block in one transaction
+    reading data from one snapshot. In PostgreSQL transaction gets
+    REPEATABLE READ isolation level. Isolation level can't be changed
+    after the first query, so in already started transaction the block
+    is executed with its isolation level and without savepoint
+    """
+    set_isolation_level = (
+        not connection.in_atomic_block and connection.vendor == 'postgresql'
+    )
+    with transaction.atomic(savepoint=False):
+        if set_isolation_level:
+            execute_sql_statement(SQL_SET_REPEATABLE_READ, [])
+
+        yield
+
+
+async def execute_sql_command_async(
+        command: str, args: list | dict) -> list[tuple]:
+    """Async version of `execute_sql_command`. Command is executed in
+    the thread pool, so each coroutine uses its own connection and
+    commands of concurrent coroutines are executed at the same time
+    """
+    return await sync_to_async(
+        _execute_sql_command_in_thread, thread_sensitive=False
+    )(command, args)
+
+
+def _execute_sql_command_in_thread(
+        command: str, args: list | dict) -> list[tuple]:
+    """Execute sql command closing the thread connection before and
+    after it as before and after request, so connections of pool
+    threads are reused according to `CONN_MAX_AGE` setting
+    """
+    close_old_connections()
+    try:
+        return execute_sql_command(command, args)
+    finally:
+        close_old_connections()
@@ -0,0 +1,67 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+
+
+logger = logging.getLogger('filelogger')
+
+
+class QueryCounter:
+    """Execute wrapper counting queries and their execution time"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class QueryInstrumentationMiddleware:
+    """Middleware logging number of SQL queries, DB time and total time
+    of each request. Requests with more queries than the endpoint budget
+    from `QUERY_BUDGETS` setting are logged with warning level
+
+    Queries executed while streaming response content aren't counted
+
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+
+        duration = time.perf_counter() - start
+        self._log(request, response, counter, duration)
+        return response
+
+    def _log(self, request, response, counter, duration):
+        resolver_match = getattr(request, 'resolver_match', None)
+        url_name = resolver_match.url_name if resolver_match else None
+        budget = get_query_budget(url_name, request.method)
+        level = logging.WARNING if counter.count > budget else logging.INFO
+        logger.log(
+            level, "%s %s (%s) %s: %d queries (budget %d), "
+            "db %.1f ms, total %.1f ms", request.method, request.path,
+            url_name, response.status_code, counter.count, budget,
+            counter.duration * 1000, duration * 1000
+        )
+
+
+def get_query_budget(url_name: str, method: str) -> int:
+    """Return max number of queries for the request method of the
+    endpoint with url name
+    """
+    endpoint_budgets = settings.QUERY_BUDGETS.get(url_name, {})
+    return endpoint_budgets.get(method, settings.QUERY_BUDGET_DEFAULT)
@@ -0,0 +1,30 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from utils.middleware import logger as requests_logger
+
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+class TestRunner(DiscoverRunner):
+    """Test runner using the local memory cache of the test process
+    instead of the shared file cache, so parallel test processes and
+    concurrent test runs don't read and clear cache of each other.
+    Requests of test clients aren't logged
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._settings_override = override_settings(CACHES=TEST_CACHES)
+        self._settings_override.enable()
+        requests_logger.disabled = True
+
+    def teardown_test_environment(self, **kwargs):
+        requests_logger.disabled = False
+        self._settings_override.disable()
+        super().teardown_test_environment(**kwargs)